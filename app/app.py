@@ -5,8 +5,8 @@ from os import getenv
 
 from starlette.responses import JSONResponse
 
-from fastauth.libtypes import UserInfo, FallbackSecrets
-from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import UserInfo
+from fastauth.jwts.keyring import KeyRing
 from fastauth.oauth2_options import OAuthOptions
 from fastauth.providers.google.google import Google
 
@@ -30,13 +30,8 @@ auth = OAuthOptions(
         redirect_uri=getenv("GOOGLE_REDIRECT_URI"),  # type: ignore
     ),
     signin_callback=push_to_db,
-    fallback_secrets=FallbackSecrets(
-        secret_1=getenv("SECRET"),  # type: ignore
-        secret_2=generate_secret(),
-        secret_3=generate_secret(),
-        secret_4=generate_secret(),
-        secret_5=generate_secret(),
-    ),
+    # as many secrets as needed, the first one seals the tokens
+    fallback_secrets=KeyRing([getenv("SECRET")]),  # type: ignore
 )
 
 app = FastAPI()
@@ -0,0 +1,95 @@
+"""
+Seals & opens the JWT cookie with every `CryptoBackend`, one after the other.
+
+Reports the operations per second of each backend and its speedup over
+python-jose's generic implementation.
+
+    python -m benchmarks.crypto [--iterations N] [--aead-only]
+"""
+
+import argparse
+import sys
+
+from time import perf_counter_ns
+from typing import Dict, Final, List, NamedTuple, Optional
+
+from fastauth.jwts.backends import AESGCMBackend, CryptoBackend, JOSEBackend
+from fastauth.jwts.claims import DEFAULT_TOKEN_FORMAT, TokenFormat
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import JWTCrypto, decipher_jwt, encipher_user_info
+from fastauth.libtypes import FallbackSecrets, UserInfo
+
+BACKENDS: Final[Dict[str, CryptoBackend]] = {
+    "jose": JOSEBackend(),
+    "aesgcm": AESGCMBackend(),
+}
+USER_INFO: Final = UserInfo(
+    user_id="109876543210987654321",
+    email="john.doe@example.com",
+    name="John Doe",
+    avatar="https://lh3.googleusercontent.com/a/fake-picture",
+)
+
+
+class BackendStats(NamedTuple):
+    backend: str
+    iterations: int
+    seal_ops: float  # operations per second
+    open_ops: float
+
+
+def run(
+    *, iterations: int, token_format: TokenFormat = DEFAULT_TOKEN_FORMAT
+) -> List[BackendStats]:
+    secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+    previous = JWTCrypto.backend
+    stats = []
+    try:
+        for name, backend in BACKENDS.items():
+            JWTCrypto.use(backend)
+            start = perf_counter_ns()
+            tokens = [
+                encipher_user_info(USER_INFO, secrets, token_format=token_format)
+                for _ in range(iterations)
+            ]
+            sealed = perf_counter_ns()
+            for token in tokens:
+                decipher_jwt(token, secrets)
+            opened = perf_counter_ns()
+            stats.append(
+                BackendStats(
+                    backend=name,
+                    iterations=iterations,
+                    seal_ops=round(iterations / ((sealed - start) / 1e9), 1),
+                    open_ops=round(iterations / ((opened - sealed) / 1e9), 1),
+                )
+            )
+    finally:
+        JWTCrypto.use(previous)
+    return stats
+
+
+def report(stats: List[BackendStats]) -> str:
+    reference = stats[0]
+    lines = [f"{'backend':<10} {'seal/s':>10} {'open/s':>10} {'speedup':>16}"]
+    for s in stats:
+        speedup = (
+            f"x{s.seal_ops / reference.seal_ops:.2f}"
+            f" / x{s.open_ops / reference.open_ops:.2f}"
+        )
+        lines.append(f"{s.backend:<10} {s.seal_ops:>10} {s.open_ops:>10} {speedup:>16}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--aead-only", action="store_true")
+    args = parser.parse_args(argv)
+    token_format = TokenFormat(aead_only=args.aead_only)
+    print(report(run(iterations=args.iterations, token_format=token_format)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+An in-process stand-in for Google's token & userinfo servers, plugged into
+the provider's HTTP pool as an ASGI transport, so no request leaves the process.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Final
+from urllib.parse import parse_qs
+
+from httpx import ASGITransport
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+TOKEN_RESPONSE: Final[Dict[str, Any]] = {
+    "access_token": "ya29.fake-access-token",
+    "expires_in": 3599,
+    "refresh_token": "1//fake-refresh-token",
+    "scope": "openid https://www.googleapis.com/auth/userinfo.email",
+    "token_type": "Bearer",
+    "id_token": "fake.id.token",
+}
+
+USER_INFO_RESPONSE: Final[Dict[str, Any]] = {
+    "id": "109876543210987654321",
+    "email": "john.doe@example.com",
+    "verified_email": True,
+    "name": "John Doe",
+    "given_name": "John",
+    "family_name": "Doe",
+    "picture": "https://lh3.googleusercontent.com/a/fake-picture",
+    "locale": "en",
+}
+
+
+async def token(request: Request) -> JSONResponse:
+    form = parse_qs((await request.body()).decode())
+    if not form.get("code") or not form.get("code_verifier"):
+        return JSONResponse({"error": "invalid_grant"}, status_code=400)
+    return JSONResponse(TOKEN_RESPONSE)
+
+
+async def user_info(request: Request) -> JSONResponse:
+    if request.headers.get("authorization") != (
+        f"Bearer {TOKEN_RESPONSE['access_token']}"
+    ):
+        return JSONResponse({"error": "invalid_token"}, status_code=401)
+    return JSONResponse(USER_INFO_RESPONSE)
+
+
+fake_google = Starlette(
+    routes=[
+        Route("/o/oauth2/token", token, methods=["POST"]),
+        Route("/oauth2/v1/userinfo", user_info, methods=["GET"]),
+    ]
+)
+
+
+def fake_google_transport() -> ASGITransport:
+    return ASGITransport(app=fake_google)  # type: ignore[arg-type]
@@ -0,0 +1,258 @@
+"""
+Benchmarks the whole sign in cycle, `Authorize` -> `Callback` -> `JWTHandler.get_jwt`
+-> `Signout`, through the ASGI app against a fake in-process Google.
+
+Each stage reports its throughput, p50/p99 latency and the memory it allocates,
+then the results are compared against `benchmarks/baseline.json`.
+
+    python -m benchmarks.oauth_flow [--iterations N] [--tolerance 0.25] [--save-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tracemalloc
+
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Awaitable, Callable, Dict, Final, List, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from fastapi import FastAPI
+from httpx import AsyncClient, Response
+
+from fastauth.adapters.fastapi.csrf_middleware import CSRFMitigationMiddleware
+from fastauth.const_data import StatusCode
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.providers.google.google import Google
+from benchmarks.fake_provider import fake_google_transport
+
+BASELINE_PATH: Final = Path(__file__).with_name("baseline.json")
+STAGES: Final = ("authorize", "callback", "jwt", "signout")
+BASE_URL: Final = "http://testserver"
+REDIRECT: Final = StatusCode.TMP_REDIRECT
+
+Stage = Callable[[AsyncClient, Dict[str, str]], Awaitable[Response]]
+
+
+class StageStats(NamedTuple):
+    stage: str
+    iterations: int
+    throughput: float  # operations per second
+    p50_ms: float
+    p99_ms: float
+    alloc_kib: float  # traced memory allocated per operation
+
+
+async def _signin_callback(user_info: UserInfo) -> None:
+    pass
+
+
+def build_app() -> FastAPI:
+    provider = Google(
+        client_id="fake-client-id",
+        client_secret="fake-client-secret",
+        redirect_uri=f"{BASE_URL}/auth/callback/google",
+    )
+    app = FastAPI()
+    app.include_router(
+        OAuthOptions(
+            provider=provider,
+            signin_callback=_signin_callback,
+            fallback_secrets=FallbackSecrets(
+                *(generate_secret() for _ in FallbackSecrets._fields)
+            ),
+            debug=True,  # fail loudly if the cycle breaks
+        )
+    )
+    app.add_middleware(CSRFMitigationMiddleware)
+    provider.http.transport = fake_google_transport()
+    return app
+
+
+async def _authorize(client: AsyncClient, ctx: Dict[str, str]) -> Response:
+    response = await client.get("/auth/signin/google")
+    ctx["state"] = parse_qs(urlsplit(response.headers["location"]).query)["state"][0]
+    return response
+
+
+async def _callback(client: AsyncClient, ctx: Dict[str, str]) -> Response:
+    return await client.get(
+        "/auth/callback/google", params={"code": "fake-code", "state": ctx["state"]}
+    )
+
+
+async def _jwt(client: AsyncClient, ctx: Dict[str, str]) -> Response:
+    return await client.get("/auth/jwt")
+
+
+async def _signout(client: AsyncClient, ctx: Dict[str, str]) -> Response:
+    return await client.get("/auth/signout")
+
+
+_CYCLE: Final[Dict[str, Stage]] = {
+    "authorize": _authorize,
+    "callback": _callback,
+    "jwt": _jwt,
+    "signout": _signout,
+}
+_EXPECTED_STATUS: Final = {
+    "authorize": REDIRECT,
+    "callback": REDIRECT,
+    "jwt": StatusCode.OK,
+    "signout": REDIRECT,
+}
+
+
+async def _run_cycles(
+    client: AsyncClient,
+    iterations: int,
+    on_stage: Callable[[str, int, Optional[int]], None],
+) -> None:
+    ctx: Dict[str, str] = {}
+    for _ in range(iterations):
+        for stage, call in _CYCLE.items():
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+                before: Optional[int] = tracemalloc.get_traced_memory()[0]
+            else:
+                before = None
+            start = perf_counter_ns()
+            response = await call(client, ctx)
+            elapsed = perf_counter_ns() - start
+            allocated = (
+                tracemalloc.get_traced_memory()[1] - before
+                if before is not None
+                else None
+            )
+            if response.status_code != _EXPECTED_STATUS[stage]:
+                raise RuntimeError(
+                    f"{stage} answered {response.status_code}: {response.text}"
+                )
+            on_stage(stage, elapsed, allocated)
+
+
+def _percentile(sorted_values: List[int], q: float) -> int:
+    return sorted_values[
+        min(len(sorted_values) - 1, round(q * (len(sorted_values) - 1)))
+    ]
+
+
+async def run(*, iterations: int, warmup: int = 20) -> List[StageStats]:
+    logger = logging.getLogger("fastauth")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        return await _measure(iterations=iterations, warmup=warmup)
+    finally:
+        logger.setLevel(level)  # the caller's logging is left as it was
+
+
+async def _measure(*, iterations: int, warmup: int) -> List[StageStats]:
+    app = build_app()
+    timings: Dict[str, List[int]] = {stage: [] for stage in STAGES}
+    allocations: Dict[str, List[int]] = {stage: [] for stage in STAGES}
+    async with AsyncClient(app=app, base_url=BASE_URL) as client:
+        await _run_cycles(client, warmup, lambda *_: None)
+        await _run_cycles(
+            client,
+            iterations,
+            lambda stage, elapsed, _: timings[stage].append(elapsed),
+        )
+        # tracing slows everything down, so it gets its own (shorter) pass
+        tracemalloc.start()
+        try:
+            await _run_cycles(
+                client,
+                max(1, iterations // 10),
+                lambda stage, _, allocated: allocations[stage].append(allocated or 0),
+            )
+        finally:
+            tracemalloc.stop()
+    stats = []
+    for stage in STAGES:
+        values = sorted(timings[stage])
+        stats.append(
+            StageStats(
+                stage=stage,
+                iterations=iterations,
+                throughput=round(len(values) / (sum(values) / 1e9), 1),
+                p50_ms=round(_percentile(values, 0.50) / 1e6, 4),
+                p99_ms=round(_percentile(values, 0.99) / 1e6, 4),
+                alloc_kib=round(
+                    sum(allocations[stage]) / len(allocations[stage]) / 1024, 2
+                ),
+            )
+        )
+    return stats
+
+
+def compare(
+    stats: List[StageStats], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    regressions = []
+    for stat in stats:
+        reference = baseline["stages"].get(stat.stage)
+        if reference is None:
+            continue
+        for metric in ("p50_ms", "alloc_kib"):
+            current, previous = getattr(stat, metric), reference[metric]
+            if current > previous * (1 + tolerance):
+                regressions.append(
+                    f"{stat.stage}.{metric}: {current} > {previous} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def report(stats: List[StageStats]) -> str:
+    lines = [
+        f"{'stage':<10} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'KiB/op':>10}"
+    ]
+    for s in stats:
+        lines.append(
+            f"{s.stage:<10} {s.throughput:>10} {s.p50_ms:>10} {s.p99_ms:>10}"
+            f" {s.alloc_kib:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(run(iterations=args.iterations))
+    print(report(stats))
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "iterations": args.iterations,
+                    "stages": {s.stage: s._asdict() for s in stats},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}, run with --save-baseline")
+        return 0
+    regressions = compare(stats, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Validates the fake Google responses at every `ValidationLevel`, one after the other.
+
+Reports the operations per second of each level and its speedup over "strict".
+
+    python -m benchmarks.schemas [--iterations N]
+"""
+
+import argparse
+import sys
+
+from time import perf_counter_ns
+from typing import Final, List, NamedTuple, Optional, Tuple
+
+from benchmarks.fake_provider import TOKEN_RESPONSE, USER_INFO_RESPONSE
+from fastauth.libtypes import ValidationLevel
+from fastauth.providers.google.schemas import serialize_token_set, serialize_user_info
+
+LEVELS: Final[Tuple[ValidationLevel, ...]] = ("strict", "fast")
+
+
+class LevelStats(NamedTuple):
+    level: str
+    iterations: int
+    user_info_ops: float  # operations per second
+    token_set_ops: float
+
+
+def run(*, iterations: int) -> List[LevelStats]:
+    stats = []
+    for level in LEVELS:
+        start = perf_counter_ns()
+        for _ in range(iterations):
+            serialize_user_info(USER_INFO_RESPONSE, level)
+        user_info_done = perf_counter_ns()
+        for _ in range(iterations):
+            serialize_token_set(TOKEN_RESPONSE, level)
+        token_set_done = perf_counter_ns()
+        stats.append(
+            LevelStats(
+                level=level,
+                iterations=iterations,
+                user_info_ops=round(iterations / ((user_info_done - start) / 1e9), 1),
+                token_set_ops=round(
+                    iterations / ((token_set_done - user_info_done) / 1e9), 1
+                ),
+            )
+        )
+    return stats
+
+
+def report(stats: List[LevelStats]) -> str:
+    reference = stats[0]
+    lines = [f"{'level':<10} {'user info/s':>12} {'token set/s':>12} {'speedup':>16}"]
+    for s in stats:
+        speedup = (
+            f"x{s.user_info_ops / reference.user_info_ops:.2f}"
+            f" / x{s.token_set_ops / reference.token_set_ops:.2f}"
+        )
+        lines.append(
+            f"{s.level:<10} {s.user_info_ops:>12} {s.token_set_ops:>12} {speedup:>16}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10000)
+    args = parser.parse_args(argv)
+    print(report(run(iterations=args.iterations)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Measures what importing fastauth costs at startup, with `python -X importtime`.
+
+Each statement runs in a fresh interpreter. The median over the runs is reported,
+along with the heavy dependencies the statement ended up importing.
+
+    python -m benchmarks.startup [--runs N]
+"""
+
+import argparse
+import subprocess
+import sys
+
+from statistics import median
+from typing import Final, List, NamedTuple, Optional, Tuple
+
+STATEMENTS: Final = (
+    "import fastauth",
+    "from fastauth import OAuthOptions, FallbackSecrets",
+    "from fastauth import Google",
+    "import fastauth.adapters.fastapi.flow",
+)
+HEAVY_MODULES: Final = ("fastapi", "httpx", "jose.jwe", "pydantic", "cryptography")
+
+
+class ImportStats(NamedTuple):
+    statement: str
+    runs: int
+    median_ms: float
+    loaded: Tuple[str, ...]  # out of `HEAVY_MODULES`
+
+
+def import_time_us(stderr: str) -> int:
+    """
+    the cumulative time of the top level imports, from the first fastauth one
+    """
+    total, started = 0, False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if name.startswith("  "):
+            continue  # nested, already counted by its parent
+        started = started or name.strip().startswith("fastauth")
+        if started:
+            total += int(cumulative)
+    return total
+
+
+def measure(statement: str) -> Tuple[int, Tuple[str, ...]]:
+    probe = (
+        f"{statement}\nimport sys\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = completed.stdout.strip()
+    return import_time_us(completed.stderr), tuple(loaded.split(",") if loaded else ())
+
+
+def run(*, runs: int) -> List[ImportStats]:
+    stats = []
+    for statement in STATEMENTS:
+        timings: List[int] = []
+        loaded: Tuple[str, ...] = ()
+        for _ in range(runs):
+            elapsed, loaded = measure(statement)
+            timings.append(elapsed)
+        stats.append(
+            ImportStats(
+                statement=statement,
+                runs=runs,
+                median_ms=round(median(timings) / 1e3, 2),
+                loaded=loaded,
+            )
+        )
+    return stats
+
+
+def report(stats: List[ImportStats]) -> str:
+    width = max(len(s.statement) for s in stats)
+    lines = [f"{'statement':<{width}} {'ms':>8}  loaded"]
+    for s in stats:
+        lines.append(
+            f"{s.statement:<{width}} {s.median_ms:>8}  {', '.join(s.loaded) or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+    print(report(run(runs=args.runs)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
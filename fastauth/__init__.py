@@ -0,0 +1,82 @@
+"""
+Everything public, importing `fastauth` itself costs next to nothing: each name
+loads its module on first access (PEP 562), so the providers you don't use, the
+crypto and the HTTP client stay out of the startup time.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from fastauth.adapters.fastapi.auth_middleware import AuthenticationMiddleware
+    from fastauth.adapters.fastapi.csrf_middleware import CSRFMitigationMiddleware
+    from fastauth.adapters.fastapi.dependencies import ClaimsReader, CurrentUser
+    from fastauth.instrumentation import (
+        InMemoryMetrics,
+        Instrumentation,
+        OpenTelemetryMetrics,
+    )
+    from fastauth.jwts.backends import AESGCMBackend, JOSEBackend
+    from fastauth.jwts.cache import JWTCache
+    from fastauth.jwts.claims import COMPACT_TOKEN_FORMAT, TokenFormat
+    from fastauth.jwts.helpers import generate_secret
+    from fastauth.jwts.keyring import KeyRing
+    from fastauth.jwts.operations import JWTCrypto
+    from fastauth.jwts.revocation import RevocationList
+    from fastauth.libtypes import JWT, FallbackSecrets, UserInfo
+    from fastauth.oauth2_options import OAuthOptions
+    from fastauth.providers.base import Provider
+    from fastauth.providers.google.google import Google
+    from fastauth.refresh import InMemoryTokenStore, TokenRefresher
+    from fastauth.signin_queue import SignInQueue
+    from fastauth.sessions import (
+        InMemorySessionStore,
+        RedisSessionStore,
+        SQLiteSessionStore,
+    )
+
+_MODULES: Dict[str, str] = {
+    "OAuthOptions": "fastauth.oauth2_options",
+    "FallbackSecrets": "fastauth.libtypes",
+    "UserInfo": "fastauth.libtypes",
+    "JWT": "fastauth.libtypes",
+    "generate_secret": "fastauth.jwts.helpers",
+    "KeyRing": "fastauth.jwts.keyring",
+    "Provider": "fastauth.providers.base",
+    "Google": "fastauth.providers.google.google",
+    "CSRFMitigationMiddleware": "fastauth.adapters.fastapi.csrf_middleware",
+    "AuthenticationMiddleware": "fastauth.adapters.fastapi.auth_middleware",
+    "ClaimsReader": "fastauth.adapters.fastapi.dependencies",
+    "CurrentUser": "fastauth.adapters.fastapi.dependencies",
+    "TokenFormat": "fastauth.jwts.claims",
+    "COMPACT_TOKEN_FORMAT": "fastauth.jwts.claims",
+    "JWTCrypto": "fastauth.jwts.operations",
+    "AESGCMBackend": "fastauth.jwts.backends",
+    "JOSEBackend": "fastauth.jwts.backends",
+    "JWTCache": "fastauth.jwts.cache",
+    "RevocationList": "fastauth.jwts.revocation",
+    "TokenRefresher": "fastauth.refresh",
+    "InMemoryTokenStore": "fastauth.refresh",
+    "SignInQueue": "fastauth.signin_queue",
+    "InMemorySessionStore": "fastauth.sessions",
+    "SQLiteSessionStore": "fastauth.sessions",
+    "RedisSessionStore": "fastauth.sessions",
+    "Instrumentation": "fastauth.instrumentation",
+    "InMemoryMetrics": "fastauth.instrumentation",
+    "OpenTelemetryMetrics": "fastauth.instrumentation",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # the next lookups skip `__getattr__`
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import final
+
+from starlette.requests import HTTPConnection
+
+from fastauth.adapters.fastapi.dependencies import ClaimsReader
+from fastauth.libtypes import ASGIApp, Scope, Receive, Send
+
+
+@final
+class AuthenticationMiddleware:
+    """
+    Raw ASGI middleware, reads the claims before the app runs & leaves them in
+    `request.state.fastauth_claims`, where `CurrentUser` picks them up.
+    """
+
+    def __init__(self, app: ASGIApp, reader: ClaimsReader) -> None:
+        self.app = app
+        self.reader = reader
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            await self.reader.read(HTTPConnection(scope))
+        await self.app(scope, receive, send)
@@ -1,21 +1,47 @@
 from __future__ import annotations
 
-from typing import Callable, Awaitable, final
+from typing import final
 
 from starlette.requests import Request
+from starlette.responses import Response
 
 from fastauth.csrf import CSRFValidationFilter
-from starlette.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastauth.libtypes import ASGIApp, Scope, Receive, Send, Message
+
+
+@final
+class CSRFMitigationMiddleware:
+    """
+    Raw ASGI middleware, the CSRF check runs when the response starts and the
+    CSRF cookie is written straight into its headers, so the body is never
+    buffered and streaming responses pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_csrf_check(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                CSRFValidationFilter(
+                    request=Request(scope),  # cookies are parsed lazily from scope
+                    response=_ResponseStart(message),
+                )()
+            await send(message)
+
+        await self.app(scope, receive, send_with_csrf_check)
 
 
 @final
-class CSRFMitigationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        response = await call_next(request)
-        CSRFValidationFilter(request=request, response=response)()
-        return response
+class _ResponseStart(Response):
+    """
+    The headers of an `http.response.start` message seen as a response,
+    cookies set on it land directly in the message.
+    """
+
+    def __init__(self, message: Message) -> None:
+        self.raw_headers = message["headers"] = list(message.get("headers", ()))
@@ -0,0 +1,104 @@
+from logging import Logger
+from typing import Final, Optional, final
+
+from fastapi import HTTPException
+from jose.exceptions import JOSEError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import HTTPConnection
+
+from fastauth.const_data import CookieData, StatusCode
+from fastauth.exceptions import JSONWebTokenTampering
+from fastauth.jwts.cache import JWTCache
+from fastauth.jwts.handler import read_jwt
+from fastauth.jwts.keyring import Secrets, as_keyring
+from fastauth.jwts.revocation import RevocationList
+from fastauth.libtypes import JWT
+from fastauth.log import logger as flogger
+from fastauth.sessions import SessionStore
+from fastauth.utils import name_cookie
+
+CLAIMS_STATE_KEY: Final = "fastauth_claims"
+
+
+@final
+class ClaimsReader:
+    """
+    Reads the claims of the request's JWT (or session) cookie once, the result,
+    `None` when signed out, is kept in `request.state.fastauth_claims` and
+    reused by every later read of the same request.
+    """
+
+    def __init__(
+        self,
+        *,
+        fallback_secrets: Secrets,
+        jwt_cache: Optional[JWTCache] = None,
+        revocation_list: Optional[RevocationList] = None,
+        session_store: Optional[SessionStore] = None,
+        logger: Logger = flogger,
+    ) -> None:
+        self.keyring = as_keyring(fallback_secrets)
+        self.jwt_cache = jwt_cache
+        self.revocation_list = revocation_list
+        self.session_store = session_store
+        self.logger = logger
+        self._jwt_cookie = name_cookie(name=CookieData.JWT.name)
+        self._session_cookie = name_cookie(name=CookieData.Session.name)
+
+    async def read(self, connection: HTTPConnection) -> Optional[JWT]:
+        """
+        runs on the loop, only the sync session store is called in the threadpool
+        """
+        state = connection.scope.setdefault("state", {})
+        if CLAIMS_STATE_KEY in state:
+            claims: Optional[JWT] = state[CLAIMS_STATE_KEY]
+            return claims
+        if self.session_store is not None:
+            claims = await run_in_threadpool(self._read_session, connection)
+        else:
+            claims = self._read_jwt(connection)
+        state[CLAIMS_STATE_KEY] = claims
+        return claims
+
+    def _read_session(self, connection: HTTPConnection) -> Optional[JWT]:
+        assert self.session_store is not None
+        sid = connection.cookies.get(self._session_cookie)
+        return self.session_store.get(sid) if sid else None
+
+    def _read_jwt(self, connection: HTTPConnection) -> Optional[JWT]:
+        encrypted_jwt = connection.cookies.get(self._jwt_cookie)
+        if not encrypted_jwt:
+            return None
+        try:
+            return read_jwt(
+                encrypted_jwt,
+                fallback_secrets=self.keyring,
+                jwt_cache=self.jwt_cache,
+                revocation_list=self.revocation_list,
+            )
+        except JOSEError as e:
+            self.logger.warning(JSONWebTokenTampering(error=e))
+            return None
+
+
+@final
+class CurrentUser:
+    """
+    A FastAPI dependency, 401 when signed out unless `required=False`
+
+        current_user = CurrentUser(ClaimsReader(fallback_secrets=...))
+
+        @app.get("/me")
+        async def me(jwt: JWT = Depends(current_user)): ...
+    """
+
+    def __init__(self, reader: ClaimsReader, *, required: bool = True) -> None:
+        self.reader = reader
+        self.required = required
+
+    # async, so it runs on the loop, only a session store lookup hops to the threadpool
+    async def __call__(self, connection: HTTPConnection) -> Optional[JWT]:
+        claims = await self.reader.read(connection)
+        if claims is None and self.required:
+            raise HTTPException(status_code=StatusCode.UNAUTHORIZED)
+        return claims
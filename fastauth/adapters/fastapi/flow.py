@@ -1,20 +1,31 @@
-from typing import Optional, final
+from typing import TYPE_CHECKING, Optional, Sequence, Type, final
 
-from fastapi import Query, APIRouter
+from fastapi import Query, APIRouter, HTTPException
 from overrides import override
 from starlette.requests import Request
 from starlette.responses import Response
 
-from fastauth.libtypes import FallbackSecrets
+from fastauth.jwts.keyring import Secrets
 from fastauth.providers.base import Provider
 from fastauth.authorize import Authorize
 from fastauth.callback import Callback
 from fastauth.signout import Signout
 from fastauth.signin import SignInCallback
+from fastauth.signin_queue import SignInQueue
 from fastauth.oauth2_baseflow import OAuth2Base
 from fastauth.jwts.handler import JWTHandler
+from fastauth.jwts.cache import JWTCache
 from fastauth.adapters.fastapi.route import FastAuthRoute
 from fastauth.csrf import CSRF
+from fastauth.http_client import HTTPClientPool
+from fastauth.refresh import TokenRefresher
+from fastauth.sessions import SessionStore
+from fastauth.jwts.revocation import RevocationList
+from fastauth.jwts.claims import TokenFormat
+from fastauth.const_data import StatusCode
+
+if TYPE_CHECKING:
+    from httpx import Limits, Timeout
 
 
 @final
@@ -22,8 +33,8 @@ class FastAPIOAuthFlow(OAuth2Base):
     def __init__(
         self,
         *,
-        provider: Provider,
-        fallback_secrets: FallbackSecrets,
+        providers: Sequence[Provider],
+        fallback_secrets: Secrets,
         signin_uri: str,
         signout_url: str,
         callback_uri: str,
@@ -34,11 +45,20 @@ class FastAPIOAuthFlow(OAuth2Base):
         error_uri: str,
         jwt_max_age: int,
         signin_callback: Optional[SignInCallback],
+        http_limits: Optional["Limits"],
+        http_timeout: Optional["Timeout"],
+        jwt_cache: Optional[JWTCache],
+        route_class: Type[FastAuthRoute],
+        token_refresher: Optional[TokenRefresher],
+        session_store: Optional[SessionStore],
+        revocation_list: Optional[RevocationList],
+        token_format: TokenFormat,
+        signin_queue: Optional[SignInQueue],
     ) -> None:
         super().__init__(
-            provider=provider,
+            providers=providers,
             fallback_secrets=fallback_secrets,
-            signin_uri=signin_uri + "/" + provider.provider,
+            signin_uri=signin_uri,
             signout_url=signout_url,
             callback_uri=callback_uri,
             jwt_uri=jwt_uri,
@@ -49,24 +69,47 @@ class FastAPIOAuthFlow(OAuth2Base):
             error_uri=error_uri,
             jwt_max_age=jwt_max_age,
         )
-        CSRF.init_once(fallback_secrets=fallback_secrets)
+        self.compile()
+        self.jwt_cache = jwt_cache
+        self.token_refresher = token_refresher
+        self.session_store = session_store
+        self.revocation_list = revocation_list
+        self.token_format = token_format
+        self.signin_queue = signin_queue
         self.auth_route = APIRouter()
-        self.auth_route.route_class = FastAuthRoute
+        self.auth_route.route_class = route_class
+        # one pool, one CSRF/secret state, one set of routes for all the providers
+        self.http_pool = HTTPClientPool(limits=http_limits, timeout=http_timeout)
+        for provider in self.providers.values():
+            provider.use_http_pool(self.http_pool)
         self.activate()
 
     @property
     def router(self) -> APIRouter:
         return self.auth_route
 
+    @override
+    def compile(self) -> None:
+        super().compile()
+        # only once the secrets are known to be valid
+        CSRF.init_once(fallback_secrets=self.keyring)
+
+    def get_provider(self, name: str) -> Provider:
+        provider = self.providers.get(name)
+        if provider is None:
+            raise HTTPException(status_code=StatusCode.NOT_FOUND)
+        return provider
+
     @override
     def on_signin(self) -> None:
-        @self.router.get(self.signin_uri)
-        async def authorize(request: Request):  # type:ignore
-            return Authorize(provider=self.provider, request=request)()
+        @self.router.get(self.signin_uri + "/{provider}")
+        async def authorize(request: Request, provider: str):  # type:ignore
+            return Authorize(provider=self.get_provider(provider), request=request)()
 
-        @self.router.get(self.callback_uri + "/" + self.provider.provider)
+        @self.router.get(self.callback_uri + "/{provider}")
         async def callback(  #  type: ignore
             req: Request,
+            provider: str,
             code: str = Query(...),
             state: str = Query(...),
         ):
@@ -74,14 +117,18 @@ class FastAPIOAuthFlow(OAuth2Base):
                 code=code,
                 request=req,
                 state=state,
-                fallback_secrets=self.fallback_secrets,
+                fallback_secrets=self.keyring,
                 debug=self.debug,
-                provider=self.provider,
+                provider=self.get_provider(provider),
                 post_signin_uri=self.post_signin_uri,
                 signin_callback=self.signin_callback,
                 logger=self.logger,
                 error_uri=self.error_uri,
                 jwt_max_age=self.jwt_max_age,
+                token_refresher=self.token_refresher,
+                session_store=self.session_store,
+                token_format=self.token_format,
+                signin_queue=self.signin_queue,
             )()
 
     @override
@@ -94,7 +141,9 @@ class FastAPIOAuthFlow(OAuth2Base):
                 error_uri=self.error_uri,
                 logger=self.logger,
                 debug=self.debug,
-                fallback_secrets=self.fallback_secrets,
+                fallback_secrets=self.keyring,
+                session_store=self.session_store,
+                revocation_list=self.revocation_list,
             )()
 
     @override
@@ -104,13 +153,26 @@ class FastAPIOAuthFlow(OAuth2Base):
             return JWTHandler(
                 request=request,
                 response=response,
-                fallback_secrets=self.fallback_secrets,
+                fallback_secrets=self.keyring,
                 logger=self.logger,
                 debug=self.debug,
+                jwt_cache=self.jwt_cache,
+                session_store=self.session_store,
+                revocation_list=self.revocation_list,
             ).get_jwt()
 
+    def lifespan(self) -> None:
+        # the router's handlers are merged into the app's on `include_router`
+        if self.signin_queue is not None:
+            self.router.add_event_handler("startup", self.signin_queue.start)
+            # drained first, the pending callbacks may still need the pool
+            self.router.add_event_handler("shutdown", self.signin_queue.aclose)
+        self.router.add_event_handler("startup", self.http_pool.open)
+        self.router.add_event_handler("shutdown", self.http_pool.aclose)
+
     @override
     def activate(self) -> None:
+        self.lifespan()
         self.on_signin()
         self.jwt()
         self.on_signout()
@@ -1,13 +1,52 @@
-from typing import Callable, Coroutine
+from __future__ import annotations
+
+from typing import Awaitable, Callable, ClassVar, Coroutine, Sequence, Tuple, Type
+
 from fastapi.routing import APIRoute
 from fastapi import Request, Response
 
+BeforeRouteHook = Callable[[Request], Awaitable[None]]
+AfterRouteHook = Callable[[Request, Response], Awaitable[None]]
+
 
 class FastAuthRoute(APIRoute):
+    """
+    Route class of every auth route. With no hooks the original handler is
+    returned as is, hooks receive the very `Request` the handler gets.
+    """
+
+    before_hooks: ClassVar[Sequence[BeforeRouteHook]] = ()
+    after_hooks: ClassVar[Sequence[AfterRouteHook]] = ()
+
+    @classmethod
+    def with_hooks(
+        cls,
+        *,
+        before: Sequence[BeforeRouteHook] = (),
+        after: Sequence[AfterRouteHook] = (),
+    ) -> Type[FastAuthRoute]:
+        return type(
+            cls.__name__,
+            (cls,),
+            {
+                "before_hooks": (*cls.before_hooks, *before),
+                "after_hooks": (*cls.after_hooks, *after),
+            },
+        )
+
     def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
         original_route_handler = super().get_route_handler()
+        if not self.before_hooks and not self.after_hooks:
+            return original_route_handler
+        before_hooks: Tuple[BeforeRouteHook, ...] = tuple(self.before_hooks)
+        after_hooks: Tuple[AfterRouteHook, ...] = tuple(self.after_hooks)
 
         async def fastauth_route_handler(request: Request) -> Response:
-            return await original_route_handler(Request(request.scope, request.receive))
+            for before_hook in before_hooks:
+                await before_hook(request)
+            response = await original_route_handler(request)
+            for after_hook in after_hooks:
+                await after_hook(request, response)
+            return response
 
         return fastauth_route_handler
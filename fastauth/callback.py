@@ -1,21 +1,31 @@
+from functools import cached_property
 from logging import Logger
 
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from starlette.responses import Response
 
 from fastauth.providers.base import Provider
 from fastauth.const_data import CookieData
-from fastauth.cookies import Cookies
+from fastauth.cookies import Cookies, get_cookie
 from fastauth.adapters.use_response import use_response
-from fastauth.libtypes import FallbackSecrets, AccessToken
+from fastauth.libtypes import TokenSet
+from fastauth.jwts.keyring import Secrets
 from fastauth.jwts.operations import encipher_user_info
-from fastauth.signin import SignInCallback, check_signin_signature
+from fastauth.signin import SignInCallback
+from fastauth.signin_queue import SignInQueue
 from fastauth.exceptions import InvalidState, CodeVerifierNotFound
 from fastauth.csrf import CSRF
+from fastauth.instrumentation import Instrumentation, Stage
+from fastauth.refresh import TokenRefresher
+from fastauth.sessions import SessionStore, new_session_id, session_claims
+from fastauth.jwts.claims import DEFAULT_TOKEN_FORMAT, TokenFormat
 
 from fastauth.libtypes import UserInfo
 from typing import Optional
 
+_redirect = use_response(response_type="redirect")
+
 
 class _CallbackCheck:
     def __init__(
@@ -25,7 +35,7 @@ class _CallbackCheck:
         error_uri: str,
         code: str,
         state: str,
-        fallback_secrets: FallbackSecrets,
+        fallback_secrets: Secrets,
         logger: Logger,
         request: Request,
         jwt_max_age: int,
@@ -40,23 +50,40 @@ class _CallbackCheck:
         self.debug = debug
         self.jwt_max_age = jwt_max_age
         self.signin_callback = signin_callback
-        __base_url = request.base_url
-        __response = use_response(response_type="redirect")
-        self.success_response = __response(url=__base_url + post_signin_uri)  # type: ignore
-        self.error_response = __response(url=__base_url + error_uri)  # type: ignore
-        self.cookie = Cookies(request=request, response=self.success_response)
+        self.request = request
+        self.post_signin_uri = post_signin_uri
+        self.error_uri = error_uri
+
+    # only the response that ends up returned gets built
+
+    @cached_property
+    def success_response(self) -> Response:
+        return _redirect(url=str(self.request.base_url) + self.post_signin_uri)  # type: ignore
+
+    @cached_property
+    def error_response(self) -> Response:
+        return _redirect(url=str(self.request.base_url) + self.error_uri)  # type: ignore
+
+    @cached_property
+    def cookie(self) -> Cookies:
+        # only to set cookies, on success, reads go through `get_cookie`
+        return Cookies(request=self.request, response=self.success_response)
 
     def _is_state_valid(self) -> bool:
-        if self.cookie.get(CookieData.State.name) != self.state:
-            err = InvalidState()
-            self.logger.error(err)
-            if self.debug:
-                raise err
-            return False
-        return True
+        with Instrumentation.timer(Stage.STATE_CHECK) as timer:
+            if get_cookie(self.request, CookieData.State.name) != self.state:
+                timer.fail()
+                err = InvalidState()
+                self.logger.error(err)
+                if self.debug:
+                    raise err
+                return False
+            return True
 
     def _get_code_verifier(self) -> Optional[str]:
-        code_verifier: Optional[str] = self.cookie.get(CookieData.Codeverifier.name)
+        code_verifier: Optional[str] = get_cookie(
+            self.request, CookieData.Codeverifier.name
+        )
         if code_verifier is None:
             err = CodeVerifierNotFound()
             self.logger.error(err)
@@ -75,13 +102,22 @@ class Callback(_CallbackCheck):
         error_uri: str,
         code: str,
         state: str,
-        fallback_secrets: FallbackSecrets,
+        fallback_secrets: Secrets,
         logger: Logger,
         jwt_max_age: int,
         signin_callback: Optional[SignInCallback],
         request: Request,
         debug: bool,
+        token_refresher: Optional[TokenRefresher] = None,
+        session_store: Optional[SessionStore] = None,
+        token_format: TokenFormat = DEFAULT_TOKEN_FORMAT,
+        signin_queue: Optional[SignInQueue] = None,
     ) -> None:
+        self.token_refresher = token_refresher
+        self.signin_queue = signin_queue
+        self.session_store = session_store
+        self.token_format = token_format
+        self.token_set: Optional[TokenSet] = None
         super().__init__(
             provider=provider,
             post_signin_uri=post_signin_uri,
@@ -103,10 +139,23 @@ class Callback(_CallbackCheck):
                 user_info=user_info,
                 max_age=max_age,
                 fallback_secrets=self.fallback_secrets,
+                token_format=self.token_format,
             ),
             max_age=max_age,
         )
 
+    async def set_session_cookie(self, user_info: UserInfo, max_age: int) -> None:
+        assert self.session_store is not None
+        sid = new_session_id()
+        # the store is sync, a write or a round trip, kept off the loop
+        await run_in_threadpool(
+            self.session_store.set,
+            sid,
+            session_claims(user_info=user_info, max_age=max_age),
+            max_age,
+        )
+        self.cookie.set(key=CookieData.Session.name, value=sid, max_age=max_age)
+
     def set_csrf_cookie(self) -> None:
         self.cookie.set(
             key=CookieData.CSRFToken.name,
@@ -121,12 +170,19 @@ class Callback(_CallbackCheck):
         code_verifier: Optional[str] = self._get_code_verifier()
         if code_verifier is None:
             return None
-        access_token: Optional[AccessToken] = await self.provider.get_access_token(
-            code_verifier=code_verifier, code=self.code, state=self.state
-        )
-        if access_token is None:
-            return None
-        user_info: Optional[UserInfo] = await self.provider.get_user_info(access_token)
+        with Instrumentation.timer(Stage.TOKEN_EXCHANGE) as timer:
+            self.token_set = await self.provider.get_token_set(
+                code_verifier=code_verifier, code=self.code, state=self.state
+            )
+            if self.token_set is None:
+                timer.fail()
+                return None
+        with Instrumentation.timer(Stage.USER_INFO_FETCH) as timer:
+            user_info: Optional[UserInfo] = await self.provider.get_user_info(
+                self.token_set.access_token
+            )
+            if user_info is None:
+                timer.fail()
         return user_info
 
     async def __call__(self) -> Response:
@@ -134,8 +190,20 @@ class Callback(_CallbackCheck):
         if not user_info:
             return self.error_response
         self.set_csrf_cookie()
-        self.set_jwt_cookie(user_info=user_info, max_age=self.jwt_max_age)
+        if self.session_store is not None:
+            await self.set_session_cookie(user_info=user_info, max_age=self.jwt_max_age)
+        else:
+            self.set_jwt_cookie(user_info=user_info, max_age=self.jwt_max_age)
+        if self.token_refresher is not None and self.token_set is not None:
+            await self.token_refresher.save(
+                provider=self.provider,
+                user_id=user_info["user_id"],
+                token_set=self.token_set,
+            )
         if self.signin_callback:
-            check_signin_signature(self.signin_callback)
-            await self.signin_callback(user_info=user_info)
+            # checked & bound once, by the flow's `compile`
+            if self.signin_queue is not None:
+                await self.signin_queue.submit(self.signin_callback, user_info)
+            else:
+                await self.signin_callback(user_info=user_info)
         return self.success_response
@@ -2,23 +2,33 @@ from __future__ import annotations
 from logging import Logger
 from typing import NamedTuple, ClassVar
 from fastauth.log import logger as flogger
+from fastauth.libtypes import ValidationLevel
 
 
 class FastAuthConfig:
-    passed_csrf_validation: ClassVar[bool] = True
     logger: ClassVar[Logger] = flogger
     debug: ClassVar[bool] = True
+    schema_validation: ClassVar[ValidationLevel] = "strict"
 
     @classmethod
     def get_defaults(cls) -> _DefaultVars:
-        return _DefaultVars(debug=cls.debug, logger=cls.logger)
+        return _DefaultVars(
+            debug=cls.debug, logger=cls.logger, schema_validation=cls.schema_validation
+        )
 
     @classmethod
-    def set_defaults(cls, debug: bool, logger: Logger) -> None:
+    def set_defaults(
+        cls,
+        debug: bool,
+        logger: Logger,
+        schema_validation: ValidationLevel = "strict",
+    ) -> None:
         cls.debug = debug
         cls.logger = logger
+        cls.schema_validation = schema_validation
 
 
 class _DefaultVars(NamedTuple):
     debug: bool
     logger: Logger
+    schema_validation: ValidationLevel
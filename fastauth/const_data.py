@@ -10,6 +10,11 @@ class CookieData:
         name: str = "jwt"
         max_age: int = 60 * 60 * 24 * 7  # 7 days
 
+    @final
+    class Session:
+        name: str = "session"
+        max_age: int = 60 * 60 * 24 * 7
+
     @final
     class CSRFToken:
         name: str = "csrf-token"
@@ -76,6 +81,7 @@ class StatusCode:
     UNAUTHORIZED = 401
     BAD_REQUEST = 400
     FORBIDDEN = 403
+    NOT_FOUND = 404
     TMP_REDIRECT = 307
 
 
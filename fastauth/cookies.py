@@ -1,12 +1,28 @@
+import re
+
 from fastapi.requests import Request
 from fastapi.responses import Response
 
-from typing import Optional, Literal, Dict, final, Final
+from functools import lru_cache
+from string import ascii_letters, digits
+from typing import Optional, Literal, Dict, Tuple, final, Final
 from fastauth.utils import name_cookie
 
+# a value made of these is written as is by `http.cookies`, anything else is quoted
+_is_plain_value: Final = re.compile(
+    "[%s]+" % re.escape(ascii_letters + digits + "!#$%&'*+-.^_`|~:")
+).fullmatch
+_VALUE_MARKER: Final = "fastauth-cookie-value"
+_EXPIRED: Final = "Thu, 01 Jan 1970 00:00:00 GMT"
+
 
 @final
 class Cookies:
+    """
+    The Set-Cookie headers are rendered once per cookie (name, max age &
+    scheme), by starlette itself, then only the value is put in for each call.
+    """
+
     _http_only: Final[bool] = True
     _samesite: Final[Literal["lax", "strict", "none"]] = "lax"
     _domain: Final = None
@@ -31,32 +47,79 @@ class Cookies:
         value: str,
         max_age: Optional[int],
     ) -> None:
-        self.response.set_cookie(
-            key=name_cookie(name=key),
-            value=value,
-            max_age=max_age,
-            path=self._path,
-            domain=self._domain,
-            secure=self._is_secure(),
-            httponly=self._http_only,
-            samesite=self._samesite,
+        if not _is_plain_value(value):
+            # quoted, left to starlette
+            return self.response.set_cookie(
+                key=name_cookie(name=key),
+                value=value,
+                max_age=max_age,
+                path=self._path,
+                domain=self._domain,
+                secure=self._is_secure(),
+                httponly=self._http_only,
+                samesite=self._samesite,
+            )
+        prefix, suffix = _set_cookie_template(key, max_age, self._is_secure())
+        self.response.raw_headers.append(
+            (b"set-cookie", prefix + value.encode("latin-1") + suffix)
         )
 
     def delete(
         self,
         key: str,
     ) -> None:
-        return self.response.delete_cookie(
-            key=name_cookie(name=key),
-            path=self._path,
-            domain=self._domain,
-            secure=self._is_secure(),
-            httponly=self._http_only,
-            samesite=self._samesite,
+        self.response.raw_headers.append(
+            (b"set-cookie", _delete_cookie_header(key, self._is_secure()))
         )
 
     def get(self, key: str) -> Optional[str]:
-        return self.request.cookies.get(name_cookie(name=key))
+        return get_cookie(self.request, key)
 
     def _is_secure(self) -> bool:
         return self.request.url.is_secure
+
+
+def get_cookie(request: Request, key: str) -> Optional[str]:
+    """
+    reading needs no response, so none gets built for it
+    """
+    return request.cookies.get(name_cookie(name=key))
+
+
+@lru_cache(maxsize=64)
+def _set_cookie_template(
+    key: str, max_age: Optional[int], secure: bool
+) -> Tuple[bytes, bytes]:
+    # the header around the value
+    header = _render(key, _VALUE_MARKER, max_age=max_age, secure=secure)
+    prefix, _, suffix = header.partition(_VALUE_MARKER.encode())
+    return prefix, suffix
+
+
+@lru_cache(maxsize=32)
+def _delete_cookie_header(key: str, secure: bool) -> bytes:
+    # starlette expires it at the current time, any time in the past will do
+    return _render(key, "", max_age=0, secure=secure, expires=_EXPIRED)
+
+
+def _render(
+    key: str,
+    value: str,
+    *,
+    max_age: Optional[int],
+    secure: bool,
+    expires: Optional[str] = None,
+) -> bytes:
+    response = Response()
+    response.set_cookie(
+        key=name_cookie(name=key),
+        value=value,
+        max_age=max_age,
+        expires=expires,
+        path=Cookies._path,
+        domain=Cookies._domain,
+        secure=secure,
+        httponly=Cookies._http_only,
+        samesite=Cookies._samesite,
+    )
+    return response.raw_headers[-1][1]
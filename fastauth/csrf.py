@@ -2,77 +2,96 @@ from __future__ import annotations
 
 import logging
 import hmac
-import hashlib
 
 from os import urandom
+from time import time
 
 from starlette.requests import Request
 from starlette.responses import Response
 
-from fastauth.libtypes import FallbackSecrets, CSRFToken
+from fastauth.libtypes import CSRFToken
 from fastauth.const_data import CookieData, StatusCode
 from fastauth.config import FastAuthConfig
 from fastauth.cookies import Cookies
+from fastauth.jwts.keyring import KeyRing, Secrets, as_keyring
+from fastauth.instrumentation import Instrumentation, Stage
 from typing import ClassVar, Optional, final
 
 logger = logging.getLogger("fastauth.adapters.fastapi.csrf")
 
 
 class CSRF:
-    fallback_secrets: ClassVar[Optional[list[str]]] = None
-    current_secret_index: ClassVar[int] = 0
+    """
+    Tokens look like `<key id>.<hmac>.<random payload>`, the key id points
+    straight at the secret that signed them. The signing secret is picked
+    from the current time bucket, so no shared state is written per call.
+    The keys come pre-keyed from the flow's `KeyRing`, copied per use, a
+    rotated secret is picked up on the next token.
+    """
+
+    keyring: ClassVar[Optional[KeyRing]] = None
+    rotation_interval: ClassVar[int] = 60 * 60  # seconds a secret stays current
 
     @classmethod
     def init_once(
         cls,
         *,
-        fallback_secrets: FallbackSecrets,
+        fallback_secrets: Secrets,
     ) -> None:
-        cls.fallback_secrets = [secret for secret in fallback_secrets if secret]
-        cls.current_secret_index = 0
+        cls.keyring = as_keyring(fallback_secrets)
 
     @classmethod
     def is_token_valid(cls, *, token: CSRFToken) -> bool:
-        if cls.fallback_secrets is not None:
-            hmac_hash, message_payload = token.split(".")
-            for i in range(len(cls.fallback_secrets)):
-                calculated_hmac = cls.create_hmac(
-                    secret=cls.fallback_secrets[i], message_payload=message_payload
+        keyring = cls.keyring
+        if keyring is None:
+            return False
+        parts = token.split(".")
+        if len(parts) == 3:
+            # signed with the CSRF subkey, or with the secret itself before it
+            kid, hmac_hash, message_payload = parts
+            keyed_hmac = keyring.csrf_hmac(kid)
+            return keyed_hmac is not None and cls._verify(
+                keyed_hmac, hmac_hash=hmac_hash, message_payload=message_payload
+            )
+        if len(parts) == 2:  # untagged tokens, issued before key ids
+            hmac_hash, message_payload = parts
+            return any(
+                cls._verify(
+                    key.legacy_csrf,
+                    hmac_hash=hmac_hash,
+                    message_payload=message_payload,
                 )
-                if hmac.compare_digest(calculated_hmac, hmac_hash):
-                    # Rotate to the next secret
-                    cls.current_secret_index = (cls.current_secret_index + 1) % len(
-                        cls.fallback_secrets
-                    )
-                    return True
+                for key in keyring.keys
+            )
         return False
 
     @classmethod
     def gen_csrf_token(cls) -> CSRFToken:
-        if cls.fallback_secrets is not None:
-            random_value: str = urandom(16).hex()
-            message_payload = random_value
-            secret = cls.fallback_secrets[
-                cls.current_secret_index
-            ]  # Use the current secret as default
-            hmac_hash = cls.create_hmac(
-                secret=secret,
-                message_payload=message_payload,
-            )
-            token = hmac_hash + "." + message_payload
-            cls.current_secret_index = (cls.current_secret_index + 1) % len(
-                cls.fallback_secrets
-            )  # Rotate to the next secret
-            return CSRFToken(token)
+        if cls.keyring is not None:
+            keys = cls.keyring.keys
+            message_payload: str = urandom(16).hex()
+            key = keys[int(time() // cls.rotation_interval) % len(keys)]
+            hmac_hash = cls._sign(key.csrf, message_payload=message_payload).hex()
+            return CSRFToken(key.csrf_kid + "." + hmac_hash + "." + message_payload)
         raise ValueError("JWT embedded value or fallback secrets not set.")
 
     @staticmethod
-    def create_hmac(secret: str, message_payload: str) -> str:
-        return hmac.new(
-            bytes(secret, "utf-8"),
-            bytes(message_payload, "utf-8"),
-            hashlib.sha256,
-        ).hexdigest()
+    def _sign(keyed_hmac: hmac.HMAC, *, message_payload: str) -> bytes:
+        h = keyed_hmac.copy()
+        h.update(message_payload.encode())
+        return h.digest()
+
+    @classmethod
+    def _verify(
+        cls, keyed_hmac: hmac.HMAC, *, hmac_hash: str, message_payload: str
+    ) -> bool:
+        try:
+            received = bytes.fromhex(hmac_hash)
+        except ValueError:
+            return False
+        return hmac.compare_digest(
+            cls._sign(keyed_hmac, message_payload=message_payload), received
+        )
 
 
 @final
@@ -94,22 +113,24 @@ class CSRFValidationFilter(CSRF, FastAuthConfig):
         )
 
     def __call__(self) -> None:
-        token = self._get_csrf_token_cookie()
-        if not token:
-            self._set_csrf_token_cookie()
-            return self.reject(
-                reason="CSRF cookie is absent / not set", request=self.request
-            )
-        if not self.is_token_valid(token=token):
-            return self.reject(
-                reason="CSRF token is incorrect, the received HMAC"
-                " and the generated one do not match.",
-                request=self.request,
-            )
-        return self.accept()
+        with Instrumentation.timer(Stage.CSRF_CHECK) as timer:
+            token = self._get_csrf_token_cookie()
+            if not token:
+                timer.fail()
+                self._set_csrf_token_cookie()
+                return self.reject(
+                    reason="CSRF cookie is absent / not set", request=self.request
+                )
+            if not self.is_token_valid(token=token):
+                timer.fail()
+                return self.reject(
+                    reason="CSRF token is incorrect, the received HMAC"
+                    " and the generated one do not match.",
+                    request=self.request,
+                )
+            return self.accept()
 
-    @classmethod
-    def reject(cls, reason: str, request: Request) -> None:
+    def reject(self, reason: str, request: Request) -> None:
         logger.warning(
             "Forbidden (%s): %s",
             reason,
@@ -119,8 +140,7 @@ class CSRFValidationFilter(CSRF, FastAuthConfig):
                 "request": request,
             },
         )
-        cls.passed_csrf_validation = False
+        request.state.passed_csrf_validation = False
 
-    @classmethod
-    def accept(cls) -> None:
-        cls.passed_csrf_validation = True
+    def accept(self) -> None:
+        self.request.state.passed_csrf_validation = True
@@ -73,6 +73,21 @@ class InvalidTokenAcquisitionRequest(FastAuthError):
         super().__init__(self.display)
 
 
+class InvalidTokenRefreshRequest(FastAuthError):
+    def __init__(
+        self, *, provider: str, debug: bool, provider_response_data: ProviderResponse
+    ) -> None:
+        self.display = (
+            f"{provider}'s authorization server refused to refresh the access token,"
+            " the `refresh_token` might have been revoked or expired. "
+        )
+        if debug:
+            self.display = (
+                self.display + f"{provider} response: {provider_response_data}"
+            )
+        super().__init__(self.display)
+
+
 class InvalidUserInfoAccessRequest(FastAuthError):
     def __init__(
         self, *, provider: str, debug: bool, provider_response_data: ProviderResponse
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final, Mapping, Optional, final
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient, AsyncBaseTransport, Limits, Timeout
+
+# the `httpx.Limits` & `httpx.Timeout` arguments, httpx is only imported
+# once the first client is created
+DEFAULT_HTTP_LIMITS: Final[Mapping[str, Any]] = {
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry": 30.0,
+}
+DEFAULT_HTTP_TIMEOUT: Final[Mapping[str, Any]] = {
+    "timeout": 10.0,
+    "connect": 5.0,
+}
+
+
+@final
+class HTTPClientPool:
+    """
+    A single keep-alive connection pool used for every call a provider makes
+    to its authorization & resource servers. It's opened and closed with the
+    app lifespan, if it's used outside of it, the client is created on first use.
+    """
+
+    def __init__(
+        self,
+        *,
+        limits: Optional[Limits] = None,
+        timeout: Optional[Timeout] = None,
+        transport: Optional[AsyncBaseTransport] = None,
+    ) -> None:
+        self.limits = limits
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[AsyncClient] = None
+
+    @property
+    def client(self) -> AsyncClient:
+        if self._client is None or self._client.is_closed:
+            from httpx import AsyncClient, Limits, Timeout
+
+            self._client = AsyncClient(
+                limits=self.limits or Limits(**DEFAULT_HTTP_LIMITS),
+                timeout=self.timeout or Timeout(**DEFAULT_HTTP_TIMEOUT),
+                transport=self.transport,
+            )
+        return self._client
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def open(self) -> None:
+        _ = self.client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
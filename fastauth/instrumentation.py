@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from threading import Lock
+from time import perf_counter
+from types import TracebackType
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Final,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    final,
+    runtime_checkable,
+)
+
+
+@final
+@dataclass(frozen=True)
+class Stage:
+    STATE_CHECK: Final = "state_check"
+    TOKEN_EXCHANGE: Final = "token_exchange"
+    USER_INFO_FETCH: Final = "user_info_fetch"
+    JWE_SEAL: Final = "jwe_seal"
+    JWE_OPEN: Final = "jwe_open"
+    CSRF_CHECK: Final = "csrf_check"
+
+
+@runtime_checkable
+class MetricsSink(Protocol):
+    def observe(self, stage: str, duration: float, ok: bool) -> None:
+        ...
+
+
+class StageTimer(Protocol):
+    def fail(self) -> None:
+        ...
+
+    def __enter__(self) -> StageTimer:
+        ...
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        ...
+
+
+class Instrumentation:
+    """
+    Times the hot path stages and hands every measurement to the attached
+    sinks, with no sink attached `timer` returns a shared no-op.
+
+        Instrumentation.attach(metrics := InMemoryMetrics())
+        ...
+        metrics.export_prometheus()
+    """
+
+    sinks: ClassVar[Tuple[MetricsSink, ...]] = ()
+
+    @classmethod
+    def attach(cls, sink: MetricsSink) -> None:
+        cls.sinks = (*cls.sinks, sink)
+
+    @classmethod
+    def detach(cls, sink: MetricsSink) -> None:
+        cls.sinks = tuple(s for s in cls.sinks if s is not sink)
+
+    @classmethod
+    def timer(cls, stage: str) -> StageTimer:
+        sinks = cls.sinks
+        if not sinks:
+            return _NOOP_TIMER
+        return _Timer(stage=stage, sinks=sinks)
+
+
+@final
+class _NoopTimer:
+    __slots__ = ()
+
+    def fail(self) -> None:
+        pass
+
+    def __enter__(self) -> _NoopTimer:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+_NOOP_TIMER: Final = _NoopTimer()
+
+
+@final
+class _Timer:
+    __slots__ = ("stage", "sinks", "ok", "start")
+
+    def __init__(self, *, stage: str, sinks: Tuple[MetricsSink, ...]) -> None:
+        self.stage = stage
+        self.sinks = sinks
+        self.ok = True
+        self.start = 0.0
+
+    def fail(self) -> None:
+        self.ok = False
+
+    def __enter__(self) -> _Timer:
+        self.start = perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        duration = perf_counter() - self.start
+        ok = self.ok and exc_type is None
+        for sink in self.sinks:
+            sink.observe(self.stage, duration, ok)
+
+
+DEFAULT_BUCKETS: Final[Tuple[float, ...]] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+@final
+class InMemoryMetrics:
+    """
+    Per stage counters & latency histograms, exportable in the Prometheus
+    text format or as a plain snapshot to feed any other backend.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str = "fastauth",
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, bool], int] = {}
+        self._histograms: Dict[str, List[int]] = {}  # last slot is +Inf
+        self._sums: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def observe(self, stage: str, duration: float, ok: bool) -> None:
+        with self._lock:
+            self._counts[stage, ok] = self._counts.get((stage, ok), 0) + 1
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [0] * (len(self.buckets) + 1)
+            histogram[bisect_left(self.buckets, duration)] += 1
+            self._sums[stage] = self._sums.get(stage, 0.0) + duration
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                stage: {
+                    "ok": self._counts.get((stage, True), 0),
+                    "failed": self._counts.get((stage, False), 0),
+                    "sum": self._sums[stage],
+                    "buckets": dict(zip((*self.buckets, float("inf")), histogram)),
+                }
+                for stage, histogram in self._histograms.items()
+            }
+
+    def export_prometheus(self) -> str:
+        total = f"{self.namespace}_stage_total"
+        seconds = f"{self.namespace}_stage_duration_seconds"
+        lines = [
+            f"# HELP {total} Hot path stages run, by outcome.",
+            f"# TYPE {total} counter",
+        ]
+        snapshot = self.snapshot()
+        for stage, data in snapshot.items():
+            for outcome in ("ok", "failed"):
+                lines.append(
+                    f'{total}{{stage="{stage}",outcome="{outcome}"}} {data[outcome]}'
+                )
+        lines += [
+            f"# HELP {seconds} Hot path stage latency.",
+            f"# TYPE {seconds} histogram",
+        ]
+        for stage, data in snapshot.items():
+            cumulative = 0
+            for upper_bound, count in data["buckets"].items():
+                cumulative += count
+                le = "+Inf" if upper_bound == float("inf") else repr(upper_bound)
+                lines.append(
+                    f'{seconds}_bucket{{stage="{stage}",le="{le}"}} {cumulative}'
+                )
+            lines.append(f'{seconds}_sum{{stage="{stage}"}} {data["sum"]}')
+            lines.append(f'{seconds}_count{{stage="{stage}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+@final
+class OpenTelemetryMetrics:
+    """
+    Records into an OpenTelemetry `Meter`, e.g. `metrics.get_meter("fastauth")`
+    """
+
+    def __init__(self, meter: Any) -> None:
+        self._durations = meter.create_histogram(
+            "fastauth.stage.duration",
+            unit="s",
+            description="Hot path stage latency",
+        )
+        self._runs = meter.create_counter(
+            "fastauth.stage.runs",
+            description="Hot path stages run, by outcome",
+        )
+
+    def observe(self, stage: str, duration: float, ok: bool) -> None:
+        attributes = {"stage": stage, "outcome": "ok" if ok else "failed"}
+        self._durations.record(duration, attributes=attributes)
+        self._runs.add(1, attributes=attributes)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import zlib
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from functools import lru_cache
+from os import urandom
+from time import time
+from typing import Any, Dict, Final, Mapping, Optional, Protocol, Union, final
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from jose.constants import ALGORITHMS
+from jose.exceptions import (
+    ExpiredSignatureError,
+    JWEError,
+    JWEParseError,
+    JWSError,
+    JWTClaimsError,
+    JWTError,
+)
+
+# the one combination fastauth issues, nested: HS256 JWS inside a dir+A256GCM JWE
+JWS_ALGORITHM: Final = ALGORITHMS.HS256
+JWE_ALGORITHM: Final = ALGORITHMS.A256GCM
+JWE_SIZE_LIMIT: Final = 250 * 1024  # the same as `jose.jwe.JWE_SIZE_LIMIT`
+
+_IV_SIZE: Final = 12  # bytes, 96 bits as required by GCM
+_TAG_SIZE: Final = 16
+_JWS_HEADER: Final = b'{"alg":"HS256","typ":"JWT"}'
+
+# a secret as is, or raw bytes derived from it
+SecretKey = Union[str, bytes]
+
+
+class CryptoBackend(Protocol):
+    def sign(self, *, claims: Mapping[str, Any], key: SecretKey) -> str:
+        ...
+
+    def verify(
+        self, *, token: str, key: SecretKey, issuer: str, subject: str
+    ) -> Dict[str, Any]:
+        ...
+
+    def encrypt(
+        self,
+        *,
+        plaintext: bytes,
+        key: SecretKey,
+        kid: str,
+        compress: bool,
+        content_type: Optional[str] = None,
+    ) -> str:
+        ...
+
+    def decrypt(self, *, token: str, key: SecretKey) -> bytes:
+        ...
+
+    def header(self, token: str) -> Dict[str, Any]:
+        ...
+
+
+@final
+class JOSEBackend:
+    """
+    Goes through python-jose's generic implementation, for any key & algorithm.
+    `jose.jwe` & `jose.jwt` load their own crypto backends, they're only
+    imported when this backend is used.
+    """
+
+    def sign(self, *, claims: Mapping[str, Any], key: SecretKey) -> str:
+        from jose import jwt
+
+        token: str = jwt.encode(claims=claims, key=key, algorithm=JWS_ALGORITHM)
+        return token
+
+    def verify(
+        self, *, token: str, key: SecretKey, issuer: str, subject: str
+    ) -> Dict[str, Any]:
+        from jose import jwt
+
+        claims: Dict[str, Any] = jwt.decode(
+            token=token,
+            key=key,
+            algorithms=JWS_ALGORITHM,
+            issuer=issuer,
+            subject=subject,
+        )
+        return claims
+
+    def encrypt(
+        self,
+        *,
+        plaintext: bytes,
+        key: SecretKey,
+        kid: str,
+        compress: bool,
+        content_type: Optional[str] = None,
+    ) -> str:
+        from jose import jwe
+
+        token: bytes = jwe.encrypt(
+            plaintext=plaintext,
+            key=key,
+            algorithm=ALGORITHMS.DIR,
+            encryption=JWE_ALGORITHM,
+            kid=kid,
+            zip="DEF" if compress else None,
+            cty=content_type,
+        )
+        return token.rstrip(b"=").decode()
+
+    def decrypt(self, *, token: str, key: SecretKey) -> bytes:
+        from jose import jwe
+
+        plaintext: bytes = jwe.decrypt(jwe_str=token, key=key)
+        return plaintext.rstrip(b"=")
+
+    def header(self, token: str) -> Dict[str, Any]:
+        from jose import jwe
+
+        header: Dict[str, Any] = jwe.get_unverified_header(token)
+        return header
+
+
+@final
+class AESGCMBackend:
+    """
+    Straight to `cryptography`'s AESGCM & the stdlib's HMAC, with the key
+    objects built once per secret. Only handles what fastauth issues, the
+    tokens are interchangeable with the `JOSEBackend` ones.
+    """
+
+    def sign(self, *, claims: Mapping[str, Any], key: SecretKey) -> str:
+        signing_input = _JWS_HEADER_SEGMENT + b"." + _b64encode(_dumps(claims))
+        signature = _hmac(key).copy()
+        signature.update(signing_input)
+        return (signing_input + b"." + _b64encode(signature.digest())).decode()
+
+    def verify(
+        self, *, token: str, key: SecretKey, issuer: str, subject: str
+    ) -> Dict[str, Any]:
+        raw = token.encode()
+        signing_input, _, signature_segment = raw.rpartition(b".")
+        header_segment, _, payload_segment = signing_input.partition(b".")
+        if not header_segment or not payload_segment:
+            raise JWTError("Not enough segments")
+        try:
+            header = json.loads(_b64decode(header_segment))
+            signature = _b64decode(signature_segment)
+            claims: Dict[str, Any] = json.loads(_b64decode(payload_segment))
+        except (ValueError, Base64Error) as e:
+            raise JWTError("Invalid token segments") from e
+        if not isinstance(header, dict) or header.get("alg") != JWS_ALGORITHM:
+            raise JWTError("The specified alg value is not allowed")
+        expected = _hmac(key).copy()
+        expected.update(signing_input)
+        if not hmac.compare_digest(expected.digest(), signature):
+            raise JWTError(JWSError("Signature verification failed."))
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+        validate_claims(claims, issuer=issuer, subject=subject)
+        return claims
+
+    def encrypt(
+        self,
+        *,
+        plaintext: bytes,
+        key: SecretKey,
+        kid: str,
+        compress: bool,
+        content_type: Optional[str] = None,
+    ) -> str:
+        header = _jwe_header_segment(
+            kid=kid, compress=compress, content_type=content_type
+        )
+        if compress:
+            plaintext = zlib.compress(plaintext)
+        iv = urandom(_IV_SIZE)
+        sealed = _aesgcm(key).encrypt(iv, plaintext, header)
+        return b".".join(
+            (
+                header,
+                b"",  # no encrypted key with `dir`
+                _b64encode(iv),
+                _b64encode(sealed[:-_TAG_SIZE]),
+                _b64encode(sealed[-_TAG_SIZE:]),
+            )
+        ).decode()
+
+    def decrypt(self, *, token: str, key: SecretKey) -> bytes:
+        if len(token) > JWE_SIZE_LIMIT:
+            raise JWEError(f"JWE string {len(token)} bytes exceeds {JWE_SIZE_LIMIT}")
+        segments = token.encode().split(b".")
+        if len(segments) != 5:
+            raise JWEParseError("Not enough segments")
+        header_segment, encrypted_key, iv, ciphertext, tag = segments
+        header = self.header(token)
+        if (
+            header.get("alg") != ALGORITHMS.DIR
+            or header.get("enc") != JWE_ALGORITHM
+            or encrypted_key
+        ):
+            raise JWEError("Unsupported JWE, expected dir + A256GCM")
+        try:
+            plaintext = _aesgcm(key).decrypt(
+                _b64decode(iv), _b64decode(ciphertext) + _b64decode(tag), header_segment
+            )
+        except (InvalidTag, ValueError, Base64Error) as e:
+            raise JWEError("Invalid JWE Auth Tag") from e
+        zip_ = header.get("zip")
+        if zip_ is None:
+            return plaintext
+        if zip_ != "DEF":
+            raise JWEError(f"ZIP {zip_} is not supported!")
+        decompressor = zlib.decompressobj()
+        decompressed = decompressor.decompress(plaintext, max_length=JWE_SIZE_LIMIT)
+        if decompressor.unconsumed_tail:
+            raise JWEError(f"Decompressed JWE string exceeds {JWE_SIZE_LIMIT} bytes")
+        return decompressed
+
+    def header(self, token: str) -> Dict[str, Any]:
+        header_segment = token.partition(".")[0]
+        try:
+            header = json.loads(_b64decode(header_segment.encode()))
+        except (ValueError, Base64Error) as e:
+            raise JWEParseError("Invalid header") from e
+        if not isinstance(header, dict):
+            raise JWEParseError("Invalid header")
+        return header
+
+
+def validate_claims(claims: Dict[str, Any], *, issuer: str, subject: str) -> None:
+    """
+    what `jose.jwt.decode` checks for the claims fastauth issues
+    """
+    for claim in ("iat", "nbf"):
+        if claim in claims and not isinstance(claims[claim], int):
+            raise JWTClaimsError(f"{claim.upper()} claim must be an integer.")
+    exp = claims.get("exp")
+    if exp is not None:
+        if not isinstance(exp, int):
+            raise JWTClaimsError("Expiration Time claim (exp) must be an integer.")
+        if exp < time():
+            raise ExpiredSignatureError("Signature has expired.")
+    nbf = claims.get("nbf")
+    if nbf is not None and nbf > time():
+        raise JWTClaimsError("The token is not yet valid (nbf)")
+    if "aud" in claims:
+        raise JWTClaimsError("Invalid audience")
+    if claims.get("iss") != issuer:
+        raise JWTClaimsError("Invalid issuer")
+    if "sub" in claims and claims["sub"] != subject:
+        raise JWTClaimsError("Invalid subject")
+    if "jti" in claims and not isinstance(claims["jti"], str):
+        raise JWTClaimsError("JWT ID must be a string.")
+
+
+def _dumps(claims: Mapping[str, Any]) -> bytes:
+    return json.dumps(claims, separators=(",", ":")).encode()
+
+
+def _b64encode(data: bytes) -> bytes:
+    return urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+_JWS_HEADER_SEGMENT: Final = _b64encode(_JWS_HEADER)
+
+
+@lru_cache(maxsize=64)
+def _jwe_header_segment(
+    *, kid: str, compress: bool, content_type: Optional[str]
+) -> bytes:
+    header: Dict[str, Optional[str]] = {"alg": ALGORITHMS.DIR, "enc": JWE_ALGORITHM}
+    if compress:
+        header["zip"] = "DEF"
+    if content_type is not None:
+        header["cty"] = content_type
+    header["kid"] = kid
+    return _b64encode(
+        json.dumps(header, separators=(",", ":"), sort_keys=True).encode()
+    )
+
+
+@lru_cache(maxsize=16)
+def _aesgcm(key: SecretKey) -> AESGCM:
+    return AESGCM(key if isinstance(key, bytes) else key.encode())
+
+
+@lru_cache(maxsize=16)
+def _hmac(key: SecretKey) -> hmac.HMAC:
+    # pre-keyed, only ever copied
+    return hmac.new(
+        key if isinstance(key, bytes) else key.encode(), digestmod=hashlib.sha256
+    )
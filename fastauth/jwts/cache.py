@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import time
+from typing import Final, Optional, Tuple, final
+
+from fastauth.libtypes import JWT
+from fastauth.jwts.keyring import KeyRing
+from fastauth.jwts.helpers import numeric_date
+
+DEFAULT_CACHE_SIZE: Final[int] = 1024
+DEFAULT_CACHE_TTL: Final[int] = 60  # seconds
+
+
+@final
+class JWTCache:
+    """
+    Bounded LRU of already verified JWT claims, keyed by a digest of the
+    encrypted cookie, so repeated reads of the same cookie skip the crypto.
+    An entry lives for `ttl` seconds at most, and never past the token's `exp`,
+    one tagged with the id of the key that sealed it only as long as the given
+    ring still holds that key.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: int = DEFAULT_CACHE_TTL,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("The cache must be able to hold at least one entry")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, Tuple[float, JWT, Optional[str]]] = OrderedDict()
+        self._lock = Lock()  # sync routes run in a threadpool
+
+    def get(
+        self, encrypted_jwt: str, keyring: Optional[KeyRing] = None
+    ) -> Optional[JWT]:
+        key = self._key(encrypted_jwt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, jwt, kid = entry
+            retired = (
+                keyring is not None and kid is not None and keyring.get(kid) is None
+            )
+            if expires_at <= time() or retired:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return jwt
+
+    def set(self, encrypted_jwt: str, jwt: JWT, kid: Optional[str] = None) -> None:
+        now = time()
+        expires_at = min(now + self.ttl, numeric_date(jwt["exp"]))
+        if expires_at <= now:
+            return
+        key = self._key(encrypted_jwt)
+        with self._lock:
+            self._entries[key] = (expires_at, jwt, kid)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(encrypted_jwt: str) -> bytes:
+        return sha256(encrypted_jwt.encode()).digest()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Final, Mapping, NamedTuple
+
+from fastauth.libtypes import JWT, UserInfo
+
+# the claims of a compact token, `iss`, `sub`, `iat`, `exp` & `jti` are kept as is
+USER_INFO_CLAIM: Final = "u"
+_USER_INFO_KEYS: Final[Mapping[str, str]] = {
+    "user_id": "i",
+    "email": "e",
+    "name": "n",
+    "avatar": "a",
+    "extras": "x",
+}
+_EXPANDED_USER_INFO_KEYS: Final[Mapping[str, str]] = {
+    short: key for key, short in _USER_INFO_KEYS.items()
+}
+
+
+class TokenFormat(NamedTuple):
+    """
+    How the claims are laid out in the JWT cookie, every format decodes
+    to the same `JWT`, whichever one is used to issue the tokens.
+    """
+
+    compact_claims: bool = False  # one letter keys, no `None` values
+    include_extras: bool = True  # the provider specific `extras`
+    compress: bool = False  # DEFLATE before encryption, JWE `"zip": "DEF"`
+    aead_only: bool = False  # the claims encrypted as is, no inner signed JWT
+
+
+DEFAULT_TOKEN_FORMAT: Final = TokenFormat()
+COMPACT_TOKEN_FORMAT: Final = TokenFormat(
+    compact_claims=True, include_extras=False, compress=True
+)
+
+
+def shape_user_info(user_info: UserInfo, token_format: TokenFormat) -> Dict[str, Any]:
+    items = user_info.items()
+    if not token_format.include_extras:
+        items = ((key, value) for key, value in items if key != "extras")  # type: ignore
+    if not token_format.compact_claims:
+        return dict(items)
+    return {
+        _USER_INFO_KEYS.get(key, key): value
+        for key, value in items
+        if value is not None
+    }
+
+
+def expand_claims(claims: Dict[str, Any]) -> JWT:
+    compact_user_info = claims.pop(USER_INFO_CLAIM, None)
+    if compact_user_info is not None:
+        user_info = {"avatar": None}  # dropped from the token when absent
+        for key, value in compact_user_info.items():
+            user_info[_EXPANDED_USER_INFO_KEYS.get(key, key)] = value
+        claims["user_info"] = user_info
+    jwt: JWT = claims  # type: ignore[assignment]
+    return jwt
@@ -8,11 +8,14 @@ from starlette.responses import Response, JSONResponse
 from fastauth.adapters.use_response import use_response
 from fastauth.libtypes import JWT, ViewableJWT
 from fastauth.const_data import CookieData
-from fastauth.libtypes import FallbackSecrets
+from fastauth.jwts.keyring import Secrets, as_keyring
 from fastauth.cookies import Cookies
-from fastauth.jwts.operations import decipher_jwt
+from fastauth.jwts.operations import JWTCrypto, decipher_jwt, check_revocation
+from fastauth.jwts.revocation import RevocationList
+from fastauth.jwts.cache import JWTCache
 from fastauth.const_data import StatusCode
 from fastauth.exceptions import JSONWebTokenTampering
+from fastauth.sessions import SessionStore
 
 
 class JWTHandler:
@@ -21,25 +24,31 @@ class JWTHandler:
         *,
         request: Request,
         response: Response,
-        fallback_secrets: FallbackSecrets,
+        fallback_secrets: Secrets,
         logger: Logger,
         debug: bool,
+        jwt_cache: Optional[JWTCache] = None,
+        session_store: Optional[SessionStore] = None,
+        revocation_list: Optional[RevocationList] = None,
     ) -> None:
         self.logger = logger
         self.request = request
         self.response = response
         self.fallback_secrets = fallback_secrets
         self.debug = debug
+        self.jwt_cache = jwt_cache
+        self.session_store = session_store
+        self.revocation_list = revocation_list
         self.cookie = Cookies(request=self.request, response=self.response)
         self.json_response = use_response(response_type="json")
 
     def get_jwt(self) -> JSONResponse:
+        if self.session_store is not None:
+            return self._get_session()
         encrypted_jwt = self._get_jwt_cookie()
         if encrypted_jwt:
             try:
-                jwt: JWT = decipher_jwt(
-                    encrypted_jwt=encrypted_jwt, fallback_secrets=self.fallback_secrets
-                )
+                jwt: JWT = self._decipher_jwt(encrypted_jwt)
                 return self.json_response(  # type: ignore
                     content=ViewableJWT(jwt=jwt), status_code=StatusCode.OK
                 )
@@ -50,6 +59,23 @@ class JWTHandler:
             content=ViewableJWT(jwt=None), status_code=StatusCode.UNAUTHORIZED
         )
 
+    def _get_session(self) -> JSONResponse:
+        assert self.session_store is not None
+        sid = self.cookie.get(CookieData.Session.name)
+        jwt = self.session_store.get(sid) if sid else None
+        return self.json_response(  # type: ignore
+            content=ViewableJWT(jwt=jwt),
+            status_code=StatusCode.OK if jwt is not None else StatusCode.UNAUTHORIZED,
+        )
+
+    def _decipher_jwt(self, encrypted_jwt: str) -> JWT:
+        return read_jwt(
+            encrypted_jwt,
+            fallback_secrets=self.fallback_secrets,
+            jwt_cache=self.jwt_cache,
+            revocation_list=self.revocation_list,
+        )
+
     def _get_jwt_cookie(self) -> Optional[str]:  # pragma: no cover
         return self.cookie.get(CookieData.JWT.name)
 
@@ -58,3 +84,28 @@ class JWTHandler:
         self.logger.warning(err)
         if self.debug:
             raise err
+
+
+def read_jwt(
+    encrypted_jwt: str,
+    *,
+    fallback_secrets: Secrets,
+    jwt_cache: Optional[JWTCache] = None,
+    revocation_list: Optional[RevocationList] = None,
+) -> JWT:
+    """
+    the claims of a JWT cookie, from the cache when possible, raises `JOSEError`
+    """
+    keyring = as_keyring(fallback_secrets)
+    jwt = jwt_cache.get(encrypted_jwt, keyring) if jwt_cache is not None else None
+    if jwt is None:
+        jwt = decipher_jwt(encrypted_jwt=encrypted_jwt, fallback_secrets=keyring)
+        if jwt_cache is not None:
+            kid = JWTCrypto.backend.header(encrypted_jwt).get("kid")
+            # untagged tokens, from before the key ids, name no key to check on a hit
+            if kid is not None:
+                jwt_cache.set(encrypted_jwt, jwt, kid)
+    if revocation_list is not None:
+        # cached or not, a token signed out since is refused
+        check_revocation(jwt, revocation_list)
+    return jwt
@@ -1,4 +1,12 @@
+from datetime import datetime
+from functools import lru_cache
 from os import urandom
+from hashlib import sha256
+from typing import Union
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
 from fastauth.exceptions import WrongKeyLength
 
 
@@ -14,3 +22,32 @@ def validate_secret_key(key: str) -> str:
     if len(key) != 32:
         raise WrongKeyLength()
     return key
+
+
+def key_id(key: str) -> str:
+    """
+    a short, non-reversible identifier of a secret key, embedded in the
+    tokens it seals so the right key can be picked without trying them all
+    """
+    return sha256(key.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=64)
+def derive_key(key: str, purpose: str) -> bytes:
+    """
+    a 256 bits HKDF subkey of a secret, one per purpose, so a key used for
+    one thing never gets used as is for another
+    """
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=f"fastauth:{purpose}".encode(),
+    ).derive(key.encode())
+
+
+def numeric_date(value: Union[datetime, int, float]) -> float:
+    # decoded claims hold a NumericDate, the `JWT` type describes a `datetime`
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+
+from functools import lru_cache
+from threading import Lock
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    final,
+)
+
+from fastauth.jwts.helpers import derive_key, key_id, validate_secret_key
+
+# the purpose the AEAD only tokens were first sealed under, every JWE uses it now
+JWE_KEY_PURPOSE: Final = "jwe-aead"
+JWS_KEY_PURPOSE: Final = "jws"
+CSRF_KEY_PURPOSE: Final = "csrf"
+
+
+class Key(NamedTuple):
+    """
+    a validated secret & everything derived from it, built once per secret
+    """
+
+    kid: str  # tags the JWEs it seals, `key_id(secret)`
+    secret: str  # as is, only to open the tokens issued before the subkeys
+    jwe: bytes
+    jws: bytes
+    csrf_kid: str  # tags the CSRF tokens it signs
+    csrf: hmac.HMAC  # pre-keyed with the CSRF subkey, only ever copied
+    legacy_csrf: hmac.HMAC  # pre-keyed with the secret itself
+
+
+class _KeySet(NamedTuple):
+    keys: Tuple[Key, ...]
+    by_id: Dict[str, Key]
+    csrf_by_id: Dict[str, hmac.HMAC]
+
+
+@final
+class KeyRing:
+    """
+    Any number of secrets, validated & derived into per purpose subkeys once,
+    the first one seals, all of them open. Every crypto path reads the same
+    ring, rotating a secret swaps the whole set at once, no restart needed.
+    """
+
+    def __init__(self, secrets: Iterable[str]) -> None:
+        self._key_set = _key_set(tuple(secrets))
+        self._lock = Lock()
+
+    @property
+    def current(self) -> Key:
+        return self._key_set.keys[0]
+
+    @property
+    def keys(self) -> Tuple[Key, ...]:
+        return self._key_set.keys
+
+    def get(self, kid: str) -> Optional[Key]:
+        return self._key_set.by_id.get(kid)
+
+    def csrf_hmac(self, kid: str) -> Optional[hmac.HMAC]:
+        return self._key_set.csrf_by_id.get(kid)
+
+    def rotate(self, secret: str) -> None:
+        """
+        the new secret seals from now on, the older ones still open
+        """
+        with self._lock:
+            self._key_set = _key_set(
+                (secret, *(key.secret for key in self._key_set.keys))
+            )
+
+    def retire(self, kid: str) -> None:
+        """
+        the tokens sealed with that key are refused from now on
+        """
+        with self._lock:
+            self._key_set = _key_set(
+                tuple(key.secret for key in self._key_set.keys if key.kid != kid)
+            )
+
+    def __len__(self) -> int:
+        return len(self._key_set.keys)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the HMAC states & the lock don't pickle, the secrets do
+        return KeyRing, (tuple(key.secret for key in self._key_set.keys),)
+
+
+Secrets = Union[KeyRing, Sequence[str]]
+
+
+def as_keyring(secrets: Secrets) -> KeyRing:
+    """
+    the ring itself, or one built out of the given secrets, the keys of the
+    latter are only derived on the first call
+    """
+    if isinstance(secrets, KeyRing):
+        return secrets
+    return KeyRing(secrets)
+
+
+@lru_cache(maxsize=16)
+def _key_set(secrets: Tuple[str, ...]) -> _KeySet:
+    if not secrets:
+        raise ValueError("At least one secret is required")
+    # a secret given twice is only kept where it first appears
+    keys = tuple(_key(secret) for secret in dict.fromkeys(secrets))
+    csrf_by_id = {key.csrf_kid: key.csrf for key in keys}
+    csrf_by_id.update((key.kid, key.legacy_csrf) for key in keys)
+    return _KeySet(
+        keys=keys, by_id={key.kid: key for key in keys}, csrf_by_id=csrf_by_id
+    )
+
+
+@lru_cache(maxsize=64)
+def _key(secret: str) -> Key:
+    secret = validate_secret_key(secret)
+    csrf = derive_key(secret, CSRF_KEY_PURPOSE)
+    return Key(
+        kid=key_id(secret),
+        secret=secret,
+        jwe=derive_key(secret, JWE_KEY_PURPOSE),
+        jws=derive_key(secret, JWS_KEY_PURPOSE),
+        csrf_kid=hashlib.sha256(csrf).hexdigest()[:16],
+        csrf=hmac.new(csrf, digestmod=hashlib.sha256),
+        legacy_csrf=hmac.new(secret.encode(), digestmod=hashlib.sha256),
+    )
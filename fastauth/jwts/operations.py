@@ -1,78 +1,269 @@
-from jose.jwt import encode as encode_jwt
-from jose.jwt import decode as decode_jwt
-from jose.exceptions import JOSEError
-from jose.jwt import ALGORITHMS
-from jose.jwe import encrypt, decrypt
-from datetime import datetime, timedelta
+import json
+
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from jose.exceptions import JOSEError, JWEError, JWTError
+from time import time
+from secrets import token_urlsafe
 from fastauth.const_data import CookieData
-from fastauth.jwts.helpers import validate_secret_key
-from fastauth.libtypes import JWT, UserInfo, FallbackSecrets
-from typing import Optional, Final
+from fastauth.jwts.keyring import Key, Secrets, as_keyring
+from fastauth.libtypes import JWT, UserInfo
+from fastauth.instrumentation import Instrumentation, Stage
+from fastauth.jwts.revocation import RevocationList
+from fastauth.jwts.backends import (
+    JWE_ALGORITHM as JWE_ALGORITHM,
+    JWS_ALGORITHM,
+    AESGCMBackend,
+    CryptoBackend,
+    validate_claims,
+)
+from fastauth.jwts.claims import (
+    DEFAULT_TOKEN_FORMAT,
+    USER_INFO_CLAIM,
+    TokenFormat,
+    expand_claims,
+    shape_user_info,
+)
+from typing import (
+    Any,
+    ClassVar,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Final,
+    final,
+)
 
 JWT_MAX_AGE: Final = CookieData.JWT.max_age
-JWT_ALGORITHM: Final = ALGORITHMS.HS256
-JWE_ALGORITHM: Final = ALGORITHMS.A256GCM
+JWT_ALGORITHM: Final = JWS_ALGORITHM
 ISSUER: Final = "fastauth"
 SUBJECT: Final = "client"
+# the JWE `cty` of the tokens holding the claims as is, no JWS inside
+AEAD_CONTENT_TYPE: Final = "fastauth+json"
+# the JWE `cty` of a JWS sealed with the subkeys, the older ones have none
+NESTED_CONTENT_TYPE: Final = "JWT"
+DEFAULT_BATCH_SIZE: Final[int] = 64  # tokens per task handed to an executor
+_PENDING_BATCHES: Final[int] = 32  # submitted ahead, bounds what's held in memory
+
+
+@final
+class JWTCrypto:
+    """
+    the backend every JWT is sealed & opened with, swap it with `JWTCrypto.use`
+    """
+
+    backend: ClassVar[CryptoBackend] = AESGCMBackend()
+
+    @classmethod
+    def use(cls, backend: CryptoBackend) -> None:
+        cls.backend = backend
 
 
 def encipher_user_info(
     user_info: UserInfo,
-    fallback_secrets: FallbackSecrets,
+    fallback_secrets: Secrets,
     max_age: int = JWT_MAX_AGE,
+    token_format: TokenFormat = DEFAULT_TOKEN_FORMAT,
 ) -> str:
-    now = datetime.utcnow()
-    e: Optional[JOSEError] = None
-    for secret in fallback_secrets:
-        key = validate_secret_key(secret)
+    with Instrumentation.timer(Stage.JWE_SEAL):
+        return _encipher_user_info(
+            user_info=user_info,
+            fallback_secrets=fallback_secrets,
+            max_age=max_age,
+            token_format=token_format,
+        )
+
+
+def decipher_jwt(
+    encrypted_jwt: str,
+    fallback_secrets: Secrets,
+    revocation_list: Optional[RevocationList] = None,
+) -> JWT:
+    with Instrumentation.timer(Stage.JWE_OPEN):
+        jwt = _decipher_jwt(
+            encrypted_jwt=encrypted_jwt, fallback_secrets=fallback_secrets
+        )
+    if revocation_list is not None:
+        check_revocation(jwt, revocation_list)
+    return jwt
+
+
+class DecipheredJWT(NamedTuple):
+    token: str
+    jwt: Optional[JWT]  # `None` when the token is refused
+    error: Optional[JOSEError]
+
+
+def decipher_jwts(
+    encrypted_jwts: Iterable[str],
+    fallback_secrets: Secrets,
+    *,
+    revocation_list: Optional[RevocationList] = None,
+    executor: Optional[Executor] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[DecipheredJWT]:
+    """
+    Deciphers many tokens, yielded lazily in their original order, a refused
+    token carries its error instead of raising. With an `executor` (thread or
+    process pool) the tokens are handed out in batches of `batch_size`, a
+    process pool uses the default `JWTCrypto` backend.
+    """
+    if batch_size < 1:
+        raise ValueError("Expected a positive batch size")
+    keyring = as_keyring(fallback_secrets)  # derived once, not per batch
+    tokens = iter(encrypted_jwts)
+    batches = iter(lambda: list(islice(tokens, batch_size)), [])
+    if executor is None:
+        results: Iterator[DecipheredJWT] = (
+            result
+            for batch in batches
+            for result in _decipher_batch(batch, keyring)
+        )
+    else:
+        results = _decipher_concurrently(batches, keyring, executor)
+    for result in results:
+        if revocation_list is not None and result.jwt is not None:
+            try:
+                check_revocation(result.jwt, revocation_list)
+            except JOSEError as e:
+                result = DecipheredJWT(result.token, None, e)
+        yield result
+
+
+def _decipher_concurrently(
+    batches: Iterator[List[str]],
+    fallback_secrets: Secrets,
+    executor: Executor,
+) -> Iterator[DecipheredJWT]:
+    pending: Deque[Future[List[DecipheredJWT]]] = deque()
+    try:
+        for batch in batches:
+            pending.append(executor.submit(_decipher_batch, batch, fallback_secrets))
+            if len(pending) >= _PENDING_BATCHES:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:  # the consumer stopped early
+            future.cancel()
+
+
+def _decipher_batch(
+    encrypted_jwts: List[str], fallback_secrets: Secrets
+) -> List[DecipheredJWT]:
+    # module level, so process pools can pickle it
+    results = []
+    for encrypted_jwt in encrypted_jwts:
         try:
-            plain_jwt: str = encode_jwt(
-                claims=JWT(
-                    iss=ISSUER,
-                    sub=SUBJECT,
-                    iat=now,
-                    exp=now + timedelta(seconds=max_age),
-                    user_info=user_info,
-                ),
-                key=key,
-                algorithm=JWT_ALGORITHM,
+            jwt = _decipher_jwt(
+                encrypted_jwt=encrypted_jwt, fallback_secrets=fallback_secrets
             )
+            results.append(DecipheredJWT(encrypted_jwt, jwt, None))
+        except JOSEError as e:
+            results.append(DecipheredJWT(encrypted_jwt, None, e))
+    return results
 
-            encrypted_jwt: str = (
-                encrypt(
-                    plaintext=plain_jwt.encode(),
-                    key=key,
-                    algorithm=ALGORITHMS.DIR,
-                    encryption=JWE_ALGORITHM,
-                )
-                .rstrip(b"=")
-                .decode()
-            )
 
-            return encrypted_jwt
-        except JOSEError as exc:  # pragma: no cover
-            e = exc
-    raise (
-        e if e is not None else ValueError(e)
-    )  # pragma: no cover # the latter never happens
+def check_revocation(jwt: JWT, revocation_list: RevocationList) -> None:
+    jti = jwt.get("jti")
+    if jti is not None and revocation_list.is_revoked(jti):
+        raise JWTError("The token has been revoked")
 
 
-def decipher_jwt(encrypted_jwt: str, fallback_secrets: FallbackSecrets) -> JWT:
+def _encipher_user_info(
+    *,
+    user_info: UserInfo,
+    fallback_secrets: Secrets,
+    max_age: int,
+    token_format: TokenFormat,
+) -> str:
+    now = int(time())  # NumericDate, what `datetime` claims are encoded to anyway
+    claims: Dict[str, Any] = {
+        "iss": ISSUER,
+        "sub": SUBJECT,
+        "iat": now,
+        "exp": now + max_age,
+        "jti": token_urlsafe(16),
+        (USER_INFO_CLAIM if token_format.compact_claims else "user_info"): (
+            shape_user_info(user_info, token_format)
+        ),
+    }
+    backend = JWTCrypto.backend
+    key = as_keyring(fallback_secrets).current
+    if token_format.aead_only:
+        # GCM authenticates already, the JWS would only be redone work
+        return backend.encrypt(
+            plaintext=json.dumps(claims, separators=(",", ":")).encode(),
+            key=key.jwe,
+            kid=key.kid,
+            compress=token_format.compress,
+            content_type=AEAD_CONTENT_TYPE,
+        )
+    plain_jwt = backend.sign(claims=claims, key=key.jws)
+    return backend.encrypt(
+        plaintext=plain_jwt.encode(),
+        key=key.jwe,
+        kid=key.kid,
+        compress=token_format.compress,
+        content_type=NESTED_CONTENT_TYPE,
+    )
+
+
+def _decipher_jwt(*, encrypted_jwt: str, fallback_secrets: Secrets) -> JWT:
+    keyring = as_keyring(fallback_secrets)
+    header = JWTCrypto.backend.header(encrypted_jwt)
+    content_type: Optional[str] = header.get("cty")
+    kid = header.get("kid")
+    if kid is not None:
+        # read from the unauthenticated header, anything but a string names no key
+        if not isinstance(kid, str):
+            raise JWEError("Invalid key id, expected a string")
+        key = keyring.get(kid)
+        if key is None:
+            raise JWEError("The token was not sealed by any of the given secrets")
+        return _decipher_with_key(
+            encrypted_jwt=encrypted_jwt, key=key, content_type=content_type
+        )
+    # untagged tokens issued before key ids were introduced
     e: Optional[JOSEError] = None
-    for secret in fallback_secrets:
-        key = validate_secret_key(secret)
+    for key in keyring.keys:
         try:
-            decrypted_jwt: str = (
-                decrypt(jwe_str=encrypted_jwt, key=key).rstrip(b"=").decode()
-            )
-            jwt: JWT = decode_jwt(
-                token=decrypted_jwt,
-                key=key,
-                algorithms=JWT_ALGORITHM,
-                issuer=ISSUER,
-                subject=SUBJECT,
+            return _decipher_with_key(
+                encrypted_jwt=encrypted_jwt, key=key, content_type=content_type
             )
-            return jwt
         except JOSEError as exc:
             e = exc
     raise e if e is not None else ValueError(e)
+
+
+def _decipher_with_key(
+    *, encrypted_jwt: str, key: Key, content_type: Optional[str]
+) -> JWT:
+    backend = JWTCrypto.backend
+    if content_type == AEAD_CONTENT_TYPE:
+        plaintext = backend.decrypt(token=encrypted_jwt, key=key.jwe)
+        try:
+            claims = json.loads(plaintext)
+        except ValueError as e:
+            raise JWTError("Invalid payload string") from e
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload string: must be a json object")
+        validate_claims(claims, issuer=ISSUER, subject=SUBJECT)
+        return expand_claims(claims)
+    # no `cty`, sealed & signed with the secret itself, before the subkeys
+    nested = content_type == NESTED_CONTENT_TYPE
+    decrypted_jwt = backend.decrypt(
+        token=encrypted_jwt, key=key.jwe if nested else key.secret
+    ).decode()
+    claims = backend.verify(
+        token=decrypted_jwt,
+        key=key.jws if nested else key.secret,
+        issuer=ISSUER,
+        subject=SUBJECT,
+    )
+    return expand_claims(claims)
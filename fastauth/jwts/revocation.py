@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from threading import Lock
+from time import time
+from typing import Dict, Final, Union, final
+
+from fastauth.jwts.helpers import numeric_date
+
+DEFAULT_REVOCATION_CAPACITY: Final[int] = 100_000
+
+
+@final
+class RevocationList:
+    """
+    The `jti`s of the signed out tokens, until the tokens expire on their own.
+    The common "not revoked" case is a single dict lookup, the dict only holds
+    the tokens that have not expired yet.
+    """
+
+    def __init__(self, *, capacity: int = DEFAULT_REVOCATION_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("Expected a positive capacity")
+        self.capacity = capacity
+        self._revoked: Dict[str, float] = {}  # jti -> exp
+        self._lock = Lock()
+
+    def revoke(self, jti: str, expires_at: Union[datetime, int, float]) -> None:
+        exp = numeric_date(expires_at)
+        if exp <= time():
+            return  # already unusable
+        with self._lock:
+            if len(self._revoked) >= self.capacity:
+                self._prune()
+            self._revoked[jti] = exp
+
+    def is_revoked(self, jti: str) -> bool:
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time()
+
+    def prune(self) -> int:
+        with self._lock:
+            return self._prune()
+
+    def _prune(self) -> int:
+        now = time()
+        before = len(self._revoked)
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        if len(self._revoked) >= self.capacity:
+            self.capacity *= 2  # still full, more sign outs than planned
+        return before - len(self._revoked)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
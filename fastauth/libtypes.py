@@ -11,6 +11,7 @@ from typing import (
     Callable,
     Awaitable,
     Union,
+    Literal,
 )
 
 AccessToken = NewType("AccessToken", str)
@@ -22,6 +23,10 @@ ProviderJSONResponse = Mapping[str, Any]
 
 ProviderResponse = Union[ProviderJSONResponse, str]
 
+# "strict" parses every provider response with its pydantic model, "fast" checks
+# the expected shape by hand first, only what doesn't fit it goes through pydantic
+ValidationLevel = Literal["strict", "fast"]
+
 Scope = MutableMapping[str, Any]
 Message = MutableMapping[str, Any]
 
@@ -37,6 +42,12 @@ class ProviderResponseData(NamedTuple):
     text: str
 
 
+class TokenSet(NamedTuple):
+    access_token: AccessToken
+    refresh_token: Optional[str]
+    expires_at: Optional[float]  # unix time, None when the provider does not say
+
+
 class ViewableJWT(TypedDict):
     """
     What the developer will see when navigating to the
@@ -54,7 +65,7 @@ class UserInfo(TypedDict):
     avatar: Optional[str]  # some do not have an avatar
 
 
-class JWT(TypedDict):
+class _JWTClaims(TypedDict):
     iss: str
     sub: str
     iat: datetime
@@ -62,6 +73,10 @@ class JWT(TypedDict):
     user_info: UserInfo
 
 
+class JWT(_JWTClaims, total=False):
+    jti: str  # absent from the tokens issued before revocation
+
+
 class GrantSecurityParams(NamedTuple):
     state: str
     # PKCE
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Optional
-from fastauth.libtypes import FallbackSecrets
-from fastauth.signin import SignInCallback
+from typing import Dict, Optional, Sequence
+from fastauth.signin import SignInCallback, bind_signin_callback
+from fastauth.jwts.keyring import Secrets, as_keyring
 from fastauth.config import FastAuthConfig
 from fastauth.providers.base import Provider
 
@@ -10,8 +10,8 @@ class OAuth2Base(ABC, FastAuthConfig):
     def __init__(
         self,
         *,
-        provider: Provider,
-        fallback_secrets: FallbackSecrets,
+        providers: Sequence[Provider],
+        fallback_secrets: Secrets,
         signin_uri: str,
         signout_url: str,
         callback_uri: str,
@@ -23,7 +23,13 @@ class OAuth2Base(ABC, FastAuthConfig):
         error_uri: str,
         jwt_max_age: int,
     ) -> None:
-        self.provider = provider
+        self.providers: Dict[str, Provider] = {}
+        for provider in providers:
+            if provider.provider in self.providers:
+                raise ValueError(f"{provider.provider} is registered more than once")
+            self.providers[provider.provider] = provider
+        if not self.providers:
+            raise ValueError("At least one provider is required")
         self.signin_uri = signin_uri
         self.signout_uri = signout_url
         self.post_signin_uri = post_signin_uri
@@ -36,6 +42,18 @@ class OAuth2Base(ABC, FastAuthConfig):
         self.fallback_secrets = fallback_secrets
         self.signin_callback = signin_callback
 
+    def compile(self) -> None:
+        """
+        everything that can be checked or prepared once is done here, before the
+        first request, a misconfiguration fails at startup rather than on a login
+        """
+        # validated & derived here, every handler shares the one ring
+        self.keyring = as_keyring(self.fallback_secrets)
+        if self.jwt_max_age <= 0:
+            raise ValueError(f"Expected a positive JWT max age, got {self.jwt_max_age}")
+        if self.signin_callback is not None:
+            self.signin_callback = bind_signin_callback(self.signin_callback)
+
     @abstractmethod
     def on_signin(self) -> None:
         ...
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
 from logging import Logger
+from typing import TYPE_CHECKING, Optional, Sequence, Type, Union
 
-from fastapi import APIRouter
-
-from fastauth.providers.base import Provider
-from fastauth.libtypes import FallbackSecrets
-from fastauth.signin import SignInCallback
+from fastauth.libtypes import ValidationLevel
 from fastauth.const_data import CookieData
-from fastauth.adapters.fastapi.flow import FastAPIOAuthFlow as FastAPIOAuth2
 from fastauth.log import logger as flogger
 from fastauth.config import FastAuthConfig
+from fastauth.jwts.claims import DEFAULT_TOKEN_FORMAT, TokenFormat
+
+if TYPE_CHECKING:
+    # the flow, hence fastapi, httpx & the crypto, is only imported once
+    # the router gets built
+    from fastapi import APIRouter
+    from httpx import Limits, Timeout
+
+    from fastauth.providers.base import Provider
+    from fastauth.signin import SignInCallback
+    from fastauth.adapters.fastapi.route import FastAuthRoute
+    from fastauth.jwts.cache import JWTCache
+    from fastauth.refresh import TokenRefresher
+    from fastauth.sessions import SessionStore
+    from fastauth.jwts.revocation import RevocationList
+    from fastauth.jwts.keyring import Secrets
+    from fastauth.signin_queue import SignInQueue
 
 
 def OAuthOptions(
-    provider: Provider,
-    fallback_secrets: FallbackSecrets,
+    provider: Union[Provider, Sequence[Provider]],
+    fallback_secrets: Secrets,
     signin_callback: SignInCallback,
     signin_uri: str = "/auth/signin",
     signout_url: str = "/auth/signout",
@@ -28,10 +41,25 @@ def OAuthOptions(
     jwt_max_age: int = CookieData.JWT.max_age,
     debug: bool = True,
     logger: Logger = flogger,
+    http_limits: Optional[Limits] = None,
+    http_timeout: Optional[Timeout] = None,
+    jwt_cache: Optional[JWTCache] = None,
+    route_class: Optional[Type[FastAuthRoute]] = None,
+    token_refresher: Optional[TokenRefresher] = None,
+    session_store: Optional[SessionStore] = None,
+    revocation_list: Optional[RevocationList] = None,
+    token_format: TokenFormat = DEFAULT_TOKEN_FORMAT,
+    schema_validation: ValidationLevel = "strict",
+    signin_queue: Optional[SignInQueue] = None,
 ) -> APIRouter:
-    FastAuthConfig.set_defaults(debug=debug, logger=logger)
-    auth = FastAPIOAuth2(
-        provider=provider,
+    from fastauth.adapters.fastapi.flow import FastAPIOAuthFlow
+    from fastauth.adapters.fastapi.route import FastAuthRoute
+
+    FastAuthConfig.set_defaults(
+        debug=debug, logger=logger, schema_validation=schema_validation
+    )
+    auth = FastAPIOAuthFlow(
+        providers=provider if isinstance(provider, Sequence) else [provider],
         fallback_secrets=fallback_secrets,
         signin_callback=signin_callback,
         signin_uri=signin_uri,
@@ -43,5 +71,14 @@ def OAuthOptions(
         post_signout_uri=post_signout_uri,
         error_uri=error_uri,
         jwt_max_age=jwt_max_age,
+        http_limits=http_limits,
+        http_timeout=http_timeout,
+        jwt_cache=jwt_cache,
+        route_class=route_class or FastAuthRoute,
+        token_refresher=token_refresher,
+        session_store=session_store,
+        revocation_list=revocation_list,
+        token_format=token_format,
+        signin_queue=signin_queue,
     )
     return auth.auth_route
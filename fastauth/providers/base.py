@@ -8,15 +8,22 @@ from typing import (
     ParamSpec,
     Callable,
     Optional,
+    NamedTuple,
 )
+from urllib.parse import quote, urlencode
 
-from httpx import AsyncClient
 from starlette.responses import RedirectResponse
 
 from fastauth.adapters.use_response import use_response
-from fastauth.utils import querify_kwargs
-from fastauth.libtypes import UserInfo, QueryParams, ProviderResponseData, AccessToken
+from fastauth.libtypes import (
+    UserInfo,
+    QueryParams,
+    ProviderResponseData,
+    AccessToken,
+    TokenSet,
+)
 from fastauth.config import FastAuthConfig
+from fastauth.http_client import HTTPClientPool
 
 
 _T = TypeVar("_T")
@@ -41,6 +48,7 @@ class Provider(ABC, FastAuthConfig):
         authorizationUrl: str,
         tokenUrl: str,
         userInfo: str,
+        authorization_params: Optional[QueryParams] = None,
     ) -> None:
         self.provider = provider
         self.client_id = client_id
@@ -49,6 +57,16 @@ class Provider(ABC, FastAuthConfig):
         self.authorizationUrl = authorizationUrl
         self.tokenUrl = tokenUrl
         self.userInfo = userInfo
+        self.authorization_params: QueryParams = dict(authorization_params or {})
+        self.http = HTTPClientPool()
+        self._redirect_response = use_response(response_type="redirect")
+        self._grant_uri_template = self._compile_grant_uri(
+            response_type=self.response_type,
+            authorizationUrl=authorizationUrl,
+            client_id=client_id,
+            redirect_uri=redirect_uri,
+            kwargs=self.authorization_params,
+        )
 
     @abstractmethod
     def authorize(
@@ -66,6 +84,27 @@ class Provider(ABC, FastAuthConfig):
     async def get_user_info(self, access_token: str) -> Optional[UserInfo]:
         ...
 
+    async def get_token_set(
+        self, *, code_verifier: str, code: str, state: str
+    ) -> Optional[TokenSet]:
+        """
+        override to keep the refresh token & the expiry, by default only the
+        access token is known, which can never be refreshed
+        """
+        access_token = await self.get_access_token(
+            code_verifier=code_verifier, code=code, state=state
+        )
+        if access_token is None:
+            return None
+        return TokenSet(access_token=access_token, refresh_token=None, expires_at=None)
+
+    async def refresh_access_token(self, refresh_token: str) -> Optional[TokenSet]:
+        """
+        override with `_request_token_refresh` for the providers that support it
+        """
+        self.logger.debug("%s does not support refreshing tokens", self.provider)
+        return None
+
     @final
     def _grant_redirect(
         self,
@@ -74,52 +113,75 @@ class Provider(ABC, FastAuthConfig):
         code_challenge_method: str,
         **kwargs: str,
     ) -> RedirectResponse:
-        # private as it's only here for testing it serves no other purpose
-        self._grant_redirect_url = self._create_grant_uri(
-            response_type=self.response_type,
-            authorizationUrl=self.authorizationUrl,
-            client_id=self.client_id,
-            redirect_uri=self.redirect_uri,
-            state=state,
-            code_challenge=code_challenge,
-            code_challenge_method=code_challenge_method,
-            kwargs=kwargs,
+        template = self._grant_uri_template
+        if kwargs:  # extras that were not known at construction, on top of the rest
+            template = self._compile_grant_uri(
+                response_type=self.response_type,
+                authorizationUrl=self.authorizationUrl,
+                client_id=self.client_id,
+                redirect_uri=self.redirect_uri,
+                kwargs={**self.authorization_params, **kwargs},
+            )
+        return self._redirect_response(  # type: ignore
+            url=template.render(
+                state=state,
+                code_challenge=code_challenge,
+                code_challenge_method=code_challenge_method,
+            )
         )
-        self.redirect_response = use_response(response_type="redirect")
-        return self.redirect_response(url=self._grant_redirect_url)  # type: ignore
+
+    @final
+    def use_http_pool(self, http_pool: HTTPClientPool) -> None:
+        self.http = http_pool
 
     @final
     async def _request_access_token(
         self, *, code_verifier: str, code: str, state: str, **kwargs: str
     ) -> ProviderResponseData:
-        async with AsyncClient() as client:
-            res = await client.post(
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                url=self.tokenUrl,
-                data=self._token_request_payload(
-                    code=code,
-                    state=state,
-                    code_verifier=code_verifier,
-                    **kwargs,
-                ),
-            )
-            return ProviderResponseData(
-                status_code=res.status_code, json=res.json(), text=res.text
-            )
+        res = await self.http.client.post(
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            url=self.tokenUrl,
+            data=self._token_request_payload(
+                code=code,
+                state=state,
+                code_verifier=code_verifier,
+                **kwargs,
+            ),
+        )
+        return ProviderResponseData(
+            status_code=res.status_code, json=res.json(), text=res.text
+        )
+
+    @final
+    async def _request_token_refresh(
+        self, *, refresh_token: str
+    ) -> ProviderResponseData:
+        res = await self.http.client.post(
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            url=self.tokenUrl,
+            data={
+                "grant_type": "refresh_token",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": refresh_token,
+            },
+        )
+        return ProviderResponseData(
+            status_code=res.status_code, json=res.json(), text=res.text
+        )
 
     @final
     async def _request_user_info(self, *, access_token: str) -> ProviderResponseData:
-        async with AsyncClient() as client:
-            res = await client.get(
-                url=self.userInfo,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {access_token}",
-                },
-            )
-            return ProviderResponseData(
-                status_code=res.status_code, json=res.json(), text=res.text
-            )
+        res = await self.http.client.get(
+            url=self.userInfo,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {access_token}",
+            },
+        )
+        return ProviderResponseData(
+            status_code=res.status_code, json=res.json(), text=res.text
+        )
 
     @final
     def _token_request_payload(
@@ -147,26 +209,47 @@ class Provider(ABC, FastAuthConfig):
 
     @final
     @staticmethod
-    def _create_grant_uri(
+    def _compile_grant_uri(
         *,
         response_type: str,
         authorizationUrl: str,
         client_id: str,
         redirect_uri: str,
-        state: str,
-        code_challenge: str,
-        code_challenge_method: str,
         kwargs: QueryParams,
+    ) -> "_GrantURITemplate":
+        separator = "&" if "?" in authorizationUrl else "?"
+        static_params = urlencode(
+            {
+                "response_type": response_type,
+                "client_id": client_id,
+                "redirect_uri": redirect_uri,
+            },
+            quote_via=quote,
+        )
+        extras = urlencode(sorted(kwargs.items()), quote_via=quote)
+        return _GrantURITemplate(
+            prefix=f"{authorizationUrl}{separator}{static_params}&state=",
+            suffix=f"&{extras}" if extras else "",
+        )
+
+
+class _GrantURITemplate(NamedTuple):
+    """
+    the authorization URL with its static, already percent-encoded parts,
+    only the PKCE & state parameters are spliced in per request
+    """
+
+    prefix: str
+    suffix: str
+
+    def render(
+        self, *, state: str, code_challenge: str, code_challenge_method: str
     ) -> str:
         return (
-            f"{authorizationUrl}?"
-            f"response_type={response_type}"
-            f"&client_id={client_id}"
-            f"&redirect_uri={redirect_uri}"
-            f"&state={state}"
-            f"&code_challenge={code_challenge}"
-            f"&code_challenge_method={code_challenge_method}"
-            f"{querify_kwargs(kwargs)}"
+            f"{self.prefix}{quote(state, safe='')}"
+            f"&code_challenge={quote(code_challenge, safe='')}"
+            f"&code_challenge_method={quote(code_challenge_method, safe='')}"
+            f"{self.suffix}"
         )
 
 
@@ -180,22 +263,23 @@ def log_action(f: Callable[_PSpec, _T]) -> Callable[_PSpec, _T]:  # pragma: no c
             )
         if f.__name__ == provider.authorize.__name__:
             provider.logger.debug(
-                f"Redirecting the client to the resource owner via"
-                f" {provider.provider} authorization server"
+                "Redirecting the client to the resource owner via"
+                " %s authorization server",
+                provider.provider,
             )
             return f(*args, **kwargs)
 
         if f.__name__ == provider.get_access_token.__name__:
             provider.logger.debug(
-                f"Requesting the access token from {provider.provider} "
-                f"authorization server"
+                "Requesting the access token from %s authorization server",
+                provider.provider,
             )
             return f(*args, **kwargs)
 
         if f.__name__ == provider.get_user_info.__name__:
             provider.logger.debug(
-                f"Requesting user information from {provider.provider} "
-                f"resource server"
+                "Requesting user information from %s resource server",
+                provider.provider,
             )
             return f(*args, **kwargs)
         raise RuntimeError(
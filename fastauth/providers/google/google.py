@@ -3,15 +3,17 @@ from overrides import override
 from pydantic import ValidationError
 from starlette.responses import RedirectResponse
 
-from fastauth.libtypes import AccessToken
+from fastauth.libtypes import AccessToken, TokenSet
 
 from fastauth.providers.google.schemas import (
     GoogleUserInfo,
     serialize_user_info,
-    serialize_access_token,
+    serialize_token_set,
+    serialize_refreshed_token_set,
 )
 from fastauth.exceptions import (
     InvalidTokenAcquisitionRequest,
+    InvalidTokenRefreshRequest,
     InvalidUserInfoAccessRequest,
     SchemaValidationError,
 )
@@ -36,6 +38,12 @@ class Google(Provider):
             tokenUrl=OAuthURLs.Google.tokenUrl,
             userInfo=OAuthURLs.Google.userInfo,
             provider=OAuthURLs.Google.__name__.lower(),
+            authorization_params={
+                "scope": "openid profile email",  # The basics
+                "service": "lso",
+                "access_type": "offline",
+                "flowName": "GeneralOAuthFlow",
+            },
         )
 
     @override
@@ -46,16 +54,21 @@ class Google(Provider):
             state=state,
             code_challenge=code_challenge,
             code_challenge_method=code_challenge_method,
-            scope="openid%20profile%20email",  # The basics
-            service="lso",
-            access_type="offline",
-            flowName="GeneralOAuthFlow",
         )
 
     @override
     async def get_access_token(
         self, *, code_verifier: str, code: str, state: str
     ) -> Optional[AccessToken]:
+        token_set = await self.get_token_set(
+            code_verifier=code_verifier, code=code, state=state
+        )
+        return token_set.access_token if token_set is not None else None
+
+    @override
+    async def get_token_set(
+        self, *, code_verifier: str, code: str, state: str
+    ) -> Optional[TokenSet]:
         response = await self._request_access_token(
             code_verifier=code_verifier, code=code, state=state
         )
@@ -71,9 +84,9 @@ class Google(Provider):
                 raise token_acquisition_error
             return None
         try:
-            access_token: str = serialize_access_token(response.json)
-            self.logger.info(f"Access token acquired successfully from {self.provider}")
-            return AccessToken(access_token)
+            token_set = serialize_token_set(response.json, self.schema_validation)
+            self.logger.info("Access token acquired successfully from %s", self.provider)
+            return token_set
         except ValidationError as ve:
             schema_error = SchemaValidationError(
                 provider=self.provider,
@@ -87,6 +100,40 @@ class Google(Provider):
                 raise schema_error
             return None
 
+    @override
+    async def refresh_access_token(self, refresh_token: str) -> Optional[TokenSet]:
+        response = await self._request_token_refresh(refresh_token=refresh_token)
+        if response.status_code not in SUCCESS_STATUS_CODES:
+            refresh_error = InvalidTokenRefreshRequest(
+                provider=self.provider,
+                debug=True,
+                provider_response_data=response.json,
+            )
+            self.logger.warning(refresh_error)
+            if self.debug:
+                raise refresh_error
+            return None
+        try:
+            token_set = serialize_refreshed_token_set(
+                response.json,
+                refresh_token=refresh_token,
+                validation=self.schema_validation,
+            )
+            self.logger.info("Access token refreshed successfully from %s", self.provider)
+            return token_set
+        except ValidationError as ve:
+            schema_error = SchemaValidationError(
+                provider=self.provider,
+                resource="refreshed access token",
+                validation_error=ve,
+                debug=self.debug,
+                provider_response_data=response.json,
+            )
+            self.logger.warning(schema_error)
+            if self.debug:
+                raise schema_error
+            return None
+
     @override
     async def get_user_info(self, access_token: str) -> Optional[GoogleUserInfo]:
         response = await self._request_user_info(access_token=access_token)
@@ -102,9 +149,9 @@ class Google(Provider):
             return None
 
         try:
-            user_info = serialize_user_info(response.json)
+            user_info = serialize_user_info(response.json, self.schema_validation)
             self.logger.info(
-                f"User information acquired successfully from " f"{self.provider}"
+                "User information acquired successfully from %s", self.provider
             )
             return user_info
 
@@ -1,8 +1,27 @@
 from __future__ import annotations
 
-from fastauth.libtypes import UserInfo, ProviderJSONResponse
+from time import time
+
+from fastauth.libtypes import (
+    UserInfo,
+    ProviderJSONResponse,
+    TokenSet,
+    AccessToken,
+    ValidationLevel,
+)
+from fastauth.providers.validation import (
+    boolean,
+    email,
+    http_url,
+    integer,
+    literal,
+    non_empty_string,
+    optional,
+    shape,
+    string,
+)
 from pydantic import BaseModel, EmailStr, HttpUrl, Field
-from typing import TypedDict, Literal, Annotated
+from typing import Any, Final, TypedDict, Literal, Annotated, Optional, Mapping
 
 
 class GoogleUserInfo(UserInfo, total=False):
@@ -15,6 +34,14 @@ class GoogleAccessTokenResponse(BaseModel):
     scope: str
     token_type: Literal["Bearer"]
     id_token: str
+    refresh_token: Optional[str] = None  # only with `access_type=offline`
+
+
+class GoogleRefreshTokenResponse(BaseModel):
+    access_token: str = Field(..., min_length=1)
+    expires_in: Annotated[int, "1 hour expressed in seconds"]
+    scope: str
+    token_type: Literal["Bearer"]
 
 
 class GoogleUserJSONData(BaseModel):
@@ -37,22 +64,80 @@ class _GoogleUserExtraInfo(TypedDict):
     family_name: str
 
 
-def serialize_user_info(data: ProviderJSONResponse) -> GoogleUserInfo:
-    user_data = GoogleUserJSONData.parse_obj(data)
+# the same fields as the models above, for the "fast" validation level
+_is_user_json_data: Final = shape(
+    id=non_empty_string,
+    email=email,
+    verified_email=boolean,
+    name=non_empty_string,
+    given_name=string,
+    family_name=string,
+    picture=http_url,
+    locale=string,
+)
+_is_access_token_response: Final = shape(
+    access_token=non_empty_string,
+    expires_in=integer,
+    scope=string,
+    token_type=literal("Bearer"),
+    id_token=string,
+    refresh_token=optional(string),
+)
+_is_refresh_token_response: Final = shape(
+    access_token=non_empty_string,
+    expires_in=integer,
+    scope=string,
+    token_type=literal("Bearer"),
+)
+
+
+def serialize_user_info(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> GoogleUserInfo:
+    if not (validation == "fast" and _is_user_json_data(data)):
+        data = GoogleUserJSONData.parse_obj(data).dict()
     return GoogleUserInfo(
-        user_id=user_data.id,
-        email=user_data.email,
-        name=user_data.name,
-        avatar=user_data.picture,
+        user_id=data["id"],
+        email=data["email"],
+        name=data["name"],
+        avatar=data["picture"],
         extras=_GoogleUserExtraInfo(
-            locale=user_data.locale,
-            verified_email=user_data.verified_email,
-            given_name=user_data.given_name,
-            family_name=user_data.family_name,
+            locale=data["locale"],
+            verified_email=data["verified_email"],
+            given_name=data["given_name"],
+            family_name=data["family_name"],
         ),
     )
 
 
-def serialize_access_token(data: ProviderJSONResponse) -> str:
-    token_data = GoogleAccessTokenResponse.parse_obj(data)
-    return token_data.access_token
+def serialize_access_token(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> str:
+    return serialize_token_set(data, validation).access_token
+
+
+def serialize_token_set(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> TokenSet:
+    if not (validation == "fast" and _is_access_token_response(data)):
+        data = GoogleAccessTokenResponse.parse_obj(data).dict()
+    return _token_set(data, refresh_token=data.get("refresh_token"))
+
+
+def serialize_refreshed_token_set(
+    data: ProviderJSONResponse,
+    refresh_token: str,
+    validation: ValidationLevel = "strict",
+) -> TokenSet:
+    if not (validation == "fast" and _is_refresh_token_response(data)):
+        data = GoogleRefreshTokenResponse.parse_obj(data).dict()
+    # google does not rotate them
+    return _token_set(data, refresh_token=refresh_token)
+
+
+def _token_set(data: Mapping[str, Any], refresh_token: Optional[str]) -> TokenSet:
+    return TokenSet(
+        access_token=AccessToken(data["access_token"]),
+        refresh_token=refresh_token,
+        expires_at=time() + data["expires_in"],
+    )
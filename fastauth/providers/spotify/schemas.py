@@ -1,8 +1,26 @@
 from __future__ import annotations
 
-from fastauth.libtypes import UserInfo, ProviderJSONResponse
+from time import time
+
+from fastauth.libtypes import (
+    UserInfo,
+    ProviderJSONResponse,
+    TokenSet,
+    AccessToken,
+    ValidationLevel,
+)
+from fastauth.providers.validation import (
+    email,
+    http_url,
+    integer,
+    list_of,
+    literal,
+    non_empty_string,
+    shape,
+    string,
+)
 from pydantic import BaseModel, EmailStr, HttpUrl, Field, Extra
-from typing import Literal, Annotated, List, TypedDict
+from typing import Final, Literal, Annotated, List, TypedDict
 
 
 class SpotifyUserInfo(UserInfo):
@@ -41,23 +59,57 @@ class _ExternalURLs(BaseModel, extra=Extra.ignore):
     spotify: HttpUrl
 
 
-def serialize_user_info(data: ProviderJSONResponse) -> SpotifyUserInfo:
-    user_data = SpotifyUserJSONData.parse_obj(data)
-    if user_data.images and any(user_data.images):
-        avatar_url = user_data.images.pop().url  # the second image is just bigger
-    else:
-        avatar_url = None
+SpotifyUserJSONData.update_forward_refs()  # declared before its nested models
+
+
+# the same fields as the models above, for the "fast" validation level
+_is_user_json_data: Final = shape(
+    display_name=string,
+    external_urls=shape(spotify=http_url),
+    id=string,
+    images=list_of(shape(url=http_url, height=integer, width=integer)),
+    type=string,
+    email=email,
+)
+_is_access_token_response: Final = shape(
+    access_token=non_empty_string,
+    token_type=literal("Bearer"),
+    expires_in=integer,
+    refresh_token=string,
+    scope=string,
+)
+
+
+def serialize_user_info(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> SpotifyUserInfo:
+    if not (validation == "fast" and _is_user_json_data(data)):
+        data = SpotifyUserJSONData.parse_obj(data).dict()
+    images = data["images"]
     return SpotifyUserInfo(
-        user_id=user_data.id,
-        email=user_data.email,
-        name=user_data.display_name,
-        avatar=avatar_url,
+        user_id=data["id"],
+        email=data["email"],
+        name=data["display_name"],
+        avatar=images[-1]["url"] if images else None,  # the second one is just bigger
         extras=_SpotifyUserExtraInfo(
-            spotify_url=user_data.external_urls.spotify, type=user_data.type
+            spotify_url=data["external_urls"]["spotify"], type=data["type"]
         ),
     )
 
 
-def serialize_access_token(data: ProviderJSONResponse) -> str:
-    token_data = SpotifyAccessTokenResponse.parse_obj(data)
-    return token_data.access_token
+def serialize_access_token(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> str:
+    return serialize_token_set(data, validation).access_token
+
+
+def serialize_token_set(
+    data: ProviderJSONResponse, validation: ValidationLevel = "strict"
+) -> TokenSet:
+    if not (validation == "fast" and _is_access_token_response(data)):
+        data = SpotifyAccessTokenResponse.parse_obj(data).dict()
+    return TokenSet(
+        access_token=AccessToken(data["access_token"]),
+        refresh_token=data["refresh_token"],
+        expires_at=time() + data["expires_in"],
+    )
@@ -0,0 +1,80 @@
+"""
+Hand rolled checks of the provider responses, for the "fast" validation level.
+
+A check only says whether a value has the expected shape, it never converts
+anything. Whatever fails it is handed to the pydantic model, which either
+coerces it or raises the usual `ValidationError`, so both levels accept and
+reject the same responses, give or take the email & URL checks, looser here.
+"""
+
+from __future__ import annotations
+
+import re
+
+from typing import Any, Callable, Final
+
+Check = Callable[[Any], bool]
+
+_MISSING: Final = object()
+_EMAIL: Final = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_HTTP_URL: Final = re.compile(r"https?://[^\s/?#]+\S*")
+_MAX_URL_LENGTH: Final = 2083  # pydantic's `HttpUrl.max_length`
+
+
+def shape(**checks: Check) -> Check:
+    """
+    a mapping holding (at least) the given keys, each passing its check
+    """
+    items = tuple(checks.items())
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, dict):
+            return False
+        get = value.get
+        for key, check_value in items:
+            if not check_value(get(key, _MISSING)):
+                return False
+        return True
+
+    return check
+
+
+def list_of(check: Check) -> Check:
+    return lambda value: type(value) is list and all(check(v) for v in value)
+
+
+def optional(check: Check) -> Check:
+    return lambda value: value is _MISSING or value is None or check(value)
+
+
+def literal(*values: Any) -> Check:
+    accepted = frozenset(values)
+    return lambda value: type(value) is str and value in accepted
+
+
+def string(value: Any) -> bool:
+    return type(value) is str
+
+
+def non_empty_string(value: Any) -> bool:
+    return type(value) is str and value != ""
+
+
+def integer(value: Any) -> bool:
+    return type(value) is int  # not a `bool`
+
+
+def boolean(value: Any) -> bool:
+    return type(value) is bool
+
+
+def email(value: Any) -> bool:
+    return type(value) is str and _EMAIL.fullmatch(value) is not None
+
+
+def http_url(value: Any) -> bool:
+    return (
+        type(value) is str
+        and len(value) <= _MAX_URL_LENGTH
+        and _HTTP_URL.fullmatch(value) is not None
+    )
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+
+from time import time
+from typing import Dict, Final, Optional, Protocol, final, runtime_checkable
+
+from fastauth.libtypes import AccessToken, TokenSet
+from fastauth.providers.base import Provider
+
+DEFAULT_REFRESH_LEEWAY: Final[int] = 60  # seconds
+
+
+@runtime_checkable
+class TokenStore(Protocol):
+    async def get(self, key: str) -> Optional[TokenSet]:
+        ...
+
+    async def set(self, key: str, token_set: TokenSet) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+
+@final
+class InMemoryTokenStore:
+    """
+    Per process store, fine for a single worker, use a shared one otherwise
+    """
+
+    def __init__(self) -> None:
+        self._token_sets: Dict[str, TokenSet] = {}
+
+    async def get(self, key: str) -> Optional[TokenSet]:
+        return self._token_sets.get(key)
+
+    async def set(self, key: str, token_set: TokenSet) -> None:
+        self._token_sets[key] = token_set
+
+    async def delete(self, key: str) -> None:
+        self._token_sets.pop(key, None)
+
+
+@final
+class TokenRefresher:
+    """
+    Keeps the users' token sets & hands out access tokens that are renewed
+    `leeway` seconds before they expire. Concurrent renewals of the same
+    token set share a single call to the provider.
+
+        refresher = TokenRefresher(store=InMemoryTokenStore())
+        access_token = await refresher.get_access_token(provider=google, user_id=...)
+    """
+
+    def __init__(
+        self, *, store: TokenStore, leeway: int = DEFAULT_REFRESH_LEEWAY
+    ) -> None:
+        self.store = store
+        self.leeway = leeway
+        self._in_flight: Dict[str, asyncio.Future[Optional[TokenSet]]] = {}
+
+    async def save(
+        self, *, provider: Provider, user_id: str, token_set: TokenSet
+    ) -> None:
+        await self.store.set(self._key(provider, user_id), token_set)
+
+    async def forget(self, *, provider: Provider, user_id: str) -> None:
+        await self.store.delete(self._key(provider, user_id))
+
+    async def get_access_token(
+        self, *, provider: Provider, user_id: str
+    ) -> Optional[AccessToken]:
+        key = self._key(provider, user_id)
+        token_set = await self.store.get(key)
+        if token_set is None:
+            return None
+        if not self._expires_soon(token_set):
+            return token_set.access_token
+        if token_set.refresh_token is None:
+            # can't be renewed, still usable until it actually expires
+            return None if self._expired(token_set) else token_set.access_token
+        refreshed = await self._refresh_once(
+            key=key, provider=provider, token_set=token_set
+        )
+        if refreshed is not None:
+            return refreshed.access_token
+        # not renewed this time, the current one is still good until it expires
+        return None if self._expired(token_set) else token_set.access_token
+
+    async def _refresh_once(
+        self, *, key: str, provider: Provider, token_set: TokenSet
+    ) -> Optional[TokenSet]:
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            in_flight = self._in_flight[key] = asyncio.ensure_future(
+                self._refresh(key=key, provider=provider, token_set=token_set)
+            )
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # a cancelled waiter must not cancel the refresh the others wait on
+        return await asyncio.shield(in_flight)
+
+    async def _refresh(
+        self, *, key: str, provider: Provider, token_set: TokenSet
+    ) -> Optional[TokenSet]:
+        current = await self.store.get(key)
+        if current != token_set:
+            # renewed by a previous flight since it was read, or forgotten
+            return current
+        assert token_set.refresh_token is not None
+        refreshed = await provider.refresh_access_token(token_set.refresh_token)
+        if refreshed is None:
+            return None
+        if refreshed.refresh_token is None:  # not rotated, keep the old one
+            refreshed = refreshed._replace(refresh_token=token_set.refresh_token)
+        await self.store.set(key, refreshed)
+        return refreshed
+
+    def _expires_soon(self, token_set: TokenSet) -> bool:
+        return (
+            token_set.expires_at is not None
+            and token_set.expires_at - self.leeway <= time()
+        )
+
+    @staticmethod
+    def _expired(token_set: TokenSet) -> bool:
+        return token_set.expires_at is not None and token_set.expires_at <= time()
+
+    @staticmethod
+    def _key(provider: Provider, user_id: str) -> str:
+        return f"{provider.provider}:{user_id}"
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+from collections import OrderedDict
+from secrets import token_urlsafe
+from threading import Lock
+from time import time
+from typing import Any, Final, Optional, Protocol, Tuple, final, runtime_checkable
+
+from fastauth.jwts.operations import ISSUER, SUBJECT
+from fastauth.libtypes import JWT, UserInfo
+
+DEFAULT_SESSIONS_SIZE: Final[int] = 10_000
+
+
+@runtime_checkable
+class SessionStore(Protocol):
+    """
+    Holds the claims server side, the client only keeps the session id.
+    Sync on purpose, the JWT & signout routes run in the threadpool, the
+    callback & `CurrentUser` hand their calls to it, never block the loop.
+    """
+
+    def get(self, sid: str) -> Optional[JWT]:
+        ...
+
+    def set(self, sid: str, claims: JWT, max_age: int) -> None:
+        ...
+
+    def delete(self, sid: str) -> None:
+        ...
+
+
+def new_session_id() -> str:
+    return token_urlsafe(32)
+
+
+def session_claims(*, user_info: UserInfo, max_age: int) -> JWT:
+    # NumericDates, the same claims a deciphered JWT holds
+    now = int(time())
+    return JWT(
+        iss=ISSUER,
+        sub=SUBJECT,
+        iat=now,  # type: ignore[typeddict-item]
+        exp=now + max_age,  # type: ignore[typeddict-item]
+        user_info=user_info,
+    )
+
+
+@final
+class InMemorySessionStore:
+    """
+    Per process LRU, the least recently used sessions are dropped past `max_size`
+    """
+
+    def __init__(self, *, max_size: int = DEFAULT_SESSIONS_SIZE) -> None:
+        if max_size < 1:
+            raise ValueError("The store must be able to hold at least one session")
+        self.max_size = max_size
+        self._sessions: OrderedDict[str, Tuple[float, JWT]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, sid: str) -> Optional[JWT]:
+        with self._lock:
+            session = self._sessions.get(sid)
+            if session is None:
+                return None
+            expires_at, claims = session
+            if expires_at <= time():
+                del self._sessions[sid]
+                return None
+            self._sessions.move_to_end(sid)
+            return claims
+
+    def set(self, sid: str, claims: JWT, max_age: int) -> None:
+        with self._lock:
+            self._sessions[sid] = (time() + max_age, claims)
+            self._sessions.move_to_end(sid)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+@final
+class SQLiteSessionStore:
+    """
+    Survives restarts & can be shared by the workers of a single host
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fastauth_sessions"
+                " (sid TEXT PRIMARY KEY, claims TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, sid: str) -> Optional[JWT]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT claims FROM fastauth_sessions WHERE sid = ? AND expires_at > ?",
+                (sid, time()),
+            ).fetchone()
+        if row is None:
+            return None
+        claims: JWT = json.loads(row[0])
+        return claims
+
+    def set(self, sid: str, claims: JWT, max_age: int) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO fastauth_sessions VALUES (?, ?, ?)",
+                (sid, json.dumps(claims), time() + max_age),
+            )
+
+    def delete(self, sid: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM fastauth_sessions WHERE sid = ?", (sid,)
+            )
+
+    def purge_expired(self) -> int:
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM fastauth_sessions WHERE expires_at <= ?", (time(),)
+            ).rowcount
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+@final
+class RedisSessionStore:
+    """
+    Works with any client exposing the `redis.Redis` `get`, `set(ex=)` &
+    `delete` methods, expiry is left to the server
+    """
+
+    def __init__(self, client: Any, *, prefix: str = "fastauth:session:") -> None:
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, sid: str) -> Optional[JWT]:
+        raw = self.client.get(self.prefix + sid)
+        if raw is None:
+            return None
+        claims: JWT = json.loads(raw)
+        return claims
+
+    def set(self, sid: str, claims: JWT, max_age: int) -> None:
+        self.client.set(self.prefix + sid, json.dumps(claims), ex=max_age)
+
+    def delete(self, sid: str) -> None:
+        self.client.delete(self.prefix + sid)
@@ -11,7 +11,11 @@ class SignInCallback(Protocol):
 
 
 def check_signin_signature(obj: SignInCallback) -> None:
-    sig = inspect.signature(obj)
+    try:
+        # postponed annotations (`from __future__ import annotations`) too
+        sig = inspect.signature(obj, eval_str=True)
+    except NameError:
+        sig = inspect.signature(obj)
     if not (
         "user_info" in sig.parameters
         and sig.parameters["user_info"].annotation == UserInfo
@@ -19,3 +23,15 @@ def check_signin_signature(obj: SignInCallback) -> None:
         raise TypeError(
             f"Given object does not adhere to SignInCallback protocol: {obj}"
         )
+
+
+def bind_signin_callback(obj: SignInCallback) -> SignInCallback:
+    """
+    checks the callback once, returns what gets called on every sign in,
+    the bound `__call__` of a callable object
+    """
+    check_signin_signature(obj)
+    if inspect.isfunction(obj) or inspect.ismethod(obj):
+        return obj
+    bound: SignInCallback = obj.__call__
+    return bound
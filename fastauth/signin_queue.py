@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+
+from typing import Final, List, Optional, Tuple, final
+
+from fastauth.config import FastAuthConfig
+from fastauth.libtypes import UserInfo
+from fastauth.signin import SignInCallback
+
+DEFAULT_QUEUE_SIZE: Final[int] = 1000
+DEFAULT_RETRIES: Final[int] = 3
+DEFAULT_BACKOFF: Final[float] = 0.1  # seconds, doubled after every failure
+
+_Job = Tuple[SignInCallback, UserInfo]
+
+
+@final
+class SignInQueue(FastAuthConfig):
+    """
+    Runs the sign in callbacks in the background, so the redirect is sent
+    without waiting for them. At most `max_size` callbacks wait at once, past
+    that `submit` waits for room, up to `put_timeout` seconds, then runs the
+    callback in place. A failing callback is retried `retries` times, what's
+    still queued on shutdown gets `drain_timeout` seconds to run, callbacks
+    submitted once shutdown has begun run in place.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = 1,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        put_timeout: Optional[float] = 1.0,
+        drain_timeout: Optional[float] = 10.0,
+    ) -> None:
+        if max_size < 1 or workers < 1 or retries < 0:
+            raise ValueError("Expected a positive size & workers count, retries >= 0")
+        self.max_size = max_size
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.put_timeout = put_timeout
+        self.drain_timeout = drain_timeout
+        self._queue: Optional[asyncio.Queue[_Job]] = None
+        self._tasks: List[asyncio.Task[None]] = []
+        self._closing = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._queue is not None
+
+    def __len__(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        self._closing = False
+        if self._queue is not None:
+            return
+        queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=self.max_size)
+        self._queue = queue
+        self._tasks = [
+            asyncio.create_task(self._work(queue)) for _ in range(self.workers)
+        ]
+
+    async def submit(self, callback: SignInCallback, user_info: UserInfo) -> None:
+        if self._closing:
+            # nothing would be left to close a queue started now
+            return await self._run(callback, user_info)
+        # outside of the app lifespan, the workers are started on first use
+        await self.start()
+        assert self._queue is not None
+        try:
+            await asyncio.wait_for(
+                self._queue.put((callback, user_info)), self.put_timeout
+            )
+        except asyncio.TimeoutError:
+            self.logger.warning("Sign in queue full, running the callback in place")
+            await self._run(callback, user_info)
+
+    async def aclose(self) -> None:
+        self._closing = True
+        queue, tasks = self._queue, self._tasks
+        self._queue, self._tasks = None, []
+        if queue is None:
+            return
+        try:
+            await asyncio.wait_for(queue.join(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(
+                "%d queued sign in callbacks dropped on shutdown", queue.qsize()
+            )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _work(self, queue: asyncio.Queue[_Job]) -> None:
+        while True:
+            callback, user_info = await queue.get()
+            try:
+                await self._run(callback, user_info)
+            finally:
+                queue.task_done()
+
+    async def _run(self, callback: SignInCallback, user_info: UserInfo) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                await callback(user_info=user_info)
+                return
+            except Exception:
+                if attempt == self.retries:
+                    self.logger.exception(
+                        "Sign in callback failed %d times for user %s, dropped",
+                        attempt + 1,
+                        user_info["user_id"],
+                    )
+                    return
+                await asyncio.sleep(self.backoff * 2**attempt)
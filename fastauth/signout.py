@@ -1,16 +1,21 @@
+from functools import cached_property
 from logging import Logger
-from typing import List
+from typing import List, Optional
 
 from starlette.requests import Request
 
 from fastauth.const_data import CookieData, StatusCode
-from fastauth.libtypes import FallbackSecrets
-from fastauth.cookies import Cookies
+from fastauth.jwts.keyring import Secrets
+from fastauth.cookies import Cookies, get_cookie
 from fastapi.responses import Response
 from fastauth.adapters.use_response import use_response
 from fastauth.jwts.operations import decipher_jwt
 from fastauth.exceptions import JSONWebTokenTampering
-from jose.exceptions import JWTError
+from jose.exceptions import JOSEError
+from fastauth.sessions import SessionStore
+from fastauth.jwts.revocation import RevocationList
+
+_redirect = use_response(response_type="redirect")
 
 
 class Signout:
@@ -19,37 +24,51 @@ class Signout:
         *,
         post_signout_uri: str,
         request: Request,
-        fallback_secrets: FallbackSecrets,
+        fallback_secrets: Secrets,
         error_uri: str,
         logger: Logger,
         debug: bool,
+        session_store: Optional[SessionStore] = None,
+        revocation_list: Optional[RevocationList] = None,
     ) -> None:
+        self.session_store = session_store
+        self.revocation_list = revocation_list
         self.post_signout_uri = post_signout_uri
         self.error_uri = error_uri
         self.request = request
         self.fallback_secrets = fallback_secrets
         self.logger = logger
         self.debug = debug
-        self.__base_url = request.base_url
-        self.redirect_response = use_response(response_type="redirect")
-        self.success_response = self.redirect_response(
-            url=str(self.__base_url) + self.post_signout_uri
-        )  # type: ignore
-        self.failure_response = self.redirect_response(
-            url=str(self.__base_url) + self.error_uri,
+
+    # only the response that ends up returned gets built
+
+    @cached_property
+    def success_response(self) -> Response:
+        return _redirect(url=str(self.request.base_url) + self.post_signout_uri)  # type: ignore
+
+    @cached_property
+    def failure_response(self) -> Response:
+        return _redirect(  # type: ignore
+            url=str(self.request.base_url) + self.error_uri,
             status_code=StatusCode.BAD_REQUEST,
-        )  # type: ignore
+        )
 
-        self.cookie = Cookies(request=request, response=self.success_response)
+    @cached_property
+    def cookie(self) -> Cookies:
+        # only to delete cookies, on success, reads go through `get_cookie`
+        return Cookies(request=self.request, response=self.success_response)
 
     def __call__(self) -> Response:
-        encrypted_jwt = self.cookie.get(CookieData.JWT.name)
+        encrypted_jwt = get_cookie(self.request, CookieData.JWT.name)
         if encrypted_jwt:
             try:
-                decipher_jwt(
+                jwt = decipher_jwt(
                     encrypted_jwt=encrypted_jwt, fallback_secrets=self.fallback_secrets
                 )
-            except JWTError as e:
+                jti = jwt.get("jti")
+                if self.revocation_list is not None and jti is not None:
+                    self.revocation_list.revoke(jti, jwt["exp"])
+            except JOSEError as e:
                 error = JSONWebTokenTampering(error=e)
                 self.logger.warning(error)
                 if self.debug:
@@ -62,6 +81,11 @@ class Signout:
             CookieData.JWT.name,
             CookieData.CSRFToken.name,
         ]
+        if self.session_store is not None:
+            sid = get_cookie(self.request, CookieData.Session.name)
+            if sid:
+                self.session_store.delete(sid)  # revoked right away
+            cookies.append(CookieData.Session.name)
         for cookie in cookies:
             self.cookie.delete(
                 key=cookie,
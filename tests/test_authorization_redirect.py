@@ -1,3 +1,5 @@
+from fastauth.providers.google.google import Google
+
 from .utils import MockProvider
 
 
@@ -8,12 +10,60 @@ def test_oauth_redirect_url() -> None:
         redirect_uri="https://mysite.com/auth/callback/mock",
     )
 
-    pv._grant_redirect(
+    response = pv._grant_redirect(
         state="state",
         code_challenge="code_challenge",
         code_challenge_method="s256",
     )
     assert (
-        pv._grant_redirect_url
-        == "https://accounts.exmaple.com/authorize?response_type=code&client_id=client_id&redirect_uri=https://mysite.com/auth/callback/mock&state=state&code_challenge=code_challenge&code_challenge_method=s256&"
+        response.headers["location"]
+        == "https://accounts.exmaple.com/authorize?response_type=code&client_id=client_id&redirect_uri=https%3A%2F%2Fmysite.com%2Fauth%2Fcallback%2Fmock&state=state&code_challenge=code_challenge&code_challenge_method=s256"
+    )
+    assert not hasattr(pv, "_grant_redirect_url")  # nothing per request is kept
+
+
+def test_oauth_redirect_url_static_params() -> None:
+    pv = MockProvider(
+        client_id="client_id",
+        client_secret="client_secret",
+        redirect_uri="https://mysite.com/auth/callback/mock",
+    )
+    template = pv._compile_grant_uri(
+        response_type=pv.response_type,
+        authorizationUrl="https://accounts.exmaple.com/authorize?prompt=none",
+        client_id=pv.client_id,
+        redirect_uri=pv.redirect_uri,
+        kwargs={"scope": "openid profile email", "access_type": "offline"},
+    )
+    assert template.render(
+        state="st", code_challenge="cc", code_challenge_method="S256"
+    ) == (
+        "https://accounts.exmaple.com/authorize?prompt=none&response_type=code"
+        "&client_id=client_id"
+        "&redirect_uri=https%3A%2F%2Fmysite.com%2Fauth%2Fcallback%2Fmock"
+        "&state=st&code_challenge=cc&code_challenge_method=S256"
+        "&access_type=offline&scope=openid%20profile%20email"
+    )
+
+    response = pv._grant_redirect(
+        state="st", code_challenge="cc", code_challenge_method="S256", scope="a b"
+    )
+    assert response.headers["location"].endswith("&scope=a%20b")
+
+
+def test_call_time_params_extend_the_static_ones() -> None:
+    pv = Google(
+        client_id="client_id",
+        client_secret="client_secret",
+        redirect_uri="https://mysite.com/auth/callback/google",
     )
+    location = pv._grant_redirect(
+        state="st", code_challenge="cc", code_challenge_method="S256", prompt="consent"
+    ).headers["location"]
+    assert "&prompt=consent" in location
+    assert "&scope=openid%20profile%20email" in location
+    assert "&access_type=offline" in location
+    # the precompiled template is left as is
+    assert "prompt" not in pv._grant_redirect(
+        state="st", code_challenge="cc", code_challenge_method="S256"
+    ).headers["location"]
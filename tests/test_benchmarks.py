@@ -0,0 +1,39 @@
+import logging
+
+import pytest
+
+from benchmarks import crypto, schemas
+from benchmarks.oauth_flow import STAGES, StageStats, compare, run
+
+
+@pytest.mark.asyncio
+async def test_full_cycle_runs() -> None:
+    logger = logging.getLogger("fastauth")
+    level = logger.level
+    stats = await run(iterations=3, warmup=1)
+    assert [s.stage for s in stats] == list(STAGES)
+    assert all(s.p50_ms > 0 and s.throughput > 0 for s in stats)
+    assert logger.level == level
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = {"stages": {"jwt": {"p50_ms": 1.0, "alloc_kib": 10.0}}}
+    faster = StageStats("jwt", 1, 1000.0, p50_ms=0.9, p99_ms=2.0, alloc_kib=10.0)
+    slower = StageStats("jwt", 1, 500.0, p50_ms=1.5, p99_ms=2.0, alloc_kib=10.0)
+    unknown = StageStats("new", 1, 500.0, p50_ms=9.0, p99_ms=9.0, alloc_kib=9.0)
+    assert compare([faster, unknown], baseline, tolerance=0.25) == []
+    assert compare([slower], baseline, tolerance=0.25) == [
+        "jwt.p50_ms: 1.5 > 1.0 (+25%)"
+    ]
+
+
+def test_crypto_backends_run() -> None:
+    stats = crypto.run(iterations=3)
+    assert [s.backend for s in stats] == list(crypto.BACKENDS)
+    assert all(s.seal_ops > 0 and s.open_ops > 0 for s in stats)
+
+
+def test_schema_levels_run() -> None:
+    stats = schemas.run(iterations=3)
+    assert [s.level for s in stats] == list(schemas.LEVELS)
+    assert all(s.user_info_ops > 0 and s.token_set_ops > 0 for s in stats)
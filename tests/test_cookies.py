@@ -0,0 +1,129 @@
+import logging
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import Response
+
+from fastauth.callback import Callback
+from fastauth.const_data import CookieData
+from fastauth.cookies import Cookies
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import encipher_user_info
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.signout import Signout
+from fastauth.utils import name_cookie
+from tests.utils import MockProvider
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+
+
+def _request(scheme: str = "https", **cookies: str) -> Request:
+    cookie = "; ".join(
+        f"{name_cookie(name=key)}={value}" for key, value in cookies.items()
+    )
+    return Request(
+        {
+            "type": "http",
+            "scheme": scheme,
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+            "server": ("testserver", 443 if scheme == "https" else 80),
+        }
+    )
+
+
+def _starlette_headers(scheme: str, value: str, max_age: int) -> bytes:
+    response = Response()
+    response.set_cookie(
+        key=name_cookie(name=CookieData.JWT.name),
+        value=value,
+        max_age=max_age,
+        secure=scheme == "https",
+        httponly=True,
+        samesite="lax",
+    )
+    return response.raw_headers[-1][1]
+
+
+@pytest.mark.parametrize("scheme", ["http", "https"])
+@pytest.mark.parametrize("value", ["eyJhbGciOi.J9-_x", "needs quoting;", ""])
+def test_headers_match_starlette(scheme: str, value: str) -> None:
+    response = Response()
+    cookies = Cookies(request=_request(scheme), response=response)
+    for max_age in (CookieData.JWT.max_age, 60):
+        cookies.set(key=CookieData.JWT.name, value=value, max_age=max_age)
+        assert response.raw_headers[-1] == (
+            b"set-cookie",
+            _starlette_headers(scheme, value, max_age),
+        )
+
+
+@pytest.mark.parametrize("scheme", ["http", "https"])
+def test_deleted_cookies_expire_right_away(scheme: str) -> None:
+    response = Response()
+    Cookies(request=_request(scheme), response=response).delete(CookieData.JWT.name)
+    header = response.raw_headers[-1][1].decode()
+    assert header.startswith(name_cookie(name=CookieData.JWT.name) + '=""; ')
+    assert "expires=Thu, 01 Jan 1970 00:00:00 GMT" in header
+    assert "Max-Age=0" in header
+    assert ("Secure" in header) is (scheme == "https")
+
+
+def test_responses_are_built_on_demand() -> None:
+    signout = Signout(
+        post_signout_uri="/auth/out",
+        request=_request(),
+        fallback_secrets=FallbackSecrets(
+            *(generate_secret() for _ in FallbackSecrets._fields)
+        ),
+        error_uri="/auth/error",
+        logger=logging.getLogger("fastauth"),
+        debug=False,
+    )
+    response = signout()
+    assert response is signout.success_response
+    assert "failure_response" not in vars(signout)
+    assert len(response.headers.getlist("set-cookie")) == 4
+
+
+def test_signout_failure_builds_no_success_response() -> None:
+    expired = encipher_user_info(
+        UserInfo(user_id="1", email="a@b.c", name="John", avatar=None),
+        _secrets,
+        max_age=-10,
+    )
+    signout = Signout(
+        post_signout_uri="/auth/out",
+        request=_request(**{CookieData.JWT.name: expired}),
+        fallback_secrets=_secrets,
+        error_uri="/auth/error",
+        logger=logging.getLogger("fastauth"),
+        debug=False,
+    )
+    response = signout()
+    assert response is signout.failure_response
+    assert "success_response" not in vars(signout)
+    assert "cookie" not in vars(signout)
+
+
+@pytest.mark.asyncio
+async def test_callback_failure_builds_no_success_response() -> None:
+    callback = Callback(
+        provider=MockProvider(client_id="id", client_secret="secret", redirect_uri="/"),
+        post_signin_uri="/auth/in",
+        error_uri="/auth/error",
+        code="code",
+        state="state",
+        fallback_secrets=_secrets,
+        logger=logging.getLogger("fastauth"),
+        jwt_max_age=60,
+        signin_callback=None,
+        request=_request(**{CookieData.State.name: "another state"}),
+        debug=False,
+    )
+    response = await callback()
+    assert response is callback.error_response
+    assert "success_response" not in vars(callback)
+    assert "cookie" not in vars(callback)
@@ -0,0 +1,97 @@
+from itertools import product
+from time import time
+
+import pytest
+from jose.exceptions import ExpiredSignatureError, JOSEError, JWEError
+
+from fastauth.jwts.backends import AESGCMBackend, CryptoBackend, JOSEBackend
+from fastauth.jwts.claims import (
+    COMPACT_TOKEN_FORMAT,
+    DEFAULT_TOKEN_FORMAT,
+    TokenFormat,
+)
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import (
+    ISSUER,
+    SUBJECT,
+    JWTCrypto,
+    decipher_jwt,
+    encipher_user_info,
+)
+from fastauth.libtypes import FallbackSecrets, UserInfo
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+_backends = [JOSEBackend(), AESGCMBackend()]
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    backend = JWTCrypto.backend
+    yield
+    JWTCrypto.use(backend)
+
+
+@pytest.mark.parametrize(
+    "sealer, opener, token_format",
+    [
+        (sealer, opener, token_format)
+        for (sealer, opener), token_format in product(
+            product(_backends, repeat=2),
+            (
+                DEFAULT_TOKEN_FORMAT,
+                COMPACT_TOKEN_FORMAT,
+                TokenFormat(aead_only=True),
+            ),
+        )
+    ],
+)
+def test_tokens_are_interchangeable(
+    sealer: CryptoBackend, opener: CryptoBackend, token_format
+) -> None:
+    JWTCrypto.use(sealer)
+    token = encipher_user_info(_user_info, _secrets, token_format=token_format)
+    JWTCrypto.use(opener)
+    assert decipher_jwt(token, _secrets)["user_info"] == _user_info
+
+
+@pytest.mark.parametrize("backend", _backends)
+def test_tampering_is_detected(backend: CryptoBackend) -> None:
+    JWTCrypto.use(backend)
+    token = encipher_user_info(_user_info, _secrets)
+    header, key, iv, ciphertext, tag = token.split(".")
+    flipped = ciphertext[:-2] + ("A" if ciphertext[-2] != "A" else "B") + ciphertext[-1]
+    with pytest.raises(JOSEError):
+        decipher_jwt(".".join((header, key, iv, flipped, tag)), _secrets)
+    with pytest.raises(JOSEError):
+        decipher_jwt("not.a.jwe", _secrets)
+
+
+@pytest.mark.parametrize("backend", _backends)
+def test_claims_are_validated(backend: CryptoBackend) -> None:
+    key = _secrets.secret_1
+    expired = backend.sign(
+        claims={"iss": ISSUER, "sub": SUBJECT, "exp": int(time()) - 10}, key=key
+    )
+    with pytest.raises(ExpiredSignatureError):
+        backend.verify(token=expired, key=key, issuer=ISSUER, subject=SUBJECT)
+    foreign = backend.sign(claims={"iss": "someone", "sub": SUBJECT}, key=key)
+    with pytest.raises(JOSEError):
+        backend.verify(token=foreign, key=key, issuer=ISSUER, subject=SUBJECT)
+    signed = backend.sign(claims={"iss": ISSUER, "sub": SUBJECT}, key=key)
+    with pytest.raises(JOSEError):
+        backend.verify(
+            token=signed, key=_secrets.secret_2, issuer=ISSUER, subject=SUBJECT
+        )
+
+
+def test_aesgcm_backend_rejects_other_algorithms() -> None:
+    jose, aesgcm = JOSEBackend(), AESGCMBackend()
+    token = jose.encrypt(
+        plaintext=b"{}", key=_secrets.secret_1, kid="k", compress=False
+    )
+    header = aesgcm.header(token)
+    assert header == {"alg": "dir", "enc": "A256GCM", "kid": "k"}
+    assert aesgcm.decrypt(token=token, key=_secrets.secret_1) == b"{}"
+    with pytest.raises(JWEError):
+        aesgcm.decrypt(token=token, key=_secrets.secret_2)
@@ -0,0 +1,102 @@
+import hmac
+import hashlib
+
+from unittest.mock import patch
+
+from fastauth.csrf import CSRF, CSRFToken
+from fastauth.jwts.helpers import derive_key, generate_secret, key_id
+from fastauth.jwts.keyring import CSRF_KEY_PURPOSE, KeyRing
+from fastauth.libtypes import FallbackSecrets
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in range(5)))
+_csrf_kids = [key.csrf_kid for key in KeyRing(_secrets).keys]
+
+
+def test_token_is_tagged_with_the_signing_key() -> None:
+    CSRF.init_once(fallback_secrets=_secrets)
+    kid, hmac_hash, payload = CSRF.gen_csrf_token().split(".")
+    assert kid in _csrf_kids
+    assert CSRF.is_token_valid(token=CSRFToken(f"{kid}.{hmac_hash}.{payload}"))
+    assert not CSRF.is_token_valid(token=CSRFToken(f"{kid}.{hmac_hash}.tampered"))
+
+
+def test_secret_selection_is_time_bucketed() -> None:
+    CSRF.init_once(fallback_secrets=_secrets)
+    bucket = CSRF.rotation_interval
+    kids = []
+    for i in range(len(_secrets)):
+        with patch("fastauth.csrf.time", return_value=i * bucket + 1):
+            first = CSRF.gen_csrf_token().split(".")[0]
+            # same bucket, same secret, however many tokens are issued
+            assert CSRF.gen_csrf_token().split(".")[0] == first
+            kids.append(first)
+    assert kids == _csrf_kids
+
+
+def test_untagged_legacy_token() -> None:
+    CSRF.init_once(fallback_secrets=_secrets)
+    payload = generate_secret()
+    legacy_hmac = hmac.new(
+        _secrets.secret_3.encode(), payload.encode(), hashlib.sha256
+    ).hexdigest()
+    assert CSRF.is_token_valid(token=CSRFToken(f"{legacy_hmac}.{payload}"))
+    assert not CSRF.is_token_valid(token=CSRFToken(f"{legacy_hmac}.tampered"))
+
+
+def test_tagged_legacy_token() -> None:
+    # signed with the secret itself, before the CSRF subkey
+    CSRF.init_once(fallback_secrets=_secrets)
+    payload = generate_secret()
+    legacy_hmac = hmac.new(
+        _secrets.secret_2.encode(), payload.encode(), hashlib.sha256
+    ).hexdigest()
+    kid = key_id(_secrets.secret_2)
+    assert CSRF.is_token_valid(token=CSRFToken(f"{kid}.{legacy_hmac}.{payload}"))
+    # the legacy key id never vouches for a subkey HMAC & vice versa
+    subkey_hmac = hmac.new(
+        derive_key(_secrets.secret_2, CSRF_KEY_PURPOSE), payload.encode(), "sha256"
+    ).hexdigest()
+    assert not CSRF.is_token_valid(token=CSRFToken(f"{kid}.{subkey_hmac}.{payload}"))
+    csrf_kid = _csrf_kids[1]
+    assert CSRF.is_token_valid(token=CSRFToken(f"{csrf_kid}.{subkey_hmac}.{payload}"))
+    assert not CSRF.is_token_valid(
+        token=CSRFToken(f"{csrf_kid}.{legacy_hmac}.{payload}")
+    )
+
+
+def test_keyed_hmacs_are_built_once() -> None:
+    CSRF.init_once(fallback_secrets=_secrets)
+    keyring = CSRF.keyring
+    assert keyring is not None
+    keyed_hmacs = [key.csrf for key in keyring.keys]
+    tokens = [CSRF.gen_csrf_token() for _ in range(3)]
+    assert all(CSRF.is_token_valid(token=token) for token in tokens)
+    # the pre-keyed states are shared with every ring of the same secrets
+    CSRF.init_once(fallback_secrets=_secrets)
+    assert [key.csrf for key in CSRF.keyring.keys] == keyed_hmacs
+    # copied, never fed a message themselves
+    assert all(
+        state.copy().digest()
+        == hmac.new(derive_key(secret, CSRF_KEY_PURPOSE), digestmod="sha256").digest()
+        for state, secret in zip(keyed_hmacs, _secrets)
+    )
+
+
+def test_rotated_secret_signs_without_reinit() -> None:
+    keyring = KeyRing([generate_secret()])
+    CSRF.init_once(fallback_secrets=keyring)
+    before = CSRF.gen_csrf_token()
+    keyring.rotate(generate_secret())
+    assert len(keyring) == 2
+    with patch("fastauth.csrf.time", return_value=0):
+        after = CSRF.gen_csrf_token()
+    assert after.split(".")[0] == keyring.current.csrf_kid
+    assert CSRF.is_token_valid(token=before) and CSRF.is_token_valid(token=after)
+    keyring.retire(keyring.keys[-1].kid)
+    assert not CSRF.is_token_valid(token=before)
+
+
+def test_non_hex_hmac_is_rejected() -> None:
+    CSRF.init_once(fallback_secrets=_secrets)
+    kid, _, payload = CSRF.gen_csrf_token().split(".")
+    assert not CSRF.is_token_valid(token=CSRFToken(f"{kid}.not-hex.{payload}"))
@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI
+from starlette.responses import StreamingResponse, PlainTextResponse
+from starlette.testclient import TestClient
+
+from fastauth.adapters.fastapi.csrf_middleware import CSRFMitigationMiddleware
+from fastauth.const_data import CookieData
+from fastauth.csrf import CSRF
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import FallbackSecrets
+from fastauth.utils import name_cookie
+
+CSRF_COOKIE = name_cookie(name=CookieData.CSRFToken.name)
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    CSRF.init_once(
+        fallback_secrets=FallbackSecrets(*(generate_secret() for _ in range(5)))
+    )
+    app = FastAPI()
+    app.add_middleware(CSRFMitigationMiddleware)
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"a", b"b", b"c"]))
+
+    @app.get("/plain")
+    def plain() -> PlainTextResponse:
+        return PlainTextResponse("plain", headers={"x-custom": "kept"})
+
+    return app
+
+
+async def _call(
+    app: FastAPI, path: str, csrf_token: Optional[str] = None
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    headers = []
+    if csrf_token is not None:
+        headers.append((b"cookie", f"{CSRF_COOKIE}={csrf_token}".encode()))
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": headers,
+    }
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return scope, messages
+
+
+def _sets_csrf_cookie(start_message: Dict[str, Any]) -> bool:
+    return any(
+        name == b"set-cookie" and value.startswith(CSRF_COOKIE.encode())
+        for name, value in start_message["headers"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_absent_cookie_is_set_and_rejected(app) -> None:
+    response = TestClient(app).get("/plain")
+    assert response.text == "plain"
+    assert response.headers["x-custom"] == "kept"
+    assert CSRF_COOKIE in response.cookies
+    scope, _ = await _call(app, "/plain")
+    assert scope["state"]["passed_csrf_validation"] is False
+
+
+@pytest.mark.asyncio
+async def test_valid_cookie_is_accepted(app) -> None:
+    scope, (start, *_) = await _call(app, "/plain", CSRF.gen_csrf_token())
+    assert not _sets_csrf_cookie(start)
+    assert scope["state"]["passed_csrf_validation"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "token",
+    [
+        "bad." + generate_secret(),
+        "unknown." + generate_secret() + "." + generate_secret(),
+        "not-even-a-token",
+    ],
+)
+async def test_invalid_cookie_is_rejected(app, token) -> None:
+    scope, (start, *_) = await _call(app, "/plain", token)
+    assert not _sets_csrf_cookie(start)
+    assert scope["state"]["passed_csrf_validation"] is False
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_not_buffered(app) -> None:
+    _, (start, *bodies) = await _call(app, "/stream")
+    assert _sets_csrf_cookie(start)
+    assert [body["body"] for body in bodies if body["body"]] == [b"a", b"b", b"c"]
+
+
+def test_lifespan_scope_passes_through(app) -> None:
+    with TestClient(app) as client:
+        assert client.get("/plain").text == "plain"
@@ -0,0 +1,112 @@
+import logging
+from typing import Optional
+from unittest.mock import patch
+
+from fastapi import Depends, FastAPI
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from fastauth.adapters.fastapi.auth_middleware import AuthenticationMiddleware
+from fastauth.adapters.fastapi.dependencies import (
+    CLAIMS_STATE_KEY,
+    ClaimsReader,
+    CurrentUser,
+)
+from fastauth.const_data import CookieData
+from fastauth.jwts import handler
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import encipher_user_info
+from fastauth.libtypes import JWT, FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.providers.google.google import Google
+from fastauth.utils import name_cookie
+from jose.jwe import get_unverified_header
+from tests.utils import with_header
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+_jwt_cookie = name_cookie(name=CookieData.JWT.name)
+
+
+def _app(reader: ClaimsReader, *, middleware: bool = False) -> FastAPI:
+    current_user = CurrentUser(reader)
+    maybe_user = CurrentUser(reader, required=False)
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(
+        request: Request,
+        jwt: JWT = Depends(current_user),
+        again: Optional[JWT] = Depends(maybe_user),
+    ):
+        assert again is jwt
+        return {
+            "user_id": jwt["user_info"]["user_id"],
+            "state": getattr(request.state, CLAIMS_STATE_KEY) is jwt,
+        }
+
+    @app.get("/maybe")
+    def maybe(jwt: Optional[JWT] = Depends(maybe_user)):
+        return {"signed_in": jwt is not None}
+
+    if middleware:
+        app.add_middleware(AuthenticationMiddleware, reader=reader)
+    return app
+
+
+def test_claims_are_read_once_per_request() -> None:
+    client = TestClient(_app(ClaimsReader(fallback_secrets=_secrets)))
+    client.cookies.set(_jwt_cookie, encipher_user_info(_user_info, _secrets))
+    with patch.object(handler, "decipher_jwt", wraps=handler.decipher_jwt) as spy:
+        assert client.get("/me").json() == {"user_id": "1", "state": True}
+    assert spy.call_count == 1
+
+
+def test_middleware_reads_before_the_app() -> None:
+    client = TestClient(_app(ClaimsReader(fallback_secrets=_secrets), middleware=True))
+    client.cookies.set(_jwt_cookie, encipher_user_info(_user_info, _secrets))
+    with patch.object(handler, "decipher_jwt", wraps=handler.decipher_jwt) as spy:
+        assert client.get("/me").json() == {"user_id": "1", "state": True}
+        assert client.get("/maybe").json() == {"signed_in": True}
+    assert spy.call_count == 2  # once per request
+
+
+def test_signed_out_or_tampered(caplog) -> None:
+    client = TestClient(_app(ClaimsReader(fallback_secrets=_secrets)))
+    assert client.get("/me").status_code == 401
+    assert client.get("/maybe").json() == {"signed_in": False}
+    other_secrets = FallbackSecrets(
+        *(generate_secret() for _ in FallbackSecrets._fields)
+    )
+    client.cookies.set(_jwt_cookie, encipher_user_info(_user_info, other_secrets))
+    with caplog.at_level(logging.WARNING):
+        assert client.get("/me").status_code == 401
+    assert "tampering" in caplog.text
+
+
+def test_non_string_key_id() -> None:
+    async def signin_callback(user_info: UserInfo) -> None:
+        pass
+
+    app = _app(ClaimsReader(fallback_secrets=_secrets), middleware=True)
+    app.include_router(
+        OAuthOptions(
+            provider=Google(
+                client_id="id",
+                client_secret="secret",
+                redirect_uri="http://testserver/cb",
+            ),
+            signin_callback=signin_callback,
+            fallback_secrets=_secrets,
+            debug=False,
+        )
+    )
+    token = encipher_user_info(_user_info, _secrets)
+    client = TestClient(app)
+    client.cookies.set(
+        _jwt_cookie, with_header(token, {**get_unverified_header(token), "kid": []})
+    )
+    assert client.get("/me").status_code == 401
+    assert client.get("/auth/jwt").status_code == 401
+    response = client.get("/auth/signout", follow_redirects=False)
+    assert response.status_code == 400
@@ -5,6 +5,7 @@ from unittest.mock import AsyncMock
 from unittest.mock import patch
 
 
+from time import time
 from typing import cast, Dict, Any
 
 from dotenv import load_dotenv
@@ -25,7 +26,7 @@ from fastauth.exceptions import (
 )
 from fastauth.const_data import StatusCode
 from fastauth.utils import gen_oauth_params
-from fastauth.libtypes import GrantSecurityParams
+from fastauth.libtypes import GrantSecurityParams, ProviderResponseData
 from fastauth.config import FastAuthConfig
 from .utils import get_method_to_patch
 
@@ -215,6 +216,36 @@ def test_serialize_user_info(valid_user_data) -> None:
         )
 
 
+@pytest.mark.asyncio
+async def test_google_keeps_the_refresh_token(valid_token_response, google) -> None:
+    token_response = {**valid_token_response, "refresh_token": "1//refresh"}
+    with patch.object(
+        Google,
+        "_request_access_token",
+        AsyncMock(return_value=ProviderResponseData(200, token_response, "")),
+    ):
+        token_set = await google.get_token_set(code_verifier="v", code="c", state="s")
+    assert token_set is not None
+    assert token_set.refresh_token == "1//refresh"
+    assert token_set.expires_at is not None and token_set.expires_at > time()
+
+    refresh_response = {
+        "access_token": "ya29.renewed",
+        "expires_in": 3599,
+        "scope": "openid",
+        "token_type": "Bearer",
+    }
+    with patch.object(
+        Google,
+        "_request_token_refresh",
+        AsyncMock(return_value=ProviderResponseData(200, refresh_response, "")),
+    ):
+        renewed = await google.refresh_access_token("1//refresh")
+    assert renewed is not None
+    assert renewed.access_token == "ya29.renewed"
+    assert renewed.refresh_token == "1//refresh"
+
+
 @pytest.fixture
 def google() -> Google:
     return Google(
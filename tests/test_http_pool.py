@@ -0,0 +1,75 @@
+import pytest
+
+from fastapi import FastAPI
+from httpx import MockTransport, Request, Response, Limits
+from starlette.testclient import TestClient
+
+from fastauth.http_client import HTTPClientPool
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.jwts.helpers import generate_secret
+from fastauth.const_data import StatusCode
+from .utils import MockProvider
+
+
+def _handler(request: Request) -> Response:
+    if request.method == "POST":
+        return Response(StatusCode.OK, json={"access_token": "..."})
+    return Response(StatusCode.OK, json={"id": "123"})
+
+
+@pytest.fixture
+def provider() -> MockProvider:
+    return MockProvider(
+        client_id="client_id",
+        client_secret="client_secret",
+        redirect_uri="https://example.com/auth/callback/mock",
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused(provider) -> None:
+    pool = HTTPClientPool(transport=MockTransport(_handler))
+    provider.use_http_pool(pool)
+    await pool.open()
+    client = pool.client
+    token_res = await provider._request_access_token(
+        code_verifier="code_verifier", code="code", state="state"
+    )
+    info_res = await provider._request_user_info(access_token="...")
+    assert token_res.json == {"access_token": "..."}
+    assert info_res.json == {"id": "123"}
+    assert pool.client is client
+    await pool.aclose()
+    assert not pool.is_open
+
+
+@pytest.mark.asyncio
+async def test_client_is_created_on_first_use() -> None:
+    pool = HTTPClientPool(limits=Limits(max_connections=1))
+    assert not pool.is_open
+    _ = pool.client
+    assert pool.is_open
+    await pool.aclose()
+    await pool.aclose()  # closing twice is a no-op
+    assert not pool.is_open
+
+
+def test_pool_follows_app_lifespan(provider) -> None:
+    async def signin_callback(user_info: UserInfo) -> None:  # pragma: no cover
+        pass
+
+    app = FastAPI()
+    app.include_router(
+        OAuthOptions(
+            provider=provider,
+            signin_callback=signin_callback,
+            fallback_secrets=FallbackSecrets(
+                *(generate_secret() for _ in range(len(FallbackSecrets._fields)))
+            ),
+        )
+    )
+    assert not provider.http.is_open
+    with TestClient(app):
+        assert provider.http.is_open
+    assert not provider.http.is_open
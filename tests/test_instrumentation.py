@@ -0,0 +1,118 @@
+from typing import List, Tuple
+
+import pytest
+
+from fastauth.instrumentation import (
+    Instrumentation,
+    InMemoryMetrics,
+    OpenTelemetryMetrics,
+    Stage,
+)
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import decipher_jwt, encipher_user_info
+from fastauth.libtypes import FallbackSecrets, UserInfo
+
+
+class _RecordingSink:
+    def __init__(self) -> None:
+        self.observed: List[Tuple[str, float, bool]] = []
+
+    def observe(self, stage: str, duration: float, ok: bool) -> None:
+        self.observed.append((stage, duration, ok))
+
+
+@pytest.fixture
+def sink():
+    sink = _RecordingSink()
+    Instrumentation.attach(sink)
+    yield sink
+    Instrumentation.detach(sink)
+
+
+def test_timer_is_a_shared_noop_without_sinks() -> None:
+    assert Instrumentation.sinks == ()
+    assert Instrumentation.timer(Stage.JWE_SEAL) is Instrumentation.timer(
+        Stage.JWE_OPEN
+    )
+
+
+def test_outcomes_are_observed(sink: _RecordingSink) -> None:
+    with Instrumentation.timer(Stage.STATE_CHECK):
+        pass
+    with Instrumentation.timer(Stage.STATE_CHECK) as timer:
+        timer.fail()
+    with pytest.raises(RuntimeError):
+        with Instrumentation.timer(Stage.CSRF_CHECK):
+            raise RuntimeError
+    assert [(stage, ok) for stage, _, ok in sink.observed] == [
+        (Stage.STATE_CHECK, True),
+        (Stage.STATE_CHECK, False),
+        (Stage.CSRF_CHECK, False),
+    ]
+    assert all(duration >= 0 for _, duration, _ in sink.observed)
+
+
+def test_jwe_stages_are_timed(sink: _RecordingSink) -> None:
+    secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+    token = encipher_user_info(UserInfo(name="John Doe"), secrets)  # type: ignore
+    decipher_jwt(token, secrets)
+    assert [stage for stage, _, _ in sink.observed] == [
+        Stage.JWE_SEAL,
+        Stage.JWE_OPEN,
+    ]
+
+
+def test_detach() -> None:
+    sink = _RecordingSink()
+    Instrumentation.attach(sink)
+    Instrumentation.detach(sink)
+    with Instrumentation.timer(Stage.JWE_SEAL):
+        pass
+    assert sink.observed == []
+    assert Instrumentation.sinks == ()
+
+
+def test_prometheus_export() -> None:
+    metrics = InMemoryMetrics(buckets=(0.01, 0.1))
+    metrics.observe(Stage.TOKEN_EXCHANGE, 0.005, True)
+    metrics.observe(Stage.TOKEN_EXCHANGE, 0.05, True)
+    metrics.observe(Stage.TOKEN_EXCHANGE, 0.5, False)
+    exported = metrics.export_prometheus()
+    for line in (
+        "# TYPE fastauth_stage_total counter",
+        'fastauth_stage_total{stage="token_exchange",outcome="ok"} 2',
+        'fastauth_stage_total{stage="token_exchange",outcome="failed"} 1',
+        "# TYPE fastauth_stage_duration_seconds histogram",
+        'fastauth_stage_duration_seconds_bucket{stage="token_exchange",le="0.01"} 1',
+        'fastauth_stage_duration_seconds_bucket{stage="token_exchange",le="0.1"} 2',
+        'fastauth_stage_duration_seconds_bucket{stage="token_exchange",le="+Inf"} 3',
+        'fastauth_stage_duration_seconds_count{stage="token_exchange"} 3',
+    ):
+        assert line in exported.splitlines()
+
+
+def test_opentelemetry_adapter() -> None:
+    class _Instrument:
+        def __init__(self) -> None:
+            self.calls: List[Tuple[float, dict]] = []
+
+        def record(self, value: float, attributes: dict) -> None:
+            self.calls.append((value, attributes))
+
+        add = record
+
+    class _Meter:
+        def __init__(self) -> None:
+            self.histogram, self.counter = _Instrument(), _Instrument()
+
+        def create_histogram(self, name: str, **_: str) -> _Instrument:
+            return self.histogram
+
+        def create_counter(self, name: str, **_: str) -> _Instrument:
+            return self.counter
+
+    meter = _Meter()
+    OpenTelemetryMetrics(meter).observe(Stage.USER_INFO_FETCH, 0.2, False)
+    attributes = {"stage": "user_info_fetch", "outcome": "failed"}
+    assert meter.histogram.calls == [(0.2, attributes)]
+    assert meter.counter.calls == [(1, attributes)]
@@ -0,0 +1,115 @@
+import logging
+import pytest
+
+from time import time
+from unittest.mock import patch
+from jose.exceptions import JWEError
+
+from fastauth.jwts.cache import JWTCache
+from fastauth.jwts.operations import encipher_user_info
+from fastauth.jwts import handler
+from fastauth.libtypes import JWT, UserInfo, FallbackSecrets
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.keyring import KeyRing
+from fastauth.const_data import StatusCode
+from starlette.requests import Request
+from starlette.responses import Response
+from .utils import get_method_to_patch
+
+
+def _claims(exp: float) -> JWT:
+    return JWT(
+        iss="fastauth",
+        sub="client",
+        iat=int(time()),  # type: ignore
+        exp=int(exp),  # type: ignore
+        user_info=UserInfo(user_id="...", email="...", name="...", avatar=None),
+    )
+
+
+def test_hit_and_miss() -> None:
+    cache = JWTCache()
+    claims = _claims(time() + 3600)
+    assert cache.get("token") is None
+    cache.set("token", claims)
+    assert cache.get("token") is claims
+    assert cache.get("other-token") is None
+
+
+def test_entries_never_outlive_exp() -> None:
+    cache = JWTCache(ttl=3600)
+    cache.set("expired", _claims(time() - 1))
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+    with patch("fastauth.jwts.cache.time", return_value=time() + 11):
+        cache.set("expiring", _claims(time() + 10))
+    assert len(cache) == 0
+
+
+def test_ttl_expiry() -> None:
+    cache = JWTCache(ttl=10)
+    cache.set("token", _claims(time() + 3600))
+    with patch("fastauth.jwts.cache.time", return_value=time() + 11):
+        assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction() -> None:
+    cache = JWTCache(max_size=2)
+    claims = _claims(time() + 3600)
+    cache.set("a", claims)
+    cache.set("b", claims)
+    cache.get("a")  # `b` is now the least recently used
+    cache.set("c", claims)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is claims
+    with pytest.raises(ValueError):
+        JWTCache(max_size=0)
+
+
+def test_handler_skips_crypto_on_hit() -> None:
+    secrets = FallbackSecrets(*(generate_secret() for _ in range(5)))
+    encrypted_jwt = encipher_user_info(
+        user_info=UserInfo(user_id="...", email="...", name="...", avatar=None),
+        fallback_secrets=secrets,
+    )
+    cache = JWTCache()
+    with patch(
+        get_method_to_patch(
+            patched_class=handler.JWTHandler,
+            method_name=handler.JWTHandler._get_jwt_cookie.__name__,
+        ),
+        return_value=encrypted_jwt,
+    ), patch.object(
+        handler, "decipher_jwt", wraps=handler.decipher_jwt
+    ) as mocked_decipher:
+        for _ in range(3):
+            response = handler.JWTHandler(
+                request=Request(scope={"type": "http", "headers": []}),
+                response=Response(),
+                fallback_secrets=secrets,
+                logger=logging.getLogger(__name__),
+                debug=True,
+                jwt_cache=cache,
+            ).get_jwt()
+            assert response.status_code == StatusCode.OK
+        assert mocked_decipher.call_count == 1
+
+
+def test_retired_key_is_not_served_from_the_cache() -> None:
+    old_secret = generate_secret()
+    keyring = KeyRing([old_secret])
+    encrypted_jwt = encipher_user_info(
+        user_info=UserInfo(user_id="...", email="...", name="...", avatar=None),
+        fallback_secrets=keyring,
+    )
+    cache = JWTCache()
+    handler.read_jwt(encrypted_jwt, fallback_secrets=keyring, jwt_cache=cache)
+    keyring.rotate(generate_secret())
+    # still sealed by a key the ring holds
+    assert cache.get(encrypted_jwt, keyring) is not None
+    keyring.retire(keyring.keys[-1].kid)
+    with pytest.raises(JWEError):
+        handler.read_jwt(encrypted_jwt, fallback_secrets=keyring, jwt_cache=cache)
+    assert len(cache) == 0
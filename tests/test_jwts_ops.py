@@ -1,15 +1,28 @@
+import pytest
+
 from datetime import datetime, timedelta
+from jose.exceptions import ExpiredSignatureError, JWEError
+from jose.jwe import decrypt, encrypt, get_unverified_header
+from jose.jwt import encode as encode_jwt
 from fastauth.libtypes import FallbackSecrets
 from fastauth.jwts.operations import (
     encipher_user_info,
     decipher_jwt,
+    decipher_jwts,
     UserInfo,
     JWT_MAX_AGE,
+    JWT_ALGORITHM,
+    JWE_ALGORITHM,
     ISSUER,
     SUBJECT,
+    AEAD_CONTENT_TYPE,
 )
-from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.helpers import generate_secret, key_id
+from fastauth.jwts.claims import COMPACT_TOKEN_FORMAT, TokenFormat
+from fastauth.jwts.revocation import RevocationList
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from tests.utils import with_header
 
 NOW = datetime.utcnow()
 
@@ -37,6 +50,175 @@ def test_all() -> None:
     assert decrypted_payload["iat"] <= decrypted_payload["exp"]
 
 
+def test_key_id_tagging() -> None:
+    data = TestData()
+    encrypted_jwt = encipher_user_info(data.user_info, data.fallback_secrets)
+    kid = get_unverified_header(encrypted_jwt)["kid"]
+    assert kid == key_id(data.fallback_secrets.secret_1)
+    # the sealing secret got rotated to the last position
+    rotated = FallbackSecrets(*data.fallback_secrets[1:], data.fallback_secrets[0])
+    assert decipher_jwt(encrypted_jwt, rotated)["user_info"] == data.user_info
+
+
+def test_unknown_key_id() -> None:
+    data = TestData()
+    encrypted_jwt = encipher_user_info(
+        data.user_info,
+        FallbackSecrets(*(generate_secret() for _ in data.fallback_secrets)),
+    )
+    with pytest.raises(JWEError):
+        decipher_jwt(encrypted_jwt, data.fallback_secrets)
+
+
+@pytest.mark.parametrize("kid", [[], {}, 1])
+def test_non_string_key_id(kid: object) -> None:
+    data = TestData()
+    encrypted_jwt = encipher_user_info(data.user_info, data.fallback_secrets)
+    header = {**get_unverified_header(encrypted_jwt), "kid": kid}
+    with pytest.raises(JWEError):
+        decipher_jwt(with_header(encrypted_jwt, header), data.fallback_secrets)
+
+
+def test_untagged_legacy_token() -> None:
+    data = TestData()
+    key = data.fallback_secrets.secret_4
+    plain_jwt = encode_jwt(
+        claims={
+            "iss": ISSUER,
+            "sub": SUBJECT,
+            "iat": data.iat,
+            "exp": data.exp,
+            "user_info": data.user_info,
+        },
+        key=key,
+        algorithm=JWT_ALGORITHM,
+    )
+    legacy_jwt = encrypt(
+        plaintext=plain_jwt.encode(), key=key, encryption=JWE_ALGORITHM
+    ).decode()
+    assert "kid" not in get_unverified_header(legacy_jwt)
+    assert decipher_jwt(legacy_jwt, data.fallback_secrets)["user_info"] == (
+        data.user_info
+    )
+
+
+@pytest.mark.parametrize(
+    "token_format",
+    [
+        TokenFormat(compact_claims=True),
+        TokenFormat(compress=True),
+        TokenFormat(aead_only=True),
+        COMPACT_TOKEN_FORMAT,
+    ],
+)
+def test_compact_formats(token_format: TokenFormat) -> None:
+    data = TestData()
+    user_info = UserInfo(**data.user_info, extras=data.extras)  # type: ignore
+    default = encipher_user_info(user_info, data.fallback_secrets)
+    compact = encipher_user_info(
+        user_info, data.fallback_secrets, token_format=token_format
+    )
+    assert len(compact) < len(default)
+    assert get_unverified_header(compact).get("zip") == (
+        "DEF" if token_format.compress else None
+    )
+    jwt = decipher_jwt(compact, data.fallback_secrets)
+    expected = user_info if token_format.include_extras else data.user_info
+    assert jwt["user_info"] == expected
+    assert decipher_jwt(default, data.fallback_secrets)["user_info"] == user_info
+    assert isinstance(jwt["iat"], int) and jwt["exp"] - jwt["iat"] == JWT_MAX_AGE
+
+
+def test_compact_claims_without_avatar() -> None:
+    data = TestData()
+    user_info = UserInfo(**{**data.user_info, "avatar": None})  # type: ignore
+    compact = encipher_user_info(
+        user_info, data.fallback_secrets, token_format=COMPACT_TOKEN_FORMAT
+    )
+    assert decipher_jwt(compact, data.fallback_secrets)["user_info"] == user_info
+
+
+def test_aead_only_tokens() -> None:
+    data = TestData()
+    aead_format = COMPACT_TOKEN_FORMAT._replace(aead_only=True)
+    nested = encipher_user_info(
+        data.user_info, data.fallback_secrets, token_format=COMPACT_TOKEN_FORMAT
+    )
+    aead = encipher_user_info(
+        data.user_info, data.fallback_secrets, token_format=aead_format
+    )
+    assert len(aead) < len(nested)
+    header = get_unverified_header(aead)
+    assert header["cty"] == AEAD_CONTENT_TYPE
+    assert header["kid"] == key_id(data.fallback_secrets.secret_1)
+    # both stay readable while migrating from one to the other
+    assert decipher_jwt(aead, data.fallback_secrets)["user_info"] == data.user_info
+    assert decipher_jwt(nested, data.fallback_secrets)["user_info"] == data.user_info
+    # sealed with a derived key, never with the secret itself
+    with pytest.raises(JWEError):
+        decrypt(aead, data.fallback_secrets.secret_1)
+    expired = encipher_user_info(
+        data.user_info, data.fallback_secrets, max_age=-10, token_format=aead_format
+    )
+    with pytest.raises(ExpiredSignatureError):
+        decipher_jwt(expired, data.fallback_secrets)
+
+
+@pytest.mark.parametrize("executor", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+def test_batch_deciphering(executor) -> None:
+    data = TestData()
+    tokens = [
+        encipher_user_info(
+            UserInfo(**{**data.user_info, "user_id": str(i)}),  # type: ignore
+            data.fallback_secrets,
+        )
+        for i in range(10)
+    ]
+    revoked = decipher_jwt(tokens[7], data.fallback_secrets)
+    revocation_list = RevocationList()
+    revocation_list.revoke(revoked["jti"], revoked["exp"])
+    # a forged header doesn't stop the tokens after it
+    tokens[1] = with_header(tokens[1], {**get_unverified_header(tokens[1]), "kid": []})
+    tokens[3] = "not.a.token"
+    tokens[5] = tokens[5][:-4]
+    pool = executor(max_workers=2) if executor is not None else None
+    try:
+        results = list(
+            decipher_jwts(
+                iter(tokens),
+                data.fallback_secrets,
+                revocation_list=revocation_list,
+                executor=pool,
+                batch_size=3,
+            )
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    assert [r.token for r in results] == tokens
+    refused = {i for i, r in enumerate(results) if r.jwt is None}
+    assert refused == {1, 3, 5, 7}
+    assert isinstance(results[1].error, JWEError)
+    assert all(results[i].error is not None for i in refused)
+    assert [r.jwt["user_info"]["user_id"] for r in results if r.jwt] == [
+        str(i) for i in range(10) if i not in refused
+    ]
+
+
+def test_batch_deciphering_is_lazy() -> None:
+    data = TestData()
+    token = encipher_user_info(data.user_info, data.fallback_secrets)
+
+    def tokens():
+        yield token
+        raise AssertionError("read past what was consumed")
+
+    results = decipher_jwts(tokens(), data.fallback_secrets, batch_size=1)
+    assert next(results).jwt is not None
+    with pytest.raises(ValueError):
+        next(decipher_jwts([token], data.fallback_secrets, batch_size=0))
+
+
 @dataclass
 class TestData:
     __test__ = False
@@ -57,3 +239,4 @@ class TestData:
     iat = NOW
     exp = NOW + timedelta(seconds=JWT_MAX_AGE)
     jwt_max_age = JWT_MAX_AGE
+    user_info = UserInfo(name=name, email=email, user_id=user_id, avatar=avatar)
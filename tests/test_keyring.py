@@ -0,0 +1,103 @@
+import pickle
+
+import pytest
+from jose.exceptions import JWEError
+from jose.jwe import decrypt, encrypt, get_unverified_header
+from jose.jwt import encode as encode_jwt
+
+from fastauth.exceptions import WrongKeyLength
+from fastauth.jwts.helpers import generate_secret, key_id
+from fastauth.jwts.keyring import KeyRing, as_keyring
+from fastauth.jwts.operations import (
+    ISSUER,
+    JWE_ALGORITHM,
+    JWT_ALGORITHM,
+    NESTED_CONTENT_TYPE,
+    SUBJECT,
+    decipher_jwt,
+    encipher_user_info,
+)
+from fastauth.libtypes import FallbackSecrets, UserInfo
+
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+
+
+@pytest.mark.parametrize("count", [1, 2, 12])
+def test_any_number_of_secrets(count: int) -> None:
+    secrets = [generate_secret() for _ in range(count)]
+    keyring = KeyRing(secrets)
+    assert len(keyring) == count
+    assert keyring.current.secret == secrets[0]
+    assert all(keyring.get(key_id(secret)) is not None for secret in secrets)
+    token = encipher_user_info(_user_info, keyring)
+    assert get_unverified_header(token)["kid"] == key_id(secrets[0])
+    assert decipher_jwt(token, KeyRing(secrets[::-1]))["user_info"] == _user_info
+
+
+def test_validated_once_at_construction() -> None:
+    with pytest.raises(WrongKeyLength):
+        KeyRing([generate_secret(), "short"])
+    with pytest.raises(ValueError):
+        KeyRing([])
+    secret = generate_secret()
+    assert [key.secret for key in KeyRing([secret, secret]).keys] == [secret]
+
+
+def test_subkeys_are_derived_per_purpose() -> None:
+    key = KeyRing([generate_secret()]).current
+    assert len({key.jwe, key.jws, key.secret.encode()}) == 3
+    assert key.csrf_kid != key.kid
+    token = encipher_user_info(_user_info, [key.secret])
+    assert get_unverified_header(token)["cty"] == NESTED_CONTENT_TYPE
+    # never sealed with the secret itself
+    with pytest.raises(JWEError):
+        decrypt(token, key.secret)
+
+
+def test_fallback_secrets_are_accepted() -> None:
+    secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+    token = encipher_user_info(_user_info, secrets)
+    assert decipher_jwt(token, secrets)["user_info"] == _user_info
+    assert decipher_jwt(token, KeyRing(secrets))["user_info"] == _user_info
+    keyring = KeyRing(secrets)
+    assert as_keyring(keyring) is keyring
+    # the same secrets share their derived keys
+    assert as_keyring(secrets).keys == keyring.keys
+
+
+def test_rotation_without_restart() -> None:
+    old_secret, new_secret = generate_secret(), generate_secret()
+    keyring = KeyRing([old_secret])
+    old_token = encipher_user_info(_user_info, keyring)
+    keyring.rotate(new_secret)
+    new_token = encipher_user_info(_user_info, keyring)
+    assert get_unverified_header(new_token)["kid"] == key_id(new_secret)
+    assert decipher_jwt(old_token, keyring)["user_info"] == _user_info
+    assert decipher_jwt(new_token, keyring)["user_info"] == _user_info
+    keyring.retire(key_id(old_secret))
+    assert len(keyring) == 1
+    with pytest.raises(JWEError):
+        decipher_jwt(old_token, keyring)
+    with pytest.raises(ValueError):
+        keyring.retire(key_id(new_secret))  # never left without a sealing key
+    assert keyring.current.secret == new_secret
+
+
+def test_tokens_sealed_with_the_secret_itself() -> None:
+    secret = generate_secret()
+    plain_jwt = encode_jwt(
+        claims={"iss": ISSUER, "sub": SUBJECT, "user_info": _user_info},
+        key=secret,
+        algorithm=JWT_ALGORITHM,
+    )
+    legacy_jwt = encrypt(
+        plain_jwt, secret, algorithm="dir", encryption=JWE_ALGORITHM, kid=key_id(secret)
+    ).decode()
+    keyring = KeyRing([generate_secret(), secret])
+    assert decipher_jwt(legacy_jwt, keyring)["user_info"] == _user_info
+
+
+def test_pickles_with_its_secrets() -> None:
+    keyring = KeyRing([generate_secret(), generate_secret()])
+    copy = pickle.loads(pickle.dumps(keyring))
+    assert copy.keys == keyring.keys
@@ -0,0 +1,40 @@
+import pytest
+
+import fastauth
+from benchmarks.startup import import_time_us, measure
+
+
+def test_every_public_name_resolves() -> None:
+    for name in fastauth.__all__:
+        assert getattr(fastauth, name) is not None
+    assert set(fastauth.__all__) <= set(dir(fastauth))
+    with pytest.raises(AttributeError):
+        fastauth.NotAThing  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["import fastauth", "from fastauth import OAuthOptions, FallbackSecrets"],
+)
+def test_nothing_heavy_is_imported_up_front(statement: str) -> None:
+    elapsed, loaded = measure(statement)
+    assert elapsed > 0
+    assert loaded == ()
+
+
+def test_provider_loads_without_the_flow() -> None:
+    _, loaded = measure("from fastauth import Google")
+    assert "fastapi" not in loaded and "httpx" not in loaded
+
+
+def test_import_time_counts_top_level_imports_from_fastauth() -> None:
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        900 | site",
+            "import time:        50 |         50 |   fastauth.libtypes",
+            "import time:        20 |         70 | fastauth",
+            "import time:        30 |         30 | fastauth.oauth2_options",
+        ]
+    )
+    assert import_time_us(stderr) == 100
@@ -0,0 +1,71 @@
+import pytest
+from fastapi import FastAPI
+from starlette.testclient import TestClient
+
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.providers.google.google import Google
+from tests.utils import MockProvider
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+
+
+async def signin_callback(user_info: UserInfo) -> None:  # pragma: no cover
+    pass
+
+
+@pytest.fixture
+def providers():
+    return [
+        Google(client_id="id", client_secret="secret", redirect_uri="http://x/cb"),
+        MockProvider(client_id="id", client_secret="secret", redirect_uri="http://x"),
+    ]
+
+
+def test_one_router_dispatches_to_every_provider(providers) -> None:
+    google, mock = providers
+    router = OAuthOptions(
+        provider=providers, signin_callback=signin_callback, fallback_secrets=_secrets
+    )
+    paths = [route.path for route in router.routes]  # type: ignore
+    assert sorted(paths) == sorted(set(paths))
+    assert "/auth/signin/{provider}" in paths
+    assert "/auth/callback/{provider}" in paths
+    assert google.http is mock.http
+
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    google_redirect = client.get("/auth/signin/google", follow_redirects=False)
+    assert google_redirect.headers["location"].startswith(
+        "https://accounts.google.com/o/oauth2/auth?"
+    )
+    mock_redirect = client.get("/auth/signin/mock", follow_redirects=False)
+    assert mock_redirect.headers["location"] == "/"
+    assert client.get("/auth/signin/github").status_code == 404
+    assert client.get("/auth/callback/github?code=c&state=s").status_code == 404
+
+
+def test_a_single_provider_is_still_accepted(providers) -> None:
+    google, _ = providers
+    router = OAuthOptions(
+        provider=google, signin_callback=signin_callback, fallback_secrets=_secrets
+    )
+    app = FastAPI()
+    app.include_router(router)
+    assert TestClient(app).get("/auth/signin/mock").status_code == 404
+
+
+def test_provider_names_are_unique(providers) -> None:
+    google, _ = providers
+    with pytest.raises(ValueError):
+        OAuthOptions(
+            provider=[google, google],
+            signin_callback=signin_callback,
+            fallback_secrets=_secrets,
+        )
+    with pytest.raises(ValueError):
+        OAuthOptions(
+            provider=[], signin_callback=signin_callback, fallback_secrets=_secrets
+        )
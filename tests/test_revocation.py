@@ -0,0 +1,102 @@
+import logging
+
+from time import time
+from unittest.mock import patch
+
+import pytest
+from jose.exceptions import JWTError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from fastauth.const_data import CookieData, StatusCode
+from fastauth.jwts.cache import JWTCache
+from fastauth.jwts.handler import JWTHandler
+from fastauth.jwts.helpers import generate_secret
+from fastauth.jwts.operations import decipher_jwt, encipher_user_info
+from fastauth.jwts.revocation import RevocationList
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.signout import Signout
+from fastauth.utils import name_cookie
+
+_secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+_logger = logging.getLogger("fastauth")
+
+
+def _request(encrypted_jwt: str) -> Request:
+    cookie = f"{name_cookie(name=CookieData.JWT.name)}={encrypted_jwt}"
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "headers": [(b"cookie", cookie.encode())],
+            "query_string": b"",
+        }
+    )
+
+
+def test_revocation_lasts_until_expiry() -> None:
+    revocation_list = RevocationList(capacity=10)
+    revocation_list.revoke("jti", time() + 60)
+    revocation_list.revoke("stale", time() - 1)  # already unusable
+    assert revocation_list.is_revoked("jti")
+    assert not revocation_list.is_revoked("stale")
+    assert not revocation_list.is_revoked("other")
+    with patch("fastauth.jwts.revocation.time", return_value=time() + 61):
+        assert not revocation_list.is_revoked("jti")
+        assert revocation_list.prune() == 1
+    assert len(revocation_list) == 0
+    with pytest.raises(ValueError):
+        RevocationList(capacity=0)
+
+
+def test_full_list_prunes_then_grows() -> None:
+    revocation_list = RevocationList(capacity=2)
+    now = time()
+    revocation_list.revoke("a", now + 60)
+    revocation_list.revoke("b", now + 60)
+    with patch("fastauth.jwts.revocation.time", return_value=now + 61):
+        revocation_list.revoke("c", now + 120)  # a & b expired, pruned
+    assert len(revocation_list) == 1
+    revocation_list.revoke("d", now + 120)
+    revocation_list.revoke("e", now + 120)  # nothing to prune, grows
+    assert revocation_list.capacity == 4
+    assert all(revocation_list.is_revoked(jti) for jti in "cde")
+
+
+def test_signed_out_tokens_are_refused() -> None:
+    revocation_list = RevocationList()
+    cache = JWTCache()
+    encrypted_jwt = encipher_user_info(_user_info, _secrets)
+    jwt = decipher_jwt(encrypted_jwt, _secrets, revocation_list)
+    assert jwt["jti"]
+
+    def get_jwt() -> Response:
+        return JWTHandler(
+            request=_request(encrypted_jwt),
+            response=Response(),
+            fallback_secrets=_secrets,
+            logger=_logger,
+            debug=False,
+            jwt_cache=cache,
+            revocation_list=revocation_list,
+        ).get_jwt()
+
+    assert get_jwt().status_code == StatusCode.OK  # now cached
+    Signout(
+        post_signout_uri="/out",
+        request=_request(encrypted_jwt),
+        fallback_secrets=_secrets,
+        error_uri="/error",
+        logger=_logger,
+        debug=False,
+        revocation_list=revocation_list,
+    )()
+    assert get_jwt().status_code == StatusCode.UNAUTHORIZED
+    with pytest.raises(JWTError):
+        decipher_jwt(encrypted_jwt, _secrets, revocation_list)
+    # without the list, the token is still sound
+    assert decipher_jwt(encrypted_jwt, _secrets)["jti"] == jwt["jti"]
@@ -0,0 +1,43 @@
+from typing import List
+
+from fastapi import APIRouter, FastAPI, Request, Response
+from starlette.testclient import TestClient
+
+from fastauth.adapters.fastapi.route import FastAuthRoute
+
+
+def _app(route_class) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/route")
+    def route(request: Request) -> dict:
+        return {"user": getattr(request.state, "user", None)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def test_no_hooks_is_a_pass_through() -> None:
+    route = FastAuthRoute("/route", endpoint=lambda: None)
+    assert route.get_route_handler().__name__ != "fastauth_route_handler"
+    assert TestClient(_app(FastAuthRoute)).get("/route").json() == {"user": None}
+
+
+def test_hooks_share_the_handler_request() -> None:
+    seen: List[Request] = []
+
+    async def inject_user(request: Request) -> None:
+        request.state.user = "john"
+        seen.append(request)
+
+    async def add_header(request: Request, response: Response) -> None:
+        assert request is seen[0]
+        response.headers["x-hooked"] = "1"
+
+    route_class = FastAuthRoute.with_hooks(before=[inject_user], after=[add_header])
+    assert issubclass(route_class, FastAuthRoute)
+    assert FastAuthRoute.before_hooks == ()  # the base class is left alone
+    response = TestClient(_app(route_class)).get("/route")
+    assert response.json() == {"user": "john"}
+    assert response.headers["x-hooked"] == "1"
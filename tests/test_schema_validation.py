@@ -0,0 +1,112 @@
+import pytest
+
+from typing import Any, Dict
+from unittest.mock import AsyncMock, patch
+
+from pydantic import ValidationError
+
+from benchmarks.fake_provider import TOKEN_RESPONSE, USER_INFO_RESPONSE
+from fastauth.config import FastAuthConfig
+from fastauth.libtypes import ProviderResponseData
+from fastauth.providers import validation
+from fastauth.providers.google import schemas as google
+from fastauth.providers.google.google import Google
+from fastauth.providers.spotify import schemas as spotify
+
+SPOTIFY_USER_INFO_RESPONSE: Dict[str, Any] = {
+    "display_name": "John Doe",
+    "external_urls": {"spotify": "https://open.spotify.com/user/johndoe"},
+    "id": "johndoe",
+    "images": [
+        {"url": "https://i.scdn.co/image/small", "height": 64, "width": 64},
+        {"url": "https://i.scdn.co/image/large", "height": 300, "width": 300},
+    ],
+    "type": "user",
+    "email": "john.doe@example.com",
+    "country": "FR",
+}
+SPOTIFY_TOKEN_RESPONSE: Dict[str, Any] = {
+    "access_token": "BQD-fake-access-token",
+    "token_type": "Bearer",
+    "expires_in": 3600,
+    "refresh_token": "AQD-fake-refresh-token",
+    "scope": "user-read-email",
+}
+
+
+@pytest.mark.parametrize(
+    "serialize, data",
+    [
+        (google.serialize_user_info, USER_INFO_RESPONSE),
+        (spotify.serialize_user_info, SPOTIFY_USER_INFO_RESPONSE),
+        (spotify.serialize_user_info, {**SPOTIFY_USER_INFO_RESPONSE, "images": []}),
+    ],
+)
+def test_both_levels_agree_on_user_info(serialize, data) -> None:
+    assert serialize(data, "fast") == serialize(data, "strict")
+
+
+@pytest.mark.parametrize(
+    "serialize, data",
+    [
+        (google.serialize_token_set, TOKEN_RESPONSE),
+        (google.serialize_token_set, {**TOKEN_RESPONSE, "expires_in": "3599"}),
+        (spotify.serialize_token_set, SPOTIFY_TOKEN_RESPONSE),
+    ],
+)
+def test_both_levels_agree_on_token_sets(serialize, data) -> None:
+    fast, strict = serialize(data, "fast"), serialize(data, "strict")
+    assert fast.access_token == strict.access_token
+    assert fast.refresh_token == strict.refresh_token
+    assert fast.expires_at == pytest.approx(strict.expires_at, abs=1)
+
+
+@pytest.mark.parametrize(
+    "serialize, data",
+    [
+        (google.serialize_user_info, {**USER_INFO_RESPONSE, "email": "john@doe"}),
+        (google.serialize_user_info, {**USER_INFO_RESPONSE, "picture": "htps://x"}),
+        (google.serialize_token_set, {**TOKEN_RESPONSE, "access_token": ""}),
+        (google.serialize_token_set, {**TOKEN_RESPONSE, "token_type": "MAC"}),
+        (spotify.serialize_token_set, {**SPOTIFY_TOKEN_RESPONSE, "scope": None}),
+    ],
+)
+def test_what_does_not_fit_goes_through_pydantic(serialize, data) -> None:
+    with pytest.raises(ValidationError):
+        serialize(data, "fast")
+
+
+def test_checks() -> None:
+    check = validation.shape(
+        n=validation.integer,
+        tag=validation.optional(validation.literal("a", "b")),
+        items=validation.list_of(validation.boolean),
+    )
+    assert check({"n": 1, "items": [True, False]})
+    assert check({"n": 1, "tag": None, "items": []})
+    assert not check({"n": True, "items": []})  # a bool isn't an int
+    assert not check({"n": 1, "tag": "c", "items": []})
+    assert not check({"n": 1})
+    assert not check([("n", 1)])
+    assert validation.email("john.doe@example.com")
+    assert not validation.email("john doe@example.com")
+    assert validation.http_url("https://example.com/pic?s=96")
+    assert not validation.http_url("https://")
+
+
+@pytest.mark.asyncio
+async def test_google_uses_the_configured_level() -> None:
+    google_ = Google(client_id="id", client_secret="secret", redirect_uri="/cb")
+    FastAuthConfig.schema_validation = "fast"
+    try:
+        with patch.object(
+            Google,
+            "_request_user_info",
+            AsyncMock(return_value=ProviderResponseData(200, USER_INFO_RESPONSE, "")),
+        ), patch.object(
+            google.GoogleUserJSONData, "parse_obj", side_effect=AssertionError
+        ):
+            user_info = await google_.get_user_info("ya29.fake-access-token")
+    finally:
+        FastAuthConfig.schema_validation = "strict"
+    assert user_info == google.serialize_user_info(USER_INFO_RESPONSE)
@@ -0,0 +1,187 @@
+import threading
+
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+
+from benchmarks.fake_provider import USER_INFO_RESPONSE, fake_google_transport
+from fastauth.adapters.fastapi.dependencies import ClaimsReader, CurrentUser
+from fastauth.const_data import CookieData
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import JWT, FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.providers.google.google import Google
+from fastauth.sessions import (
+    InMemorySessionStore,
+    RedisSessionStore,
+    SQLiteSessionStore,
+    SessionStore,
+    session_claims,
+)
+from fastauth.utils import name_cookie
+
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+
+
+class _LocalRedis:
+    """the subset of `redis.Redis` the store relies on"""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Tuple[str, int]] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.data.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        self.data[key] = (value, ex)
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request) -> SessionStore:
+    if request.param == "memory":
+        return InMemorySessionStore()
+    if request.param == "sqlite":
+        return SQLiteSessionStore()
+    return RedisSessionStore(_LocalRedis())
+
+
+def test_store_roundtrip(store: SessionStore) -> None:
+    claims = session_claims(user_info=_user_info, max_age=60)
+    store.set("sid", claims, 60)
+    assert store.get("sid") == claims
+    assert store.get("unknown") is None
+    store.delete("sid")
+    assert store.get("sid") is None
+    store.delete("sid")  # no-op
+
+
+def test_expired_sessions_are_gone() -> None:
+    memory, sqlite = InMemorySessionStore(), SQLiteSessionStore()
+    claims = session_claims(user_info=_user_info, max_age=60)
+    for store in (memory, sqlite):
+        store.set("sid", claims, 60)
+    with patch("fastauth.sessions.time", return_value=claims["exp"] + 1):  # type: ignore
+        assert memory.get("sid") is None
+        assert sqlite.get("sid") is None
+        assert sqlite.purge_expired() == 1
+    assert len(memory) == 0
+
+
+def test_memory_store_is_bounded() -> None:
+    store = InMemorySessionStore(max_size=2)
+    claims = session_claims(user_info=_user_info, max_age=60)
+    store.set("a", claims, 60)
+    store.set("b", claims, 60)
+    store.get("a")  # b becomes the least recently used
+    store.set("c", claims, 60)
+    assert store.get("b") is None
+    assert store.get("a") == store.get("c") == claims
+
+
+@pytest.mark.asyncio
+async def test_session_mode_cycle() -> None:
+    async def signin_callback(user_info: UserInfo) -> None:
+        pass
+
+    store = InMemorySessionStore()
+    provider = Google(
+        client_id="id", client_secret="secret", redirect_uri="http://testserver/cb"
+    )
+    app = FastAPI()
+    app.include_router(
+        OAuthOptions(
+            provider=provider,
+            signin_callback=signin_callback,
+            fallback_secrets=FallbackSecrets(
+                *(generate_secret() for _ in FallbackSecrets._fields)
+            ),
+            session_store=store,
+        )
+    )
+    provider.http.transport = fake_google_transport()
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        location = (await client.get("/auth/signin/google")).headers["location"]
+        state = parse_qs(urlsplit(location).query)["state"][0]
+        await client.get("/auth/callback/google", params={"code": "c", "state": state})
+        sid = client.cookies[name_cookie(name=CookieData.Session.name)]
+        assert name_cookie(name=CookieData.JWT.name) not in client.cookies
+        assert len(sid) < 64
+
+        response = await client.get("/auth/jwt")
+        assert response.status_code == 200
+        jwt = response.json()["jwt"]
+        assert jwt["user_info"]["user_id"] == USER_INFO_RESPONSE["id"]
+        assert jwt == store.get(sid)
+
+        await client.get("/auth/signout")
+        assert store.get(sid) is None
+        client.cookies.set(name_cookie(name=CookieData.Session.name), sid)
+        assert (await client.get("/auth/jwt")).status_code == 401
+
+
+class _ThreadRecordingStore:
+    """an in-memory store that notes the thread each call ran on"""
+
+    def __init__(self) -> None:
+        self.store = InMemorySessionStore()
+        self.threads: List[Tuple[str, int]] = []
+
+    def get(self, sid: str) -> Optional[JWT]:
+        self.threads.append(("get", threading.get_ident()))
+        return self.store.get(sid)
+
+    def set(self, sid: str, claims: JWT, max_age: int) -> None:
+        self.threads.append(("set", threading.get_ident()))
+        self.store.set(sid, claims, max_age)
+
+    def delete(self, sid: str) -> None:
+        self.threads.append(("delete", threading.get_ident()))
+        self.store.delete(sid)
+
+
+@pytest.mark.asyncio
+async def test_store_is_never_called_on_the_loop() -> None:
+    async def signin_callback(user_info: UserInfo) -> None:
+        pass
+
+    secrets = FallbackSecrets(*(generate_secret() for _ in FallbackSecrets._fields))
+    store = _ThreadRecordingStore()
+    provider = Google(
+        client_id="id", client_secret="secret", redirect_uri="http://testserver/cb"
+    )
+    app = FastAPI()
+    app.include_router(
+        OAuthOptions(
+            provider=provider,
+            signin_callback=signin_callback,
+            fallback_secrets=secrets,
+            session_store=store,
+        )
+    )
+    current_user = CurrentUser(
+        ClaimsReader(fallback_secrets=secrets, session_store=store)
+    )
+
+    @app.get("/me")
+    async def me(jwt: JWT = Depends(current_user)) -> str:
+        return jwt["user_info"]["user_id"]
+
+    provider.http.transport = fake_google_transport()
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        location = (await client.get("/auth/signin/google")).headers["location"]
+        state = parse_qs(urlsplit(location).query)["state"][0]
+        await client.get("/auth/callback/google", params={"code": "c", "state": state})
+        assert (await client.get("/me")).json() == USER_INFO_RESPONSE["id"]
+        await client.get("/auth/jwt")
+        await client.get("/auth/signout")
+    assert [call for call, _ in store.threads] == ["set", "get", "get", "delete"]
+    loop_thread = threading.get_ident()
+    assert all(thread != loop_thread for _, thread in store.threads)
@@ -1,7 +1,13 @@
+import inspect
+
 import pytest
 
-from fastauth.libtypes import UserInfo
-from fastauth.signin import check_signin_signature
+from fastauth.exceptions import WrongKeyLength
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.signin import bind_signin_callback, check_signin_signature
+from tests.utils import MockProvider
 
 
 @pytest.mark.asyncio
@@ -37,3 +43,51 @@ async def test_invalid_callback_signature_wrong_param_name():
 
     with pytest.raises(TypeError):
         check_signin_signature(invalid_callback)
+
+
+def test_postponed_annotations_are_resolved():
+    async def valid_callback(user_info: "UserInfo") -> None:  # pragma: no cover
+        pass
+
+    check_signin_signature(valid_callback)
+
+
+def test_callbacks_are_bound_once():
+    async def function(user_info: UserInfo) -> None:  # pragma: no cover
+        pass
+
+    class Upsert:
+        async def __call__(self, user_info: UserInfo) -> None:  # pragma: no cover
+            pass
+
+    upsert = Upsert()
+    assert bind_signin_callback(function) is function
+    bound = bind_signin_callback(upsert)
+    assert bound == upsert.__call__ and inspect.ismethod(bound)
+
+
+@pytest.mark.parametrize(
+    "options, error",
+    [
+        ({"signin_callback": lambda user_nfo: None}, TypeError),
+        ({"fallback_secrets": FallbackSecrets(*("short",) * 5)}, WrongKeyLength),
+        ({"jwt_max_age": 0}, ValueError),
+    ],
+)
+def test_misconfigurations_fail_at_startup(options, error):
+    async def valid_callback(user_info: UserInfo) -> None:  # pragma: no cover
+        pass
+
+    with pytest.raises(error):
+        OAuthOptions(
+            **{
+                "provider": MockProvider(
+                    client_id="id", client_secret="s", redirect_uri="/"
+                ),
+                "signin_callback": valid_callback,
+                "fallback_secrets": FallbackSecrets(
+                    *(generate_secret() for _ in FallbackSecrets._fields)
+                ),
+                **options,
+            }
+        )
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+
+from typing import List
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from benchmarks.fake_provider import USER_INFO_RESPONSE, fake_google_transport
+from fastauth.jwts.helpers import generate_secret
+from fastauth.libtypes import FallbackSecrets, UserInfo
+from fastauth.oauth2_options import OAuthOptions
+from fastauth.providers.google.google import Google
+from fastauth.signin_queue import SignInQueue
+
+_user_info = UserInfo(user_id="1", email="a@b.c", name="John", avatar=None)
+
+
+@pytest.mark.asyncio
+async def test_callbacks_run_in_the_background() -> None:
+    release = asyncio.Event()
+    seen: List[str] = []
+
+    async def slow_callback(user_info: UserInfo) -> None:
+        await release.wait()
+        seen.append(user_info["user_id"])
+
+    queue = SignInQueue()
+    await queue.submit(slow_callback, _user_info)
+    await queue.submit(slow_callback, _user_info)
+    assert seen == []  # submitted without waiting for the callbacks
+    release.set()
+    await queue.aclose()
+    assert seen == ["1", "1"]
+    assert not queue.is_running
+
+
+@pytest.mark.asyncio
+async def test_failures_are_retried(caplog) -> None:
+    attempts: List[int] = []
+
+    async def flaky_callback(user_info: UserInfo) -> None:
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("database unavailable")
+
+    async def broken_callback(user_info: UserInfo) -> None:
+        raise ConnectionError("database unavailable")
+
+    queue = SignInQueue(retries=2, backoff=0)
+    with caplog.at_level(logging.ERROR, logger="fastauth"):
+        await queue.submit(flaky_callback, _user_info)
+        await queue.submit(broken_callback, _user_info)
+        await queue.aclose()
+    assert len(attempts) == 3
+    assert [r.getMessage() for r in caplog.records] == [
+        "Sign in callback failed 3 times for user 1, dropped"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_a_full_queue_pushes_back() -> None:
+    release = asyncio.Event()
+    seen: List[str] = []
+
+    async def callback(user_info: UserInfo) -> None:
+        await release.wait()
+        seen.append(user_info["user_id"])
+
+    async def inline_callback(user_info: UserInfo) -> None:
+        seen.append("inline")
+
+    queue = SignInQueue(max_size=1, put_timeout=0.01)
+    await queue.submit(callback, _user_info)  # taken by the worker
+    await asyncio.sleep(0)
+    await queue.submit(callback, _user_info)  # fills the queue
+    assert len(queue) == 1
+    await queue.submit(inline_callback, _user_info)  # no room, ran in place
+    assert seen == ["inline"]
+    release.set()
+    await queue.aclose()
+    assert seen == ["inline", "1", "1"]
+
+
+@pytest.mark.asyncio
+async def test_undrained_callbacks_are_reported(caplog) -> None:
+    async def stuck_callback(user_info: UserInfo) -> None:
+        await asyncio.Event().wait()
+
+    queue = SignInQueue(drain_timeout=0.01)
+    for _ in range(3):
+        await queue.submit(stuck_callback, _user_info)
+    with caplog.at_level(logging.ERROR, logger="fastauth"):
+        await queue.aclose()
+    assert "2 queued sign in callbacks dropped on shutdown" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_submit_during_shutdown_runs_in_place() -> None:
+    release = asyncio.Event()
+    seen: List[str] = []
+
+    async def slow_callback(user_info: UserInfo) -> None:
+        await release.wait()
+        seen.append("queued")
+
+    async def late_callback(user_info: UserInfo) -> None:
+        seen.append("late")
+
+    queue = SignInQueue()
+    await queue.submit(slow_callback, _user_info)
+    closing = asyncio.ensure_future(queue.aclose())
+    await asyncio.sleep(0)  # draining
+    await queue.submit(late_callback, _user_info)
+    assert seen == ["late"]
+    assert not queue.is_running  # no new queue nor workers were started
+    release.set()
+    await closing
+    assert seen == ["late", "queued"]
+    assert not queue.is_running
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        SignInQueue(max_size=0)
+    with pytest.raises(ValueError):
+        SignInQueue(retries=-1)
+
+
+@pytest.mark.asyncio
+async def test_signin_does_not_wait_for_the_callback() -> None:
+    release = asyncio.Event()
+    seen: List[UserInfo] = []
+
+    async def signin_callback(user_info: UserInfo) -> None:
+        await release.wait()
+        seen.append(user_info)
+
+    queue = SignInQueue()
+    provider = Google(
+        client_id="id", client_secret="secret", redirect_uri="http://testserver/cb"
+    )
+    app = FastAPI()
+    app.include_router(
+        OAuthOptions(
+            provider=provider,
+            signin_callback=signin_callback,
+            fallback_secrets=FallbackSecrets(
+                *(generate_secret() for _ in FallbackSecrets._fields)
+            ),
+            signin_queue=queue,
+        )
+    )
+    # drained on shutdown before the HTTP pool is closed
+    assert app.router.on_shutdown[:2] == [queue.aclose, provider.http.aclose]
+    provider.http.transport = fake_google_transport()
+    async with AsyncClient(app=app, base_url="http://testserver") as client:
+        location = (await client.get("/auth/signin/google")).headers["location"]
+        state = parse_qs(urlsplit(location).query)["state"][0]
+        response = await client.get(
+            "/auth/callback/google", params={"code": "c", "state": state}
+        )
+        assert response.status_code == 307
+        assert seen == [] and queue.is_running
+    release.set()
+    await queue.aclose()
+    assert seen[0]["user_id"] == USER_INFO_RESPONSE["id"]
@@ -0,0 +1,91 @@
+import asyncio
+from time import time
+from typing import List, Optional
+
+import pytest
+
+from fastauth.libtypes import AccessToken, TokenSet
+from fastauth.refresh import InMemoryTokenStore, TokenRefresher
+from tests.utils import MockProvider
+
+
+class _RefreshingProvider(MockProvider):
+    def __init__(self) -> None:
+        super().__init__(client_id="id", client_secret="secret", redirect_uri="/")
+        self.refreshed_with: List[str] = []
+        self.release = asyncio.Event()
+        self.refreshed: Optional[TokenSet] = TokenSet(
+            access_token=AccessToken("renewed"),
+            refresh_token=None,
+            expires_at=time() + 3600,
+        )
+
+    async def refresh_access_token(self, refresh_token: str) -> Optional[TokenSet]:
+        self.refreshed_with.append(refresh_token)
+        await self.release.wait()
+        return self.refreshed
+
+
+def _token_set(expires_in: float, refresh_token: Optional[str] = "r1") -> TokenSet:
+    return TokenSet(
+        access_token=AccessToken("current"),
+        refresh_token=refresh_token,
+        expires_at=time() + expires_in,
+    )
+
+
+@pytest.mark.asyncio
+async def test_fresh_token_is_not_refreshed() -> None:
+    provider = _RefreshingProvider()
+    refresher = TokenRefresher(store=InMemoryTokenStore(), leeway=60)
+    await refresher.save(provider=provider, user_id="u", token_set=_token_set(600))
+    assert await refresher.get_access_token(provider=provider, user_id="u") == "current"
+    assert await refresher.get_access_token(provider=provider, user_id="?") is None
+    assert provider.refreshed_with == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_coalesced() -> None:
+    provider = _RefreshingProvider()
+    store = InMemoryTokenStore()
+    refresher = TokenRefresher(store=store, leeway=60)
+    await refresher.save(provider=provider, user_id="u", token_set=_token_set(30))
+    waiters = [
+        asyncio.ensure_future(
+            refresher.get_access_token(provider=provider, user_id="u")
+        )
+        for _ in range(10)
+    ]
+    await asyncio.sleep(0)
+    provider.release.set()
+    assert await asyncio.gather(*waiters) == ["renewed"] * 10
+    assert provider.refreshed_with == ["r1"]
+    # the refresh token was not rotated, so it is kept
+    stored = await store.get("mock:u")
+    assert stored is not None and stored.refresh_token == "r1"
+    assert await refresher.get_access_token(provider=provider, user_id="u") == "renewed"
+    assert provider.refreshed_with == ["r1"]
+
+
+@pytest.mark.asyncio
+async def test_unrenewable_tokens() -> None:
+    provider = _RefreshingProvider()
+    provider.release.set()
+    refresher = TokenRefresher(store=InMemoryTokenStore(), leeway=60)
+    # no refresh token, usable until it expires
+    await refresher.save(
+        provider=provider, user_id="u", token_set=_token_set(30, refresh_token=None)
+    )
+    assert await refresher.get_access_token(provider=provider, user_id="u") == "current"
+    await refresher.save(
+        provider=provider, user_id="u", token_set=_token_set(-1, refresh_token=None)
+    )
+    assert await refresher.get_access_token(provider=provider, user_id="u") is None
+    # refused by the provider, still valid inside the leeway, not once expired
+    provider.refreshed = None
+    await refresher.save(provider=provider, user_id="u", token_set=_token_set(30))
+    assert await refresher.get_access_token(provider=provider, user_id="u") == "current"
+    await refresher.save(provider=provider, user_id="u", token_set=_token_set(-1))
+    assert await refresher.get_access_token(provider=provider, user_id="u") is None
+    await refresher.forget(provider=provider, user_id="u")
+    assert await refresher.get_access_token(provider=provider, user_id="u") is None
@@ -1,4 +1,8 @@
-from typing import Optional
+import json
+
+from typing import Any, Dict, Optional
+
+from jose.utils import base64url_encode
 
 from starlette.responses import RedirectResponse
 
@@ -17,6 +21,12 @@ def get_method_to_patch(*, patched_class: object, method_name: str) -> str:
     return method_to_patch
 
 
+def with_header(token: str, header: Dict[str, Any]) -> str:
+    """the same token under a forged, unauthenticated header"""
+    _, rest = token.split(".", 1)
+    return base64url_encode(json.dumps(header).encode()).decode() + "." + rest
+
+
 class MockProvider(Provider):
     def __init__(
         self,